@@ -0,0 +1,12 @@
+from django.utils.functional import SimpleLazyObject
+
+from .roles import can_upload_leads, is_manager
+
+
+def user_roles(request):
+    """Templates ke liye role flags (lazy, per request ek hi groups query)."""
+    user = request.user
+    return {
+        'is_manager': SimpleLazyObject(lambda: is_manager(user)),
+        'can_upload_leads': SimpleLazyObject(lambda: can_upload_leads(user)),
+    }
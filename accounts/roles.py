@@ -0,0 +1,38 @@
+from django.core.cache import cache
+
+from leadgenpro.cache import get_or_set
+
+GROUP_NAMES_TIMEOUT = 60 * 60
+
+
+def _group_names_key(user_pk):
+    return f'accounts:groups:{user_pk}'
+
+
+def get_group_names(user):
+    """
+    User ke saare group names. Shared cache mein rehte hain (membership/group change par
+    accounts.signals invalidate karta hai) aur request ke liye user object par bhi.
+    """
+    if not user.is_authenticated:
+        return frozenset()
+    if not hasattr(user, '_group_names_cache'):
+        user._group_names_cache = get_or_set(
+            'groups',
+            _group_names_key(user.pk),
+            lambda: frozenset(user.groups.values_list('name', flat=True)),
+            GROUP_NAMES_TIMEOUT,
+        )
+    return user._group_names_cache
+
+
+def invalidate_group_names(user_pks):
+    cache.delete_many([_group_names_key(user_pk) for user_pk in user_pks])
+
+
+def is_manager(user):
+    return 'Managers' in get_group_names(user)
+
+
+def can_upload_leads(user):
+    return user.is_authenticated and (user.is_superuser or is_manager(user))
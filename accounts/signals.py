@@ -0,0 +1,27 @@
+from django.contrib.auth.models import Group, User
+from django.db.models.signals import m2m_changed, post_save, pre_delete
+from django.dispatch import receiver
+
+from .roles import invalidate_group_names
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+def clear_groups_on_membership_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ('post_add', 'post_remove', 'post_clear', 'pre_clear'):
+        return
+    if not reverse:
+        # user.groups.add(...) / remove / clear
+        invalidate_group_names([instance.pk])
+    elif pk_set:
+        # group.user_set.add(...) / remove
+        invalidate_group_names(pk_set)
+    else:
+        # group.user_set.clear(): pre_clear par users abhi bhi linked hain
+        invalidate_group_names(instance.user_set.values_list('pk', flat=True))
+
+
+@receiver(post_save, sender=Group)
+@receiver(pre_delete, sender=Group)
+def clear_groups_on_group_change(sender, instance, **kwargs):
+    # Group rename/delete: uske saare members ke cached names purane ho gaye
+    invalidate_group_names(instance.user_set.values_list('pk', flat=True))
@@ -1,6 +1,7 @@
 # e:\DATA\Working On Database\leadgenpro\accounts\templatetags\auth_extras.py
 from django import template
-from django.contrib.auth.models import Group
+
+from accounts.roles import get_group_names
 
 register = template.Library()
 
@@ -9,9 +10,6 @@ def has_group(user, group_name):
     """
     Checks if a user is in a specific group.
     Usage: {% if user|has_group:"Managers" %}
+    Group names per request ek hi baar load hote hain (accounts.roles.get_group_names).
     """
-    try:
-        group = Group.objects.get(name=group_name)
-    except Group.DoesNotExist:
-        return False
-    return group in user.groups.all()
+    return group_name in get_group_names(user)
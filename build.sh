@@ -13,5 +13,8 @@ python manage.py collectstatic --no-input
 # Database migrate karein
 python manage.py migrate
 
+# CACHE_URL=db://... ho toh cache table (baaki backends ke liye kuch nahi karta)
+python manage.py createcachetable
+
 # Admin user banayein
 python setup_admin.py
\ No newline at end of file
@@ -1,44 +1,27 @@
-import pandas as pd
-from leads.models import Lead
+from leads.facets import existing_facet_values
 
-def get_unique_choices(field_name, blank_label, use_title_case=True):
+def get_unique_choices(params, field_name, blank_label):
     """
     REFACTORED:
-    Database se distinct (unique) values laata hai aur unhein clean karta hai.
+    Sirf currently selected values (jo facet index mein hain) choices banti hain; baaki options
+    Select2 autocomplete (leads:facet_autocomplete) se aate hain, taaki page par hazaron <option> na hon.
     """
-    
-    # SQLite compatible distinct values fetch
-    all_values = Lead.objects.values_list(field_name, flat=True).order_by(field_name)
-    
-    unique_cleaned_values = set()
-    for value in all_values:
-        if value:
-            # Hamesha extra space (left/right) hatao
-            cleaned_value = str(value).strip() 
-            
-            # Sirf zaroorat padne par hi title case istemaal karo
-            if use_title_case:
-                cleaned_value = cleaned_value.title()
-                
-            if cleaned_value:
-                unique_cleaned_values.add(cleaned_value)
-    
-    sorted_values = sorted(list(unique_cleaned_values))
+    sorted_values = existing_facet_values(field_name, params.getlist(field_name))
     return [('', blank_label)] + [(val, val) for val in sorted_values]
 
-def generate_filters(request):
+def generate_filters(request, params=None):
     """
-    Generates cleaned, unique, and sorted filter choices from the Lead model.
+    Generates filter choices for the selected values (validation + initial render).
+    params: filter QueryDict (default request.GET).
     """
+    params = request.GET if params is None else params
     
     try:
-        # Job Title ke liye title_case=False, taaki original data se match ho sake
-        JOB_TITLE_CHOICES = get_unique_choices('job_title', 'All Job Titles', use_title_case=False)
-        
-        # Baaki filters ke liye title_case=True (optional, behtar dikhne ke liye)
-        INDUSTRY_CHOICES = get_unique_choices('industry', 'All Industries', use_title_case=True)
-        PERSON_COUNTRY_CHOICES = get_unique_choices('person_country', 'All Person Countries', use_title_case=True)
-        COMPANY_COUNTRY_CHOICES = get_unique_choices('company_country', 'All Company Countries', use_title_case=True)
+        # Title case ka decision leads.facets.FACET_FIELDS mein hai
+        JOB_TITLE_CHOICES = get_unique_choices(params, 'job_title', 'All Job Titles')
+        INDUSTRY_CHOICES = get_unique_choices(params, 'industry', 'All Industries')
+        PERSON_COUNTRY_CHOICES = get_unique_choices(params, 'person_country', 'All Person Countries')
+        COMPANY_COUNTRY_CHOICES = get_unique_choices(params, 'company_country', 'All Company Countries')
 
         return {
             'JOB_TITLE_CHOICES': JOB_TITLE_CHOICES,
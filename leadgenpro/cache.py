@@ -0,0 +1,63 @@
+from django.conf import settings
+from django.core.cache import cache
+
+# App-level cached values ke groups; har group ke hit/miss counters shared cache mein rehte hain
+# (saare gunicorn workers ke combined). Debug Filters page par dikhte hain.
+STAT_NAMESPACES = ['counts', 'results', 'groups']
+
+_MISSING = object()
+
+
+def _stats_enabled():
+    return getattr(settings, 'CACHE_STATS_ENABLED', True)
+
+
+def _stat_key(namespace, kind):
+    return f'cache-stats:{namespace}:{kind}'
+
+
+def record(namespace, hit):
+    """Ek lookup ka hit/miss count karta hai."""
+    if not _stats_enabled():
+        return
+    key = _stat_key(namespace, 'hits' if hit else 'misses')
+    if not cache.add(key, 1, None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def get_or_set(namespace, key, compute, timeout=None):
+    """cache.get_or_set jaisa, saath mein hit/miss counter. compute() sirf miss par chalta hai."""
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        record(namespace, True)
+        return value
+
+    record(namespace, False)
+    value = compute()
+    cache.set(key, value, timeout)
+    return value
+
+
+def get_stats():
+    """[{namespace, hits, misses, hit_rate}] (hit_rate percent mein, koi lookup na ho toh None)."""
+    keys = [_stat_key(namespace, kind) for namespace in STAT_NAMESPACES for kind in ('hits', 'misses')]
+    values = cache.get_many(keys)
+    stats = []
+    for namespace in STAT_NAMESPACES:
+        hits = values.get(_stat_key(namespace, 'hits'), 0)
+        misses = values.get(_stat_key(namespace, 'misses'), 0)
+        total = hits + misses
+        stats.append({
+            'namespace': namespace,
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(100 * hits / total, 1) if total else None,
+        })
+    return stats
+
+
+def reset_stats():
+    cache.delete_many([_stat_key(namespace, kind) for namespace in STAT_NAMESPACES for kind in ('hits', 'misses')])
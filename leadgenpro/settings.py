@@ -1,6 +1,7 @@
 # leadgenpro/settings.py (Final & Fixed)
 
 import os
+import sys
 from pathlib import Path
 import dj_database_url
 
@@ -64,6 +65,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'accounts.context_processors.user_roles',
             ],
         },
     },
@@ -110,4 +112,102 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CSRF Fix for Render (Upload Error Fix)
 CSRF_TRUSTED_ORIGINS = []
 if RENDER_EXTERNAL_HOSTNAME:
-    CSRF_TRUSTED_ORIGINS.append(f"https://{RENDER_EXTERNAL_HOSTNAME}")
\ No newline at end of file
+    CSRF_TRUSTED_ORIGINS.append(f"https://{RENDER_EXTERNAL_HOSTNAME}")
+
+# Cache: CACHE_URL env se backend chunein
+#   redis://host:6379/0      -> Redis (redis package chahiye)
+#   memcached://host:11211   -> Memcached (pymemcache package chahiye)
+#   db://table_name          -> Database cache ('python manage.py createcachetable' chalayein)
+#   file:///path/to/dir      -> File cache (incr atomic nahi hai; stats counters thode kam gin sakte hain)
+# Default: local memory (har process ka apna cache). Ek se zyada workers ho toh CACHE_URL set karein,
+# warna ek worker ka write baaki workers ke cached results turant invalidate nahi karta.
+CACHE_URL = os.environ.get('CACHE_URL', '')
+if CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': CACHE_URL}}
+elif CACHE_URL.startswith('memcached://'):
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': CACHE_URL[len('memcached://'):],
+    }}
+elif CACHE_URL.startswith('db://'):
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': CACHE_URL[len('db://'):] or 'leadgenpro_cache',
+    }}
+elif CACHE_URL.startswith('file://'):
+    CACHES = {'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': CACHE_URL[len('file://'):],
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    }}
+else:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'leadgenpro'}}
+
+# Tests hamesha isolated local memory cache use karte hain (CACHE_URL wale shared cache mein nahi likhte)
+if sys.argv[1:2] == ['test']:
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'leadgenpro-tests'}}
+CACHES['default']['KEY_PREFIX'] = 'leadgenpro'
+
+# Sessions cache se padhe jaate hain, DB sirf write-through ke liye
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+
+# Cache hit/miss counters (Debug Filters page par)
+CACHE_STATS_ENABLED = os.environ.get('CACHE_STATS_ENABLED', 'True') == 'True'
+
+# Lead Uploads - ek batch mein kitni rows prefetch/bulk write hongi
+LEADS_IMPORT_CHUNK_SIZE = int(os.environ.get('LEADS_IMPORT_CHUNK_SIZE', 1000))
+
+# Upload validation ke liye worker processes (0/1 = single process; >1 = chunks parallel validate hote hain).
+# Sirf 'manage.py import_leads' aur 'manage.py process_upload_jobs' mein; web request hamesha single process.
+LEADS_IMPORT_WORKERS = int(os.environ.get('LEADS_IMPORT_WORKERS', 0))
+
+# Lead Exports - streaming export mein DB se ek baar mein kitni rows aati hain
+LEADS_EXPORT_CHUNK_SIZE = int(os.environ.get('LEADS_EXPORT_CHUNK_SIZE', 2000))
+
+# Background export jobs (manage.py process_export_jobs): files kitne seconds tak rakhi jaati hain
+LEADS_EXPORT_MAX_AGE = int(os.environ.get('LEADS_EXPORT_MAX_AGE', 24 * 60 * 60))
+
+# Export downloads web server se: 'X-Accel-Redirect' (nginx, internal location LEADS_SENDFILE_PREFIX
+# jo MEDIA_ROOT par point kare) ya 'X-Sendfile'. Khali = Django khud bhejta hai (Range support ke saath)
+LEADS_SENDFILE_HEADER = os.environ.get('LEADS_SENDFILE_HEADER', '')
+LEADS_SENDFILE_PREFIX = os.environ.get('LEADS_SENDFILE_PREFIX', '/protected-media/')
+
+# Filter results cache (page IDs, counts, export IDs) - Lead write hone par generation se invalidate
+LEADS_RESULT_CACHE_TIMEOUT = int(os.environ.get('LEADS_RESULT_CACHE_TIMEOUT', 600))
+LEADS_RESULT_CACHE_MAX_IDS = int(os.environ.get('LEADS_RESULT_CACHE_MAX_IDS', 20000))
+
+# In-process columnar snapshot (filter option counts, total count). Optional: har worker process mein ek copy,
+# worker start par background mein banti hai; memory Debug Filters page par dikhti hai. Default band (counts DB se)
+LEADS_SNAPSHOT_ENABLED = os.environ.get('LEADS_SNAPSHOT_ENABLED', 'False') == 'True'
+# Leads badalne par rebuild (background) kam se kam itne seconds ke gap par
+LEADS_SNAPSHOT_REFRESH_SECONDS = int(os.environ.get('LEADS_SNAPSHOT_REFRESH_SECONDS', 30))
+
+# Bulk export selections (server-side) kitne seconds baad delete ho jaati hain
+LEADS_SELECTION_MAX_AGE = int(os.environ.get('LEADS_SELECTION_MAX_AGE', 24 * 60 * 60))
+
+# Upload file size limit (bytes). Files chunks mein padhi jaati hain, isliye memory is par depend nahi karti
+LEADS_UPLOAD_MAX_SIZE = int(os.environ.get('LEADS_UPLOAD_MAX_SIZE', 250 * 1024 * 1024))
+
+# Upload headers ka fuzzy match (0 = band; 0.85 jaisi value par typo wale headers bhi map hote hain,
+# lekin 'Last Name 2' jaise alag columns bhi match ho sakte hain)
+LEADS_COLUMN_FUZZY_CUTOFF = float(os.environ.get('LEADS_COLUMN_FUZZY_CUTOFF', 0))
+
+# CSV encoding/delimiter detection ke liye file ke shuru se kitne bytes padhe jaate hain
+LEADS_UPLOAD_SNIFF_BYTES = int(os.environ.get('LEADS_UPLOAD_SNIFF_BYTES', 64 * 1024))
+
+# Uploaded files (background upload jobs yahan save hote hain)
+MEDIA_URL = 'media/'
+MEDIA_ROOT = Path(os.environ.get('MEDIA_ROOT', BASE_DIR / 'media'))
+
+# Upload error reports (MEDIA_ROOT/upload_errors) kitne seconds baad delete ho jaate hain
+LEADS_UPLOAD_ERRORS_MAX_AGE = int(os.environ.get('LEADS_UPLOAD_ERRORS_MAX_AGE', 7 * 24 * 60 * 60))
+
+# Is size (bytes) se badi files background worker ko jaati hain. 0 = har upload background mein;
+# negative value (default) = band, sab uploads request ke andar hi process hote hain.
+# On karne se pehle worker chalana zaroori hai (warna jobs 'pending' hi rehte hain):
+#   python manage.py process_upload_jobs
+# Worker aur web dono ko same persistent MEDIA_ROOT dikhna chahiye (Render par persistent disk;
+# ephemeral disk par restart/deploy ke saath queued files gayab ho jaati hain).
+LEADS_UPLOAD_BACKGROUND_MIN_SIZE = int(os.environ.get('LEADS_UPLOAD_BACKGROUND_MIN_SIZE', -1))
+# Running upload job ka progress itne seconds tak na badle toh (worker crash) job failed mark hota hai
+LEADS_UPLOAD_JOB_TIMEOUT = int(os.environ.get('LEADS_UPLOAD_JOB_TIMEOUT', 30 * 60))
@@ -14,3 +14,8 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'leadgenpro.settings')
 
 application = get_wsgi_application()
+
+# LEADS_SNAPSHOT_ENABLED ho toh lead snapshot worker start par background mein banna shuru (requests wait nahi karti)
+from leads.snapshot import warm_snapshot  # noqa: E402
+
+warm_snapshot()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class LeadsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'leads'
+
+    def ready(self):
+        from . import search, signals  # noqa: F401  (search: trgm_icontains lookup register karta hai)
@@ -0,0 +1,223 @@
+import difflib
+import re
+import unicodedata
+from collections import namedtuple
+from functools import lru_cache
+
+from django.conf import settings
+
+# --- Enhanced Column Mapping ---
+COLUMN_MAPPING = {
+    # Person fields
+    'Full Name': 'full_name', 
+    'First Name': 'first_name', 
+    'Last Name': 'last_name',
+    'Job Title': 'job_title', 
+    'Job Title/Role': 'job_title',
+    'Professional Email': 'professional_email', 
+    'Email': 'professional_email',
+    'Work Email': 'professional_email',
+    'Email Status': 'email_status', 
+    'Personal Email': 'personal_email',
+    'Person Linkedin Url': 'person_linkedin_url', 
+    'Linkedin Url': 'person_linkedin_url',
+    'LinkedIn Profile': 'person_linkedin_url',
+    'Person City': 'person_city', 
+    'Person State': 'person_state', 
+    'Person Country': 'person_country',
+    'Person Direct Phone Number': 'person_direct_phone', 
+    'Phone': 'person_direct_phone',
+    'Direct Phone': 'person_direct_phone',
+    'Mobile': 'person_direct_phone',
+    'Lead ID': 'lead_id', 
+    'Comments': 'comments', 
+    'Comment': 'comments',
+    'Notes': 'comments',
+
+    # Company fields
+    'Company ID': 'company_id', 
+    'Company Name': 'company_name',
+    'Organization': 'company_name',
+    'Company Website': 'company_website', 
+    'Website': 'company_website',
+    'Industry': 'industry', 
+    'Employees': 'employees', 
+    'Employee Count': 'employees',
+    'Company Size': 'employees',
+    'Revenue': 'revenue',
+    'Annual Revenue': 'revenue',
+    'Generic Email': 'generic_email', 
+    'Full Address': 'full_address',
+    'Address': 'full_address',
+    'First Address': 'first_address', 
+    'Company City': 'company_city', 
+    'Company State': 'company_state', 
+    'Zip code': 'zip_code',
+    'Postal Code': 'zip_code',
+    'Company Country': 'company_country',
+    'Company Linkedin Url': 'company_linkedin_url',
+    'Company LinkedIn': 'company_linkedin_url',
+    'Company Phone Numbers': 'company_phone', 
+    'Company Phone': 'company_phone',
+    'Office Phone': 'company_phone',
+}
+
+# Header normalization: pehle words ke synonyms, phir poore header ke aliases (vendor exports ke common variants)
+WORD_SYNONYMS = {
+    'e mail': 'email',
+    'organisation': 'organization',
+    'tel': 'phone',
+    'telephone': 'phone',
+    'linked in': 'linkedin',
+    'web site': 'website',
+    'zipcode': 'zip code',
+    'postcode': 'postal code',
+}
+
+HEADER_ALIASES = {
+    'name': 'full name',
+    'contact name': 'full name',
+    'mail': 'email',
+    'email address': 'email',
+    'work email address': 'work email',
+    'org': 'organization',
+    'org name': 'organization',
+    'organization name': 'organization',
+    'employer': 'organization',
+    'company': 'organization',
+    'title': 'job title',
+    'designation': 'job title',
+    'position': 'job title',
+    'phone number': 'phone',
+    'mobile number': 'mobile',
+    'cell': 'mobile',
+    'zip': 'zip code',
+    'headcount': 'employees',
+    'no of employees': 'employees',
+    'number of employees': 'employees',
+    'company url': 'website',
+    'website url': 'website',
+    'domain': 'website',
+}
+
+# Fuzzy (difflib) header matching default band: 'Person Email' -> personal_email, 'Last Name 2' -> last_name
+# jaise galat mappings deta tha. LEADS_COLUMN_FUZZY_CUTOFF (e.g. 0.85) se opt-in; fuzzy matches report mein dikhte hain
+DEFAULT_FUZZY_CUTOFF = 0
+
+# Resolve decisions (user ko mapping report mein dikhte hain)
+MATCH_EXACT = 'exact'
+MATCH_NORMALIZED = 'normalized'
+MATCH_FUZZY = 'fuzzy'
+MATCH_DUPLICATE = 'duplicate'
+MATCH_UNMAPPED = 'unmapped'
+
+ColumnDecision = namedtuple('ColumnDecision', ['column', 'field', 'match', 'matched_header'])
+
+_NON_WORD_RE = re.compile(r'[\W_]+', re.UNICODE)
+_SYNONYM_RE = re.compile(
+    r'\b(' + '|'.join(sorted((re.escape(key) for key in WORD_SYNONYMS), key=len, reverse=True)) + r')\b'
+)
+
+
+def normalize_header(header):
+    """'  E-Mail_Address ' -> 'email address': case, accents, punctuation, whitespace aur synonyms normalize."""
+    text = unicodedata.normalize('NFKD', str(header)).encode('ascii', 'ignore').decode()
+    text = _NON_WORD_RE.sub(' ', text.lower()).strip()
+    text = _SYNONYM_RE.sub(lambda match: WORD_SYNONYMS[match.group(1)], text)
+    return HEADER_ALIASES.get(text, text)
+
+
+def _build_lookup():
+    """Normalized header -> (model field, COLUMN_MAPPING key). Module load par ek hi baar banta hai."""
+    lookup = {}
+    for header, field_name in COLUMN_MAPPING.items():
+        lookup.setdefault(normalize_header(header), (field_name, header))
+    # Model field names bhi ('professional_email', 'Company Website' jaise) seedhe match hon
+    for field_name in set(COLUMN_MAPPING.values()):
+        lookup.setdefault(normalize_header(field_name), (field_name, field_name))
+    return lookup
+
+
+_LOOKUP = _build_lookup()
+
+
+def _fuzzy_cutoff():
+    return getattr(settings, 'LEADS_COLUMN_FUZZY_CUTOFF', DEFAULT_FUZZY_CUTOFF)
+
+
+@lru_cache(maxsize=1024)
+def _resolve_normalized(normalized, cutoff):
+    """(field, match type, matched header) ya None. Fuzzy tier sirf cutoff set ho toh."""
+    if normalized in _LOOKUP:
+        field_name, header = _LOOKUP[normalized]
+        return field_name, MATCH_NORMALIZED, header
+    if cutoff:
+        close = difflib.get_close_matches(normalized, _LOOKUP.keys(), n=1, cutoff=cutoff)
+        if close:
+            field_name, header = _LOOKUP[close[0]]
+            return field_name, MATCH_FUZZY, header
+    return None
+
+
+def resolve_header(header):
+    """Ek file header ka (field, match type, matched header); koi match na ho toh (None, 'unmapped', None)."""
+    header_clean = str(header).strip()
+    if header_clean in COLUMN_MAPPING:
+        return COLUMN_MAPPING[header_clean], MATCH_EXACT, header_clean
+    resolved = _resolve_normalized(normalize_header(header_clean), _fuzzy_cutoff())
+    if resolved is None:
+        return None, MATCH_UNMAPPED, None
+    return resolved
+
+
+def resolve_columns(columns):
+    """
+    Saare file headers resolve karta hai. Ek model field par pehla column jeetta hai,
+    baad wale 'duplicate' ho kar ignore hote hain. Returns [ColumnDecision] (file order mein).
+    """
+    decisions = []
+    used_fields = set()
+    for column in columns:
+        field_name, match, matched_header = resolve_header(column)
+        if field_name is not None and field_name in used_fields:
+            match = MATCH_DUPLICATE
+        elif field_name is not None:
+            used_fields.add(field_name)
+        decisions.append(ColumnDecision(column, field_name, match, matched_header))
+    return decisions
+
+
+def decisions_to_map(decisions):
+    """{original column: model field} (sirf import hone wale columns)."""
+    return {
+        decision.column: decision.field
+        for decision in decisions
+        if decision.field is not None and decision.match != MATCH_DUPLICATE
+    }
+
+
+def mapping_report(decisions):
+    """Decisions ka JSON-friendly list (upload page preview aur CLI ke liye)."""
+    return [
+        {
+            'column': str(decision.column).strip(),
+            'field': decision.field if decision.match != MATCH_DUPLICATE else None,
+            'match': decision.match,
+            'matched_header': decision.matched_header,
+        }
+        for decision in decisions
+    ]
+
+
+def mapping_summary(decisions):
+    """Sirf 'dhyan dene wale' decisions (fuzzy/duplicate/unmapped) ki ek line; sab exact ho toh ''."""
+    parts = []
+    for decision in decisions:
+        column = str(decision.column).strip()
+        if decision.match == MATCH_FUZZY:
+            parts.append(f"'{column}' → {decision.field} (fuzzy match of '{decision.matched_header}')")
+        elif decision.match == MATCH_DUPLICATE:
+            parts.append(f"'{column}' ignored (duplicate {decision.field})")
+        elif decision.match == MATCH_UNMAPPED:
+            parts.append(f"'{column}' ignored")
+    return '; '.join(parts)
@@ -0,0 +1,91 @@
+import os
+import re
+
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header, http_date
+
+# Generated files (exports) ka download. Production mein web server file bheje toh best hai:
+# LEADS_SENDFILE_HEADER = 'X-Accel-Redirect' (nginx, LEADS_SENDFILE_PREFIX internal location ke saath)
+# ya 'X-Sendfile' (Apache/lighttpd). Warna Django khud bhejta hai, single Range request support ke saath
+# (browser download resume kar sakta hai).
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+BLOCK_SIZE = 64 * 1024
+
+
+def _file_etag(stat):
+    return f'"{stat.st_size:x}-{int(stat.st_mtime):x}"'
+
+
+def _parse_range(header, size):
+    """'bytes=a-b' ko (start, end) inclusive mein; invalid/multi-range par None, unsatisfiable par False."""
+    match = _RANGE_RE.match(header.strip())
+    if not match or not any(match.groups()):
+        return None
+    start, end = match.groups()
+    if start == '':
+        # Suffix range: aakhri N bytes
+        length = int(end)
+        if length == 0:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(start)
+    end = min(int(end), size - 1) if end else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+def _iter_range(path, start, length):
+    with open(path, 'rb') as f:
+        f.seek(start)
+        while length > 0:
+            block = f.read(min(BLOCK_SIZE, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
+
+
+def file_download_response(request, path, filename, content_type='application/octet-stream'):
+    """MEDIA_ROOT ke andar ki file ka attachment response (sendfile header ya Range-aware streaming)."""
+    stat = os.stat(path)
+    etag = _file_etag(stat)
+
+    sendfile_header = getattr(settings, 'LEADS_SENDFILE_HEADER', '')
+    if sendfile_header:
+        response = HttpResponse(content_type=content_type)
+        if sendfile_header.lower() == 'x-accel-redirect':
+            relative_path = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+            response[sendfile_header] = getattr(settings, 'LEADS_SENDFILE_PREFIX', '/protected-media/') + relative_path
+        else:
+            response[sendfile_header] = path
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+        return response
+
+    byte_range = None
+    range_header = request.headers.get('Range')
+    if_range = request.headers.get('If-Range')
+    if range_header and (not if_range or if_range == etag):
+        byte_range = _parse_range(range_header, stat.st_size)
+
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{stat.st_size}'
+        return response
+
+    if byte_range is None:
+        response = FileResponse(open(path, 'rb'), as_attachment=True, filename=filename, content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = StreamingHttpResponse(_iter_range(path, start, length), status=206, content_type=content_type)
+        response['Content-Length'] = str(length)
+        response['Content-Range'] = f'bytes {start}-{end}/{stat.st_size}'
+        response['Content-Disposition'] = content_disposition_header(True, filename)
+
+    response['Accept-Ranges'] = 'bytes'
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    return response
@@ -0,0 +1,86 @@
+import gzip
+import json
+import os
+import re
+import time
+import uuid
+
+from django.conf import settings
+
+# Upload error reports: har upload ki errors ek gzip JSONL file mein (ek line = ek failed row).
+# Session / UploadJob mein sirf report id rehti hai, poori row_data nahi.
+
+DEFAULT_MAX_AGE = 7 * 24 * 60 * 60
+
+_REPORT_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+def error_reports_dir():
+    return os.path.join(settings.MEDIA_ROOT, 'upload_errors')
+
+
+def error_report_path(report_id):
+    """Report id ka file path; invalid id par None (path traversal se bachav)."""
+    if not report_id or not _REPORT_ID_RE.match(str(report_id)):
+        return None
+    return os.path.join(error_reports_dir(), f'{report_id}.jsonl.gz')
+
+
+def save_error_report(errors):
+    """Errors (dicts ka iterable) ko compressed file mein likhta hai aur report id return karta hai."""
+    directory = error_reports_dir()
+    os.makedirs(directory, exist_ok=True)
+    purge_old_error_reports()
+
+    report_id = uuid.uuid4().hex
+    path = error_report_path(report_id)
+    tmp_path = f'{path}.tmp'
+    with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+        for error_info in errors:
+            f.write(json.dumps(error_info, default=str))
+            f.write('\n')
+    os.replace(tmp_path, path)
+    return report_id
+
+
+def iter_error_report(report_id):
+    """Report ki errors ek-ek karke yield karta hai (poori file memory mein nahi aati)."""
+    path = error_report_path(report_id)
+    if path is None or not os.path.exists(path):
+        return
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def error_report_exists(report_id):
+    path = error_report_path(report_id)
+    return path is not None and os.path.exists(path)
+
+
+def delete_error_report(report_id):
+    path = error_report_path(report_id)
+    if path is None:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def purge_old_error_reports(max_age=None):
+    """LEADS_UPLOAD_ERRORS_MAX_AGE (seconds) se purani report files delete karta hai."""
+    if max_age is None:
+        max_age = getattr(settings, 'LEADS_UPLOAD_ERRORS_MAX_AGE', DEFAULT_MAX_AGE)
+    cutoff = time.time() - max_age
+    try:
+        entries = list(os.scandir(error_reports_dir()))
+    except OSError:
+        return
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+        except OSError:
+            pass
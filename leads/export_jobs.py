@@ -0,0 +1,168 @@
+import os
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .exports import (
+    EXPORT_FIELD_NAMES, PARQUET_FIELD_NAMES, XLSX_MAX_ROWS, iter_value_rows, parquet_available, write_csv_gz,
+    write_parquet, write_xlsx,
+)
+from .models import ExportJob, Lead
+from .query import LeadQuery
+from .result_cache import get_generation
+
+DEFAULT_MAX_AGE = 24 * 60 * 60
+PROGRESS_EVERY = 5000  # itni rows ke baad processed_rows DB mein update
+
+
+# --- Request / reuse ---
+
+def available_export_formats():
+    """ExportJob.FORMAT_CHOICES jo is server par ban sakte hain (Parquet sirf pyarrow ke saath)."""
+    return [
+        (value, label) for value, label in ExportJob.FORMAT_CHOICES
+        if value != ExportJob.FORMAT_PARQUET or parquet_available()
+    ]
+
+
+def request_export_job(user, lead_query, export_format):
+    """
+    Export job banata hai, ya user ka apna same filters + format wala job reuse karta hai agar leads tab
+    se nahi badle (result_cache generation same hai). Returns (job, reused).
+    """
+    purge_old_exports()
+    generation = get_generation()
+    existing = (
+        ExportJob.objects.filter(
+            created_by=user, spec_key=lead_query.cache_key, format=export_format, data_version=generation,
+        )
+        .exclude(status=ExportJob.STATUS_FAILED)
+        .order_by('-created_at')
+        .first()
+    )
+    if existing is not None and (existing.status != ExportJob.STATUS_COMPLETED or export_file_exists(existing)):
+        return existing, True
+
+    job = ExportJob.objects.create(
+        format=export_format,
+        filter_spec=lead_query.to_json(),
+        spec_key=lead_query.cache_key,
+        data_version=generation,
+        created_by=user,
+    )
+    return job, False
+
+
+def export_file_path(job):
+    return job.file.path if job.file else None
+
+
+def export_file_exists(job):
+    path = export_file_path(job)
+    return bool(path) and os.path.exists(path)
+
+
+def purge_old_exports(max_age=None):
+    """LEADS_EXPORT_MAX_AGE (seconds) se purane finished export jobs aur unki files delete karta hai."""
+    if max_age is None:
+        max_age = getattr(settings, 'LEADS_EXPORT_MAX_AGE', DEFAULT_MAX_AGE)
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    old_jobs = ExportJob.objects.filter(
+        created_at__lt=cutoff, status__in=[ExportJob.STATUS_COMPLETED, ExportJob.STATUS_FAILED]
+    )
+    for job in old_jobs:
+        if job.file:
+            job.file.delete(save=False)
+        job.delete()
+
+
+# --- Worker ---
+
+def claim_next_export_job():
+    """Sabse purana pending export atomically 'running' mark karke return karta hai (jobs.claim_next_job jaisa)."""
+    while True:
+        job = ExportJob.objects.filter(status=ExportJob.STATUS_PENDING).order_by('created_at', 'pk').first()
+        if job is None:
+            return None
+        claimed = ExportJob.objects.filter(pk=job.pk, status=ExportJob.STATUS_PENDING).update(
+            status=ExportJob.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def _rows_with_progress(job, rows):
+    processed = 0
+    for row in rows:
+        yield row
+        processed += 1
+        if processed % PROGRESS_EVERY == 0:
+            ExportJob.objects.filter(pk=job.pk).update(processed_rows=processed)
+    job.processed_rows = processed
+
+
+def _field_names(job):
+    # Parquet typed hai, isliye usme id/status/dates bhi jaate hain
+    return PARQUET_FIELD_NAMES if job.format == ExportJob.FORMAT_PARQUET else EXPORT_FIELD_NAMES
+
+
+def _render(job, path, rows):
+    headers = list(_field_names(job))
+    if job.format == ExportJob.FORMAT_CSV_GZ:
+        write_csv_gz(path, headers, rows)
+    elif job.format == ExportJob.FORMAT_XLSX:
+        with open(path, 'wb') as f:
+            write_xlsx(f, [('Leads', headers, rows)])
+    elif job.format == ExportJob.FORMAT_PARQUET:
+        write_parquet(path, headers, rows)
+    else:
+        raise ValueError(f"Unknown export format '{job.format}'.")
+
+
+def _finish(job, status, message):
+    job.status = status
+    job.message = message
+    job.finished_at = timezone.now()
+    job.save()
+
+
+def run_export_job(job):
+    """Claimed ExportJob ki file MEDIA_ROOT/lead_exports mein banata hai (pehle .tmp, phir rename)."""
+    # File is generation ke data se banti hai; beech mein leads badle toh yeh job reuse nahi hoga
+    job.data_version = get_generation()
+    queryset = LeadQuery.from_json(job.filter_spec).apply(Lead.objects.order_by('-created_at', '-id'))
+    job.total_rows = queryset.count()
+    job.save(update_fields=['data_version', 'total_rows'])
+
+    if job.format == ExportJob.FORMAT_XLSX and job.total_rows > XLSX_MAX_ROWS:
+        _finish(job, ExportJob.STATUS_FAILED, f"{job.total_rows} rows is more than Excel allows. Use CSV or Parquet.")
+        return job
+    if job.format == ExportJob.FORMAT_PARQUET and not parquet_available():
+        _finish(job, ExportJob.STATUS_FAILED, "Parquet export is not available on this server (pyarrow missing).")
+        return job
+
+    relative_path = os.path.join(
+        'lead_exports', timezone.now().strftime('%Y/%m'), f'{job.pk}-{uuid.uuid4().hex[:12]}.{job.format}'
+    )
+    path = os.path.join(settings.MEDIA_ROOT, relative_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.tmp'
+
+    try:
+        _render(job, tmp_path, _rows_with_progress(job, iter_value_rows(queryset, _field_names(job))))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        print(f"Export Job #{job.pk} Error: {traceback.format_exc()}")
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        _finish(job, ExportJob.STATUS_FAILED, f"Export failed: {e}")
+        return job
+
+    job.file.name = relative_path.replace(os.sep, '/')
+    job.file_size = os.path.getsize(path)
+    _finish(job, ExportJob.STATUS_COMPLETED, f"{job.processed_rows} leads exported.")
+    return job
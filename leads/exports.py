@@ -0,0 +1,230 @@
+import csv
+import gzip
+import tempfile
+from datetime import datetime
+
+from django.conf import settings
+from django.http import FileResponse
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Border, Font, Side
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet export optional hai
+    pyarrow = None
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+
+# Filtered CSV export ke columns (isi order mein)
+EXPORT_FIELD_NAMES = [
+    'lead_id', 'full_name', 'first_name', 'last_name', 'job_title',
+    'professional_email', 'email_status', 'personal_email', 'person_linkedin_url',
+    'person_city', 'person_state', 'person_country', 'person_direct_phone',
+    'company_id', 'company_name', 'company_website', 'industry', 'employees',
+    'revenue', 'generic_email', 'full_address', 'first_address', 'company_city',
+    'company_state', 'zip_code', 'company_country', 'company_linkedin_url',
+    'company_phone', 'comments', 'source'
+]
+
+# Excel export mein kuch columns ke display names
+EXCEL_COLUMN_NAMES = {
+    'professional_email': 'Email',
+    'person_linkedin_url': 'LinkedIn (Person)',
+    'company_linkedin_url': 'LinkedIn (Company)',
+    'created_at': 'Date Added',
+    'created_by__username': 'Added By',
+    'person_direct_phone': 'Direct Phone',
+    'company_phone': 'Company Phone',
+}
+
+XLSX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+XLSX_MAX_ROWS = 1_048_576 - 1  # Excel sheet limit (header row ke baad)
+
+# Parquet export: types bache rehte hain (created_at timestamp, ids int64), isliye dates bhi default columns mein
+PARQUET_CONTENT_TYPE = 'application/vnd.apache.parquet'
+PARQUET_FIELD_NAMES = ['id'] + EXPORT_FIELD_NAMES + ['status', 'created_at', 'updated_at']
+PARQUET_COMPRESSIONS = ['snappy', 'zstd', 'gzip', 'brotli', 'lz4', 'none']
+PARQUET_INTEGER_TYPES = {
+    'AutoField', 'BigAutoField', 'SmallAutoField', 'IntegerField', 'BigIntegerField',
+    'SmallIntegerField', 'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField',
+}
+
+# ?columns= projection mein yeh fields maange ja sakte hain
+EXPORTABLE_FIELD_NAMES = PARQUET_FIELD_NAMES + [
+    'employees_min', 'employees_max', 'revenue_min', 'revenue_max', 'created_by__username',
+]
+
+
+def get_export_chunk_size():
+    return getattr(settings, 'LEADS_EXPORT_CHUNK_SIZE', DEFAULT_EXPORT_CHUNK_SIZE)
+
+
+class Echo:
+    """
+    Pseudo-buffer: csv.writer jo likhta hai woh seedha return ho jata hai,
+    taaki har row StreamingHttpResponse ko yield ki ja sake.
+    """
+
+    def write(self, value):
+        return value
+
+
+def iter_csv_rows(queryset, field_names, chunk_size=None):
+    """
+    Header + har lead ki CSV line yield karta hai. Model instances nahi bante aur result cache
+    nahi bharta (values_list().iterator()), isliye memory export size se independent rehti hai.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(field_names)
+
+    rows = queryset.values_list(*field_names).iterator(chunk_size=chunk_size or get_export_chunk_size())
+    for row in rows:
+        yield writer.writerow(['' if value is None else value for value in row])
+
+
+def iter_csv_rows_for_ids(queryset, ids, field_names, chunk_size=None):
+    """
+    iter_csv_rows jaisa, lekin pehle se pata ordered IDs ke liye (result cache se):
+    filters dobara nahi chalte, rows primary key par chunks mein aati hain.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(field_names)
+
+    chunk_size = chunk_size or get_export_chunk_size()
+    for start in range(0, len(ids), chunk_size):
+        chunk = ids[start:start + chunk_size]
+        rows = {row[0]: row[1:] for row in queryset.filter(pk__in=chunk).values_list('pk', *field_names)}
+        for pk in chunk:
+            row = rows.get(pk)
+            if row is not None:
+                yield writer.writerow(['' if value is None else value for value in row])
+
+
+# --- Streaming XLSX ---
+# openpyxl write-only workbook rows ko seedha temp XML mein likhta hai (koi DataFrame / in-memory
+# sheet nahi), phir poori file ek temp file mein banti hai jo FileResponse chunks mein bhejta hai.
+
+_THIN = Side(style='thin')
+_HEADER_FONT = Font(bold=True)
+_HEADER_BORDER = Border(left=_THIN, right=_THIN, top=_THIN, bottom=_THIN)
+_HEADER_ALIGNMENT = Alignment(horizontal='center', vertical='top')
+
+
+def _excel_value(value):
+    """Excel timezone-aware datetimes nahi samajhta (tz hata dein); control characters allowed nahi."""
+    if isinstance(value, datetime) and value.tzinfo is not None:
+        return value.replace(tzinfo=None)
+    if isinstance(value, str):
+        return ILLEGAL_CHARACTERS_RE.sub('', value)
+    return value
+
+
+def write_xlsx(file, sheets):
+    """
+    sheets: [(title, headers, rows iterable)] ko file mein XLSX ki tarah likhta hai.
+    Rows ek ek karke consume hoti hain, isliye memory rows ki ginti par depend nahi karti.
+    """
+    workbook = Workbook(write_only=True)
+    for title, headers, rows in sheets:
+        sheet = workbook.create_sheet(title)
+        header_cells = []
+        for header in headers:
+            cell = WriteOnlyCell(sheet, value=header)
+            cell.font, cell.border, cell.alignment = _HEADER_FONT, _HEADER_BORDER, _HEADER_ALIGNMENT
+            header_cells.append(cell)
+        sheet.append(header_cells)
+        for row in rows:
+            sheet.append([_excel_value(value) for value in row])
+    workbook.save(file)
+
+
+def xlsx_response(sheets, filename):
+    """write_xlsx ko temp file mein likh kar streaming FileResponse (file close hote hi delete)."""
+    output = tempfile.TemporaryFile()
+    write_xlsx(output, sheets)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=XLSX_CONTENT_TYPE)
+
+
+def iter_value_rows(queryset, field_names, chunk_size=None):
+    """Export rows as tuples (values_list().iterator(), model instances ke bina)."""
+    return queryset.values_list(*field_names).iterator(chunk_size=chunk_size or get_export_chunk_size())
+
+
+# --- File writers (background export jobs) ---
+
+def write_csv_gz(file, headers, rows):
+    """CSV ko gzip compress karke file (path ya binary file object) mein likhta hai."""
+    with gzip.open(file, 'wt', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(headers)
+        for row in rows:
+            writer.writerow(['' if value is None else value for value in row])
+
+
+def parquet_available():
+    return pyarrow is not None
+
+
+def _parquet_type(field):
+    """Django field ka Arrow type: dates timestamp (UTC), integers/FKs int64, baaki string."""
+    internal_type = field.get_internal_type()
+    if internal_type == 'DateTimeField':
+        return pyarrow.timestamp('us', tz='UTC')
+    if internal_type in PARQUET_INTEGER_TYPES:
+        return pyarrow.int64()
+    if field.is_relation:
+        return pyarrow.int64()  # values_list('created_by') foreign key ki id deta hai
+    return pyarrow.string()
+
+
+def parquet_schema(field_names):
+    """Lead ke values_list field names (lookups jaise 'created_by__username' bhi) ka typed Arrow schema."""
+    from .models import Lead
+
+    columns = []
+    for name in field_names:
+        model = Lead
+        *relations, last = name.split('__')
+        for relation in relations:
+            model = model._meta.get_field(relation).related_model
+        columns.append((name, _parquet_type(model._meta.get_field(last))))
+    return pyarrow.schema(columns)
+
+
+def write_parquet(file, field_names, rows, compression='snappy', batch_size=None):
+    """
+    values_list rows ko typed Parquet (parquet_schema) mein likhta hai; har batch ek row group banta hai,
+    isliye memory batch_size par depend karti hai. pyarrow install hona chahiye.
+    """
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires the 'pyarrow' package.")
+
+    batch_size = batch_size or get_export_chunk_size() * 10
+    schema = parquet_schema(field_names)
+    with pyarrow.parquet.ParquetWriter(file, schema, compression=compression) as writer:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                writer.write_table(_parquet_table(schema, batch))
+                batch = []
+        if batch:
+            writer.write_table(_parquet_table(schema, batch))
+
+
+def _parquet_table(schema, rows):
+    columns = list(zip(*rows)) if rows else [()] * len(schema)
+    arrays = [pyarrow.array(column, type=field.type) for column, field in zip(columns, schema)]
+    return pyarrow.Table.from_arrays(arrays, schema=schema)
+
+
+def parquet_response(field_names, rows, filename, compression='snappy'):
+    """write_parquet ko temp file mein likh kar FileResponse (xlsx_response jaisa)."""
+    output = tempfile.TemporaryFile()
+    write_parquet(output, field_names, rows, compression=compression)
+    output.seek(0)
+    return FileResponse(output, as_attachment=True, filename=filename, content_type=PARQUET_CONTENT_TYPE)
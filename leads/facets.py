@@ -0,0 +1,145 @@
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+
+# Facet fields aur unka normalization (title case ya nahi).
+# Job Title original data jaisa hi rehta hai taaki filter match ho sake.
+FACET_FIELDS = {
+    'job_title': False,
+    'industry': True,
+    'person_country': True,
+    'company_country': True,
+}
+
+
+def normalize_facet_value(field_name, value):
+    """Raw DB value ko dropdown wali value mein convert karta hai ('' = skip)."""
+    if not value:
+        return ''
+    cleaned_value = str(value).strip()
+    if FACET_FIELDS.get(field_name):
+        cleaned_value = cleaned_value.title()
+    return cleaned_value
+
+
+def facet_values(values):
+    """Ek lead ke values dict se {field: normalized value} nikalta hai (sirf known fields)."""
+    return {
+        field_name: normalize_facet_value(field_name, values[field_name])
+        for field_name in FACET_FIELDS
+        if field_name in values
+    }
+
+
+def facet_deltas(old_values=None, new_values=None):
+    """
+    Purani aur nayi facet values ka diff Counter mein deta hai: {(field, value): +/-n}.
+    Create ke liye old_values=None, delete ke liye new_values=None pass karein.
+    """
+    deltas = Counter()
+    old_values = old_values or {}
+    new_values = new_values or {}
+
+    for field_name in FACET_FIELDS:
+        if field_name not in old_values and field_name not in new_values:
+            continue
+        old = old_values.get(field_name, '')
+        new = new_values.get(field_name, '')
+        if old == new:
+            continue
+        if old:
+            deltas[(field_name, old)] -= 1
+        if new:
+            deltas[(field_name, new)] += 1
+    return deltas
+
+
+def apply_facet_deltas(deltas):
+    """
+    Counter of (field, value) -> delta ko FacetValue table par apply karta hai.
+    Count zero hone par row delete ho jati hai.
+    """
+    from .models import FacetValue
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    with transaction.atomic():
+        for (field_name, value), delta in deltas.items():
+            updated = FacetValue.objects.filter(field_name=field_name, value=value).update(count=F('count') + delta)
+            if not updated and delta > 0:
+                facet, created = FacetValue.objects.get_or_create(
+                    field_name=field_name, value=value, defaults={'count': delta}
+                )
+                if not created:
+                    FacetValue.objects.filter(pk=facet.pk).update(count=F('count') + delta)
+
+        removed_keys = [key for key, delta in deltas.items() if delta < 0]
+        for field_name, value in removed_keys:
+            FacetValue.objects.filter(field_name=field_name, value=value, count__lte=0).delete()
+
+
+def rebuild_facets(lead_model=None, facet_model=None):
+    """
+    Poora facet index scratch se banata hai (GROUP BY per field, phir normalize).
+    Migrations historical models pass kar sakti hain.
+    """
+    if lead_model is None or facet_model is None:
+        from .models import FacetValue, Lead
+        lead_model = lead_model or Lead
+        facet_model = facet_model or FacetValue
+
+    counts = Counter()
+    for field_name in FACET_FIELDS:
+        grouped = (
+            lead_model.objects.exclude(**{f'{field_name}__isnull': True})
+            .values_list(field_name)
+            .annotate(total=Count('pk'))
+            .order_by()
+        )
+        for raw_value, total in grouped:
+            value = normalize_facet_value(field_name, raw_value)
+            if value:
+                counts[(field_name, value)] += total
+
+    with transaction.atomic():
+        facet_model.objects.all().delete()
+        facet_model.objects.bulk_create(
+            [facet_model(field_name=field, value=value, count=total) for (field, value), total in counts.items()],
+            batch_size=1000,
+        )
+    return len(counts)
+
+
+def existing_facet_values(field_name, values):
+    """Di gayi values mein se jo facet index mein hain (sorted) - selected options ke liye."""
+    from .models import FacetValue
+
+    values = [value for value in values if value]
+    if not values:
+        return []
+    found = FacetValue.objects.filter(field_name=field_name, value__in=values, count__gt=0)
+    return sorted(found.values_list('value', flat=True))
+
+
+def search_facet_values(field_name, term='', offset=0, limit=30):
+    """
+    Autocomplete: term se shuru hone wali values pehle, phir baaki substring matches; har group mein
+    zyada count pehle. [(value, count)] deta hai (limit + 1 tak, taaki caller 'more' jaan sake).
+    """
+    from .models import FacetValue
+
+    queryset = FacetValue.objects.filter(field_name=field_name, count__gt=0)
+    term = ' '.join((term or '').split())
+    if term:
+        # Postgres par gin_trgm_ops index se ILIKE; baaki databases par icontains
+        queryset = queryset.filter(value__trgm_icontains=term).annotate(
+            prefix_rank=Case(
+                When(value__istartswith=term, then=Value(0)), default=Value(1), output_field=IntegerField(),
+            )
+        ).order_by('prefix_rank', '-count', 'value')
+    else:
+        queryset = queryset.order_by('-count', 'value')
+    return list(queryset.values_list('value', 'count')[offset:offset + limit + 1])
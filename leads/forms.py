@@ -1,11 +1,14 @@
 from django import forms
+from django.conf import settings
+from django.urls import reverse
+from .importer import ALLOWED_EXTENSIONS, upload_formats_label
 from .models import Lead
 
 class LeadsUploadForm(forms.Form):
     file = forms.FileField(
-        label='Select CSV or Excel File',
-        help_text='Supported formats: .csv, .xls, .xlsx',
-        widget=forms.FileInput(attrs={'accept':'.csv, .xls, .xlsx'})
+        label=f'Select {upload_formats_label()} File',
+        help_text=f"Supported formats: {', '.join(ALLOWED_EXTENSIONS)}",
+        widget=forms.FileInput(attrs={'accept': ', '.join(ALLOWED_EXTENSIONS)})
     )
     
     overwrite = forms.BooleanField(
@@ -15,6 +18,18 @@ class LeadsUploadForm(forms.Form):
         help_text='If checked, existing leads with same professional email will be updated'
     )
 
+    @property
+    def max_size_mb(self):
+        return settings.LEADS_UPLOAD_MAX_SIZE // (1024 * 1024)
+
+    @property
+    def formats_label(self):
+        return upload_formats_label()
+
+    @property
+    def supported_formats(self):
+        return ', '.join(extension.lstrip('.').upper() for extension in ALLOWED_EXTENSIONS)
+
 class LeadFilterForm(forms.Form):
     
     company_name = forms.CharField(
@@ -34,6 +49,8 @@ class LeadFilterForm(forms.Form):
         max_length=200, 
         required=False, 
         label='General Search',
+        # Full-text index ke saath word-prefix matching hai, substring nahi ('acm' -> 'Acme', 'cme' nahi)
+        help_text='Matches words that start with each search term (all terms required), best matches first.',
         widget=forms.TextInput(attrs={'placeholder': 'Search name, email, company...'})
     )
 
@@ -93,6 +110,12 @@ class LeadFilterForm(forms.Form):
         self.fields['industry'].choices = choices['INDUSTRY_CHOICES']
         self.fields['person_country'].choices = choices['PERSON_COUNTRY_CHOICES']
         self.fields['company_country'].choices = choices['COMPANY_COUNTRY_CHOICES']
+
+        # Facet dropdowns mein sirf selected options render hote hain; baaki Select2 AJAX se
+        for field_name in ('job_title', 'industry', 'person_country', 'company_country'):
+            self.fields[field_name].widget.attrs['data-autocomplete-url'] = reverse(
+                'leads:facet_autocomplete', args=[field_name]
+            )
         
         # Sabhi fields ko optional banayein (DRY principle)
         for field_name, field in self.fields.items():
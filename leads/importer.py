@@ -0,0 +1,546 @@
+import multiprocessing
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from openpyxl import load_workbook
+from django.conf import settings
+from django.core.files import File
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from .facets import FACET_FIELDS, apply_facet_deltas, facet_deltas, facet_values
+from .models import Lead
+from .result_cache import invalidate_results
+from .sniffing import sniff_csv
+from .workers import init_import_worker
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet upload optional hai
+    pyarrow = None
+
+DEFAULT_CHUNK_SIZE = 1000
+
+# Overwrite ke waqt yeh fields kabhi update nahi hote
+PROTECTED_FIELDS = ('created_by', 'source')
+
+
+
+ALLOWED_EXTENSIONS = ['.csv', '.xls', '.xlsx']
+if pyarrow is not None:
+    ALLOWED_EXTENSIONS.append('.parquet')  # Parquet upload sirf pyarrow install ho toh
+
+
+def upload_formats_label():
+    """Upload page / error messages ke liye: 'CSV, Excel or Parquet' (ya pyarrow ke bina 'CSV or Excel')."""
+    return 'CSV, Excel or Parquet' if '.parquet' in ALLOWED_EXTENSIONS else 'CSV or Excel'
+
+
+def get_chunk_size():
+    return getattr(settings, 'LEADS_IMPORT_CHUNK_SIZE', DEFAULT_CHUNK_SIZE)
+
+
+def get_import_workers():
+    return getattr(settings, 'LEADS_IMPORT_WORKERS', 0)
+
+
+def _excel_cell(value):
+    """openpyxl cell value ko string banata hai (pd.read_excel(dtype=str) jaisa)."""
+    if value is None:
+        return ''
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _binary_handle(file):
+    """
+    Django File wrappers (UploadedFile, FieldFile) ke andar ka asli binary file object. pandas wrapper ko
+    sahi se decode nahi karta (InMemoryUploadedFile wali UTF-16 CSV ke headers toot jaate the).
+    """
+    while isinstance(file, File):
+        file = file.file
+    return file
+
+
+def _arrow_strings(column):
+    """Arrow column ko string Series (read_csv(dtype=str) jaisa): null '' aur 5.0 '5' banta hai."""
+    if pyarrow.types.is_string(column.type) or pyarrow.types.is_large_string(column.type):
+        return column.to_pandas().fillna('')
+    return pd.Series([_excel_cell(value) for value in column.to_pylist()], dtype=object)
+
+
+def _excel_headers(header_row):
+    """Khali headers 'Unnamed: N', duplicate headers 'Name.1' (pandas jaisa)."""
+    headers = []
+    seen = Counter()
+    for position, value in enumerate(header_row):
+        header = _excel_cell(value) or f'Unnamed: {position}'
+        if seen[header]:
+            unique_header = f'{header}.{seen[header]}'
+        else:
+            unique_header = header
+        seen[header] += 1
+        headers.append(unique_header)
+    return headers
+
+
+class UploadReader:
+    """
+    Upload file ko chunk_size rows ke DataFrames mein padhta hai (saare columns string):
+    CSV ke liye read_csv(chunksize=...), .xlsx ke liye openpyxl read-only rows,
+    .parquet ke liye pyarrow record batches (koi CSV tokenizing nahi).
+    Memory file size par nahi, chunk size par depend karti hai.
+
+    reader.columns     - file headers
+    reader.encoding / reader.delimiter - CSV ke liye sniffed settings
+    reader.total_rows  - rows ka estimate (progress ke liye; CSV mein quoted newlines bhi gine jaate hain)
+    iter(reader)       - (chunk, first_row_number) pairs, jaise iter_frame_chunks
+    """
+
+    def __init__(self, file, file_name, chunk_size=None):
+        self.file = file
+        self.file_name = file_name
+        self.chunk_size = chunk_size or get_chunk_size()
+        self.columns = []
+        self.total_rows = 0
+        self.encoding = None
+        self.delimiter = None
+
+        extension = os.path.splitext(file_name)[1].lower()
+        if extension == '.csv':
+            chunks = self._csv_chunks()
+        elif extension == '.xlsx':
+            chunks = self._xlsx_chunks()
+        elif extension == '.parquet':
+            chunks = self._parquet_chunks()
+        else:
+            # .xls (xlrd) ka streaming reader nahi hai; poori sheet padh kar chunks
+            df = pd.read_excel(file, dtype=str, keep_default_na=False).fillna('')
+            self.total_rows = len(df)
+            chunks = (chunk for chunk, _ in iter_frame_chunks(df, self.chunk_size))
+
+        # Pehla chunk abhi padhte hain taaki columns/empty check import se pehle mil jaayein
+        self._first_chunk = next(chunks, None)
+        self._chunks = chunks
+        if self._first_chunk is not None:
+            self.columns = list(self._first_chunk.columns)
+
+    @property
+    def is_empty(self):
+        return self._first_chunk is None or self._first_chunk.empty
+
+    def __iter__(self):
+        first_row_number = 2  # +2 = header aur 0-index
+        if self._first_chunk is None:
+            return
+        chunk, self._first_chunk = self._first_chunk, None
+        while chunk is not None:
+            if len(chunk):
+                yield chunk, first_row_number
+                first_row_number += len(chunk)
+            chunk = next(self._chunks, None)
+
+    def _csv_chunks(self):
+        # Encoding/delimiter sample se (encoding poori file par confirm); file ek hi baar parse hoti hai
+        csv_format = sniff_csv(self.file)
+        self.encoding = csv_format.encoding
+        self.delimiter = csv_format.delimiter
+        self.total_rows = csv_format.estimated_rows
+        reader = pd.read_csv(
+            _binary_handle(self.file), dtype=str, keep_default_na=False, chunksize=self.chunk_size,
+            sep=csv_format.delimiter, encoding=csv_format.encoding,
+        )
+        return self._iter_csv_chunks(reader)
+
+    def _iter_csv_chunks(self, reader):
+        # Strict decoding: invalid bytes '\ufffd' ban kar chupchap save nahi hote, upload fail hota hai
+        try:
+            for chunk in reader:
+                yield chunk.fillna('')
+        except UnicodeDecodeError as e:
+            raise ValueError(
+                f"The file could not be read as {self.encoding} ({e.reason}). Please save it as UTF-8 CSV and upload again."
+            ) from e
+
+    def _xlsx_chunks(self):
+        workbook = load_workbook(self.file, read_only=True, data_only=True)
+        worksheet = workbook.active
+        self.total_rows = max((worksheet.max_row or 1) - 1, 0)
+        return self._iter_xlsx_rows(workbook, worksheet)
+
+    def _iter_xlsx_rows(self, workbook, worksheet):
+        try:
+            rows = worksheet.iter_rows(values_only=True)
+            header_row = next(rows, None)
+            if header_row is None:
+                return
+            headers = _excel_headers(header_row)
+            width = len(headers)
+
+            batch = []
+            yielded = False
+            blank_rows = 0
+            for row in rows:
+                # Beech ki khali rows rehti hain (row numbers sahi rahein), aakhri khali rows nahi (read_excel jaisa)
+                if all(value is None or value == '' for value in row):
+                    blank_rows += 1
+                    continue
+                batch.extend([[''] * width] * blank_rows)
+                blank_rows = 0
+                values = [_excel_cell(value) for value in row[:width]]
+                values.extend([''] * (width - len(values)))
+                batch.append(values)
+                if len(batch) >= self.chunk_size:
+                    yield pd.DataFrame(batch, columns=headers, dtype=str)
+                    yielded = True
+                    batch = []
+            if batch or not yielded:
+                # Sirf header row ho toh columns ke saath khali frame
+                yield pd.DataFrame(batch, columns=headers, dtype=str)
+        finally:
+            workbook.close()
+
+
+    def _parquet_chunks(self):
+        if pyarrow is None:
+            raise ValueError("Parquet upload is not available on this server (pyarrow missing).")
+        parquet_file = pyarrow.parquet.ParquetFile(self.file)
+        # Row count footer metadata mein hota hai, estimate nahi
+        self.total_rows = parquet_file.metadata.num_rows
+        return self._iter_parquet_batches(parquet_file)
+
+    def _iter_parquet_batches(self, parquet_file):
+        headers = _excel_headers(parquet_file.schema_arrow.names)
+        yielded = False
+        for batch in parquet_file.iter_batches(batch_size=self.chunk_size):
+            frame = pd.DataFrame({
+                header: _arrow_strings(batch.column(position)) for position, header in enumerate(headers)
+            }, columns=headers)
+            yield frame
+            yielded = True
+        if not yielded:
+            yield pd.DataFrame(columns=headers, dtype=str)
+
+
+def iter_frame_chunks(df, chunk_size, first_row_number=2):
+    """Ek bade DataFrame ko (chunk, first_row_number) pieces mein todta hai (+2 = header aur 0-index)."""
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start:start + chunk_size], first_row_number + start
+
+
+def normalize_frame(df, column_map):
+    """
+    Upload chunk ka column-wise (vectorized) mapping, cleaning aur validation.
+
+    Returns (lead_frame, error_messages): lead_frame mein model fields ke columns hain,
+    error_messages ek Series hai jisme valid rows ke liye '' hota hai.
+    """
+    # Mass strip - har mapped column ek hi baar mein
+    lead_frame = pd.DataFrame(index=df.index)
+    for original_col, model_field in column_map.items():
+        lead_frame[model_field] = df[original_col].fillna('').astype(str).str.strip()
+
+    empty = pd.Series('', index=df.index)
+    emails = lead_frame['professional_email'] if 'professional_email' in lead_frame else empty
+    first_names = lead_frame['first_name'] if 'first_name' in lead_frame else empty
+    last_names = lead_frame['last_name'] if 'last_name' in lead_frame else empty
+    full_names = lead_frame['full_name'] if 'full_name' in lead_frame else empty
+
+    # Smart name splitting (sirf jahan first/last dono khali hain)
+    needs_split = (first_names == '') & (last_names == '') & (full_names != '')
+    if needs_split.any():
+        name_parts = full_names[needs_split].str.split(' ', n=1, expand=True).reindex(columns=[0, 1])
+        lead_frame['first_name'] = first_names.mask(needs_split, name_parts[0].fillna('').str.strip())
+        lead_frame['last_name'] = last_names.mask(needs_split, name_parts[1].fillna('').str.strip())
+        first_names = lead_frame['first_name']
+        last_names = lead_frame['last_name']
+
+    # Error messages - same priority jo row-by-row validation mein thi
+    invalid_email = (emails != '') & ~emails.str.contains('@', regex=False)
+    missing_name = (first_names == '') & (last_names == '')
+    missing_email = emails == ''
+
+    error_messages = empty.copy()
+    error_messages = error_messages.mask(missing_email, 'Required field(s) missing: Professional Email')
+    error_messages = error_messages.mask(missing_name, 'Could not extract valid name from data')
+    error_messages = error_messages.mask(invalid_email, 'Invalid email format: ' + emails)
+
+    return lead_frame, error_messages
+
+
+def validate_frame(frame, column_map, first_row_number, overwrite):
+    """
+    Ek chunk ka normalization + validation (DB ke bina, isliye worker process mein bhi chal sakta hai).
+    Returns (valid_rows, errors):
+      valid_rows - [(row_number, lead_data)] write phase ke liye
+      errors     - [(row_number, error_message, row_data, email)]
+    """
+    lead_frame, error_messages = normalize_frame(frame, column_map)
+    row_numbers = pd.RangeIndex(first_row_number, first_row_number + len(frame))
+    failed = (error_messages != '').to_numpy()
+    emails = lead_frame['professional_email'] if 'professional_email' in lead_frame else None
+    errors = []
+
+    # Python row logic sirf failed rows ke liye
+    for position in failed.nonzero()[0]:
+        email = emails.iat[position] if emails is not None else ''
+        errors.append((int(row_numbers[position]), error_messages.iat[position], frame.iloc[position].to_dict(), email))
+
+    valid_frame = lead_frame[~failed]
+    valid_row_numbers = row_numbers[~failed]
+
+    # File ke andar duplicate emails: Overwrite OFF ho toh pehli row ke baad sab reject
+    if not overwrite and emails is not None:
+        duplicated = valid_frame['professional_email'].duplicated(keep='first').to_numpy()
+        for position in duplicated.nonzero()[0]:
+            row_number = int(valid_row_numbers[position])
+            email = valid_frame['professional_email'].iat[position]
+            errors.append((row_number, f"Lead with email {email} already exists (Overwrite is OFF)",
+                           frame.iloc[row_number - first_row_number].to_dict(), email))
+        valid_frame = valid_frame[~duplicated]
+        valid_row_numbers = valid_row_numbers[~duplicated]
+
+    valid_rows = [
+        (int(row_number), lead_data)
+        for row_number, lead_data in zip(valid_row_numbers, valid_frame.to_dict('records'))
+    ]
+    return valid_rows, errors
+
+
+def _lead_facets(lead):
+    return facet_values({field_name: getattr(lead, field_name) for field_name in FACET_FIELDS})
+
+
+class LeadImporter:
+    """
+    Batched upsert engine for uploads.
+
+    Har chunk ke emails ke liye existing leads ek hi query mein aate hain, naye leads
+    bulk_create aur overwrites bulk_update (sirf changed fields) se likhe jaate hain.
+    Poora import ek transaction mein chalta hai; 50% se zyada errors par rollback.
+    """
+
+    def __init__(self, column_map, user, source, overwrite=False, chunk_size=None, progress_callback=None,
+                 workers=0):
+        self.column_map = column_map
+        self.progress_callback = progress_callback
+        self.user = user
+        self.source = source
+        self.overwrite = overwrite
+        self.chunk_size = chunk_size or get_chunk_size()
+        self.workers = workers
+
+        self.total_rows = 0
+        self.success_count = 0
+        self.update_count = 0
+        self.error_count = 0
+        self.errors_list = []
+        self.warnings_list = []
+
+    def add_error(self, row_number, error_message, row_data, email='N/A'):
+        self.error_count += 1
+        self.errors_list.append({
+            'row_number': row_number,
+            'error_message': str(error_message),
+            'row_data': row_data,
+            'email': email or 'N/A',
+        })
+
+    def run(self, frames):
+        """
+        frames: (DataFrame chunk, first_row_number) pairs ka iterable (UploadReader ya iter_frame_chunks).
+        Error threshold cross hone par ValueError raise hota hai aur sab rollback ho jata hai.
+        """
+        try:
+            with transaction.atomic():
+                for frame, first_row_number, validated in self._validated_frames(frames):
+                    self.apply_validated(frame, first_row_number, validated)
+                    if self.progress_callback:
+                        self.progress_callback(self)
+
+                # If too many errors, rollback
+                if self.error_count > self.total_rows * 0.5:  # More than 50% errors
+                    raise ValueError(f"Too many errors ({self.error_count}/{self.total_rows} rows). Upload cancelled.")
+
+                # bulk_create/bulk_update signals nahi bhejte; cached filter results commit ke baad invalid
+                if self.success_count or self.update_count:
+                    invalidate_results()
+        finally:
+            # Validation aur DB errors alag stages mein aate hain; report row order mein rahe
+            self.errors_list.sort(key=lambda error_info: error_info['row_number'])
+        return self
+
+    def run_dataframe(self, df):
+        """Poore DataFrame ko chunk_size ke batches mein import karta hai."""
+        return self.run(iter_frame_chunks(df, self.chunk_size))
+
+    def process_frame(self, frame, first_row_number):
+        self.apply_validated(frame, first_row_number, validate_frame(frame, self.column_map, first_row_number, self.overwrite))
+
+    def apply_validated(self, frame, first_row_number, validated):
+        """validate_frame ka result (errors + valid rows) record/write karta hai."""
+        valid_rows, errors = validated
+        self.total_rows += len(frame)
+        self._frame = frame
+        self._first_row_number = first_row_number
+
+        for row_number, error_message, row_data, email in errors:
+            self.add_error(row_number, error_message, row_data, email)
+        self.write_rows(valid_rows)
+
+    def _validated_frames(self, frames):
+        """
+        (frame, first_row_number, validate_frame result) order mein yield karta hai.
+        workers > 1 ho toh validation ProcessPoolExecutor mein chunks par parallel chalti hai;
+        sirf workers * 2 chunks ek saath in-flight rehte hain taaki memory bounded rahe.
+        Pool sirf management commands (import_leads, process_upload_jobs) se chalta hai; web request
+        mein workers=0 rehta hai.
+        """
+        if self.workers <= 1:
+            for frame, first_row_number in frames:
+                yield frame, first_row_number, validate_frame(frame, self.column_map, first_row_number, self.overwrite)
+            return
+
+        # spawn: naya interpreter (parent ke threads/DB connections/locks fork nahi hote); initializer django.setup() karta hai
+        with ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=init_import_worker) as executor:
+            pending = deque()
+            for frame, first_row_number in frames:
+                future = executor.submit(validate_frame, frame, self.column_map, first_row_number, self.overwrite)
+                pending.append((frame, first_row_number, future))
+                if len(pending) >= self.workers * 2:
+                    frame, first_row_number, future = pending.popleft()
+                    yield frame, first_row_number, future.result()
+            while pending:
+                frame, first_row_number, future = pending.popleft()
+                yield frame, first_row_number, future.result()
+
+    def write_rows(self, valid_rows):
+        """Validated rows (row_number, lead_data) ko DB mein upsert karta hai."""
+        emails = {lead_data['professional_email'] for _, lead_data in valid_rows}
+        existing = {lead.professional_email: lead for lead in Lead.objects.filter(professional_email__in=emails)}
+
+        to_create = {}  # email -> (row_number, lead)
+        to_update = {}  # email -> (row_number, lead, changed_fields)
+        # email -> update_count mein gini gayi rows; ek email par kai rows merge ho sakti hain,
+        # write fail ho toh in sab ko count se hata kar error banana hai
+        self._update_rows = {}
+
+        for row_number, lead_data in valid_rows:
+            row_number = int(row_number)
+            email = lead_data['professional_email']
+            existing_lead = existing.get(email)
+            pending_create = to_create.get(email)
+
+            if existing_lead is None and pending_create is None:
+                # Create new lead
+                lead = Lead(**lead_data, source=self.source, created_by=self.user)
+                to_create[email] = (row_number, lead)
+                continue
+
+            if not self.overwrite:
+                self.add_error(row_number, f"Lead with email {email} already exists (Overwrite is OFF)",
+                               self._row_data(row_number), email)
+                continue
+
+            # Update existing lead (ya isi file mein pehle aaya hua lead)
+            lead = existing_lead if existing_lead is not None else pending_create[1]
+            updated_fields = []
+            for key, value in lead_data.items():
+                if key not in PROTECTED_FIELDS and value:
+                    current_value = getattr(lead, key, '')
+                    if current_value != value:
+                        setattr(lead, key, value)
+                        updated_fields.append(key)
+
+            if updated_fields:
+                self.update_count += 1
+                self._update_rows.setdefault(email, []).append(row_number)
+                self.warnings_list.append(f"Row {row_number}: Updated lead {email} - Fields: {', '.join(updated_fields)}")
+                if existing_lead is not None:
+                    previous = to_update.get(email)
+                    changed = set(previous[2]) if previous else set()
+                    changed.update(updated_fields)
+                    to_update[email] = (row_number, lead, changed)
+            else:
+                self.warnings_list.append(f"Row {row_number}: No changes for lead {email} (already up to date)")
+
+        self._flush_creates(list(to_create.values()))
+        self._flush_updates(list(to_update.values()))
+
+    def _flush_creates(self, pending):
+        if not pending:
+            return
+
+        leads = [lead for _, lead in pending]
+        for lead in leads:
+            lead.populate_derived_fields()
+        try:
+            with transaction.atomic():
+                Lead.objects.bulk_create(leads, batch_size=self.chunk_size)
+            created = pending
+        except DatabaseError:
+            # Batch fail hua toh row-by-row (savepoint ke saath) dobara try karein taaki sahi row ka error mile.
+            # bulk_create([lead]) koi signal nahi chalata, isliye facet counts sirf neeche wale deltas se badhte hain
+            created = []
+            for row_number, lead in pending:
+                try:
+                    with transaction.atomic():
+                        Lead.objects.bulk_create([lead])
+                    created.append((row_number, lead))
+                except DatabaseError as e:
+                    self.add_error(row_number, e, self._row_data(row_number), lead.professional_email)
+                    # Isi file ki baad wali rows jo is naye lead ko update kar rahi thin, woh bhi fail
+                    self._fail_updates(lead.professional_email, e)
+
+        self.success_count += len(created)
+        deltas = Counter()
+        for _, lead in created:
+            deltas.update(facet_deltas(None, _lead_facets(lead)))
+        apply_facet_deltas(deltas)
+
+    def _flush_updates(self, pending):
+        if not pending:
+            return
+
+        now = timezone.now()
+        fields = {'updated_at'}
+        for _, lead, changed in pending:
+            lead.populate_derived_fields()
+            lead.updated_at = now
+            fields.update(changed)
+            for field_name in changed:
+                fields.update(Lead.DERIVED_FIELDS.get(field_name, ()))
+
+        try:
+            with transaction.atomic():
+                Lead.objects.bulk_update([lead for _, lead, _ in pending], sorted(fields), batch_size=self.chunk_size)
+            updated = pending
+        except DatabaseError:
+            updated = []
+            for row_number, lead, changed in pending:
+                try:
+                    with transaction.atomic():
+                        Lead.objects.bulk_update([lead], sorted(fields))
+                    updated.append((row_number, lead, changed))
+                except DatabaseError as e:
+                    self._fail_updates(lead.professional_email, e)
+
+        deltas = Counter()
+        for _, lead, _ in updated:
+            deltas.update(facet_deltas(facet_values(lead._loaded_values), _lead_facets(lead)))
+        apply_facet_deltas(deltas)
+
+    def _fail_updates(self, email, error):
+        """Email ki saari merged update rows ko update_count se hata kar error report mein daalta hai."""
+        for row_number in self._update_rows.pop(email, []):
+            self.update_count -= 1
+            self.add_error(row_number, error, self._row_data(row_number), email)
+
+    def _row_data(self, row_number):
+        """Error report ke liye current chunk ki original file row (sirf failed rows par banti hai)."""
+        return self._frame.iloc[row_number - self._first_row_number].to_dict()
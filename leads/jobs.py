@@ -0,0 +1,201 @@
+import json
+import os
+import traceback
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .error_reports import save_error_report
+from .columns import decisions_to_map, mapping_summary, resolve_columns
+from .importer import LeadImporter, UploadReader
+from .models import UploadJob
+
+# Running job jiska progress itne seconds se nahi badla (worker mar gaya) failed mark hota hai
+DEFAULT_JOB_TIMEOUT = 30 * 60
+
+
+# --- Progress (job ke transaction ke bahar) ---
+# Import ek hi transaction mein chalta hai, isliye progress DB row mein likhne par
+# commit tak dikhega nahi. Running job ka progress ek chhoti JSON file mein rehta hai.
+
+def progress_path(job):
+    return f"{job.file.path}.progress.json"
+
+
+def write_progress(job, importer):
+    data = {
+        'processed_rows': importer.total_rows,
+        'created_count': importer.success_count,
+        'updated_count': importer.update_count,
+        'failed_count': importer.error_count,
+    }
+    path = progress_path(job)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def read_progress(job):
+    """Job ka latest progress dict (running job ke liye progress file, warna DB counters)."""
+    progress = {
+        'processed_rows': job.processed_rows,
+        'created_count': job.created_count,
+        'updated_count': job.updated_count,
+        'failed_count': job.failed_count,
+    }
+    if job.status == UploadJob.STATUS_RUNNING:
+        try:
+            with open(progress_path(job)) as f:
+                progress.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+    return progress
+
+
+def clear_progress(job):
+    try:
+        os.remove(progress_path(job))
+    except OSError:
+        pass
+
+
+# --- Worker ---
+
+def _last_activity(job):
+    """Job ki aakhri activity: progress file har chunk par likhi jaati hai, warna started_at."""
+    try:
+        modified = datetime.fromtimestamp(os.path.getmtime(progress_path(job)), tz=timezone.get_current_timezone())
+    except (OSError, ValueError):
+        return job.started_at
+    return max(job.started_at, modified) if job.started_at else modified
+
+
+def fail_stale_jobs(timeout=None):
+    """
+    'running' jobs jinki LEADS_UPLOAD_JOB_TIMEOUT seconds se koi activity nahi (worker crash/restart)
+    failed mark hote hain. Import ek transaction mein tha, isliye adhoora kuch bhi save nahi hua.
+    """
+    if timeout is None:
+        timeout = getattr(settings, 'LEADS_UPLOAD_JOB_TIMEOUT', DEFAULT_JOB_TIMEOUT)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    for job in UploadJob.objects.filter(status=UploadJob.STATUS_RUNNING, started_at__lt=cutoff):
+        last_activity = _last_activity(job)
+        if last_activity is not None and last_activity >= cutoff:
+            continue
+        # Conditional update: is beech job finish ho gaya ho toh kuch nahi
+        failed = UploadJob.objects.filter(pk=job.pk, status=UploadJob.STATUS_RUNNING).update(
+            status=UploadJob.STATUS_FAILED, finished_at=timezone.now(),
+            message="Upload worker stopped while processing this file. Nothing was saved; please upload it again.",
+        )
+        if failed:
+            clear_progress(job)
+            delete_upload_file(job)
+
+
+def claim_next_job():
+    """
+    Sabse purana pending job atomically 'running' mark karke return karta hai.
+    Conditional UPDATE se claim hota hai, taaki multiple workers ek job do baar na uthayein.
+    """
+    fail_stale_jobs()
+    while True:
+        job = UploadJob.objects.filter(status=UploadJob.STATUS_PENDING).order_by('created_at', 'pk').first()
+        if job is None:
+            return None
+        claimed = UploadJob.objects.filter(pk=job.pk, status=UploadJob.STATUS_PENDING).update(
+            status=UploadJob.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            job.refresh_from_db()
+            return job
+
+
+def delete_upload_file(job):
+    """Job khatam hone ke baad uploaded file ki zaroorat nahi (name record mein rehta hai)."""
+    if job.file:
+        job.file.storage.delete(job.file.name)
+
+
+def _finish(job, status, message):
+    job.status = status
+    job.message = message
+    job.finished_at = timezone.now()
+    job.save()
+    clear_progress(job)
+
+
+def run_upload_job(job, workers=0):
+    """
+    Ek claimed UploadJob ko process karta hai aur result/error report job record mein save karta hai.
+    Kuch bhi fail ho toh job 'failed' hota hai (running mein atka nahi rehta); upload file hamesha delete.
+    workers > 1 = validation process pool (sirf worker command se).
+    """
+    try:
+        return _run_upload_job(job, workers)
+    except Exception as e:
+        print(f"Upload Job #{job.pk} Error: {traceback.format_exc()}")
+        _finish(job, UploadJob.STATUS_FAILED, f"Upload failed: {e}")
+        return job
+    finally:
+        delete_upload_file(job)
+
+
+def _run_upload_job(job, workers):
+    with job.file.open('rb') as file:
+        try:
+            reader = UploadReader(file, job.original_name)
+        except Exception as e:
+            _finish(job, UploadJob.STATUS_FAILED, f"Error reading file: {e}")
+            return job
+
+        if reader.is_empty:
+            _finish(job, UploadJob.STATUS_FAILED, "The uploaded file is empty.")
+            return job
+
+        column_decisions = resolve_columns(reader.columns)
+        column_map = decisions_to_map(column_decisions)
+        available_columns = [str(column).strip() for column in reader.columns]
+        job.total_rows = reader.total_rows  # estimate; import ke baad exact
+        job.save(update_fields=['total_rows'])
+
+        importer = LeadImporter(
+            column_map,
+            user=job.created_by,
+            source=f'Uploaded File: {job.original_name}',
+            overwrite=job.overwrite,
+            progress_callback=lambda importer: write_progress(job, importer),
+            workers=workers,
+        )
+
+        try:
+            importer.run(reader)
+            status = UploadJob.STATUS_COMPLETED
+            message = (
+                f"{importer.success_count} new leads created, "
+                f"{importer.update_count} existing leads updated, "
+                f"{importer.error_count} rows failed"
+            )
+        except Exception as e:
+            status = UploadJob.STATUS_FAILED
+            message = f"Upload failed and rolled back. {importer.error_count} row(s) had errors. {e}"
+            if not importer.errors_list:
+                print(f"Upload Job #{job.pk} Error: {traceback.format_exc()}")
+            # Rollback ke baad kuch bhi create/update nahi hua
+            importer.success_count = importer.update_count = 0
+
+    if 'professional_email' not in column_map.values():
+        message += f" | 'Professional Email' column not found. Available columns: {', '.join(available_columns)}"
+    summary = mapping_summary(column_decisions)
+    if summary:
+        message += f" | Column mapping: {summary}"
+
+    job.total_rows = job.processed_rows = importer.total_rows
+    job.created_count = importer.success_count
+    job.updated_count = importer.update_count
+    job.failed_count = importer.error_count
+    job.error_report = save_error_report(importer.errors_list) if importer.errors_list else ''
+    job.warnings = importer.warnings_list[:50]  # Limit to 50 warnings
+    _finish(job, status, message)
+    return job
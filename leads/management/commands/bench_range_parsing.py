@@ -0,0 +1,64 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+import numpy as np
+
+from leads.utils import (
+    EMPLOYEE_RANGES, REVENUE_RANGES, _parse_range, _parse_range_cached, _parse_value, _parse_value_cached,
+    check_multiple_ranges, parse_range_to_tuple, range_bounds, range_bounds_many, ranges_overlap_mask,
+)
+
+
+def _uncached_value(value_str):
+    # parse_value jaisa, lekin _parse_value_cached ke bina
+    return _parse_value(str(value_str)) if value_str else 0
+
+
+class Command(BaseCommand):
+    help = "Range parsing ka microbenchmark: uncached vs memoized vs bulk range_bounds_many."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=200_000, help='Kitni values parse karni hain.')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        # Real data jaisa: kuch dozen distinct strings, baar baar repeat
+        samples = [value for value, _ in EMPLOYEE_RANGES + REVENUE_RANGES if value]
+        samples += ['250', '$12M', '1,200', '5,000+', '$2.5B', 'n/a', '']
+        values = [rng.choice(samples) for _ in range(options['rows'])]
+        filters = ['51-200', '$1M-5M', '10001+']
+
+        def timed(label, func):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f"{label:45} {elapsed * 1000:9.1f} ms")
+            return elapsed
+
+        def uncached():
+            for value in values:
+                _parse_range(str(value), _uncached_value) if value else (None, None)
+
+        def clear_caches():
+            _parse_value_cached.cache_clear()
+            _parse_range_cached.cache_clear()
+
+        clear_caches()
+        baseline = timed('parse (uncached)', uncached)
+        clear_caches()  # memoized run khali cache se shuru (misses bhi gine jaate hain)
+        memoized = timed('parse_range_to_tuple (memoized)', lambda: [parse_range_to_tuple(v) for v in values])
+        clear_caches()
+        bulk = timed('range_bounds_many (bulk)', lambda: range_bounds_many(values))
+
+        scalar_filter = timed('check_multiple_ranges (per row)', lambda: [check_multiple_ranges(filters, v) for v in values])
+        mins, maxs = np.array(range_bounds_many(values), dtype=np.float64).T  # None -> NaN
+        filter_bounds = [range_bounds(value) for value in filters]
+        vector_filter = timed('ranges_overlap_mask (vectorized)', lambda: ranges_overlap_mask(filter_bounds, mins, maxs))
+
+        self.stdout.write(
+            f"\nSpeedup vs uncached: memoized {baseline / memoized:.1f}x, bulk {baseline / bulk:.1f}x; "
+            f"filter mask {scalar_filter / vector_filter:.1f}x"
+        )
@@ -0,0 +1,65 @@
+import os
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from leads.columns import decisions_to_map, mapping_report, resolve_columns
+from leads.error_reports import save_error_report
+from leads.importer import ALLOWED_EXTENSIONS, LeadImporter, UploadReader, get_import_workers, upload_formats_label
+
+
+class Command(BaseCommand):
+    help = "CSV/Excel/Parquet file se leads import karta hai (upload page jaisa hi column mapping aur validation)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='CSV / XLS / XLSX file ka path.')
+        parser.add_argument('--user', required=True, help='Leads kis username ke naam se banein.')
+        parser.add_argument('--overwrite', action='store_true', help='Same email wale existing leads update karein.')
+        parser.add_argument('--dry-run', action='store_true', help='Sirf column mapping dikhayein, import nahi.')
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Validation ke liye processes (default LEADS_IMPORT_WORKERS; 0/1 = single process).',
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if os.path.splitext(path)[1].lower() not in ALLOWED_EXTENSIONS:
+            raise CommandError(f"Only {upload_formats_label()} files are supported.")
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f"User '{options['user']}' not found.")
+
+        with open(path, 'rb') as file:
+            reader = UploadReader(file, os.path.basename(path))
+            if reader.is_empty:
+                raise CommandError("The file is empty.")
+
+            decisions = resolve_columns(reader.columns)
+            self.stdout.write("Column mapping:")
+            for decision in mapping_report(decisions):
+                target = decision['field'] or '-'
+                self.stdout.write(f"  {decision['column']!r:40} -> {target:25} ({decision['match']})")
+
+            column_map = decisions_to_map(decisions)
+            if 'professional_email' not in column_map.values():
+                self.stderr.write("Warning: 'Professional Email' column not found.")
+            if options['dry_run']:
+                return
+
+            importer = LeadImporter(
+                column_map, user=user, source=f'Imported File: {os.path.basename(path)}', overwrite=options['overwrite'],
+                workers=get_import_workers() if options['workers'] is None else options['workers'],
+            )
+            try:
+                importer.run(reader)
+            except ValueError as e:
+                raise CommandError(f"Import rolled back: {e}")
+            finally:
+                if importer.errors_list:
+                    report_id = save_error_report(importer.errors_list)
+                    self.stdout.write(f"Error report saved: {report_id} ({importer.error_count} rows)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{importer.success_count} created, {importer.update_count} updated, {importer.error_count} failed."
+        ))
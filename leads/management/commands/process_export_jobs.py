@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from leads.export_jobs import claim_next_export_job, run_export_job
+
+
+class Command(BaseCommand):
+    help = "Background worker: pending lead export jobs (ExportJob) ko ek-ek karke file mein render karta hai."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Pending jobs khatam hone par exit karein.')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Naye jobs check karne ka interval (seconds).')
+
+    def handle(self, *args, **options):
+        self.stdout.write("Export worker started.")
+        while True:
+            close_old_connections()
+            job = claim_next_export_job()
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f"Processing export job #{job.pk} ({job.format})...")
+            job = run_export_job(job)
+            self.stdout.write(f"Job #{job.pk} {job.status}: {job.message}")
@@ -0,0 +1,36 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from leads.importer import get_import_workers
+from leads.jobs import claim_next_job, run_upload_job
+
+
+class Command(BaseCommand):
+    help = "Background worker: pending lead upload jobs (UploadJob) ko ek-ek karke process karta hai."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Pending jobs khatam hone par exit karein.')
+        parser.add_argument('--sleep', type=float, default=2.0, help='Naye jobs check karne ka interval (seconds).')
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Validation ke liye processes (default LEADS_IMPORT_WORKERS; 0/1 = single process).',
+        )
+
+    def handle(self, *args, **options):
+        workers = get_import_workers() if options['workers'] is None else options['workers']
+        self.stdout.write("Upload worker started.")
+        while True:
+            close_old_connections()
+            job = claim_next_job()
+
+            if job is None:
+                if options['once']:
+                    break
+                time.sleep(options['sleep'])
+                continue
+
+            self.stdout.write(f"Processing upload job #{job.pk} ({job.original_name})...")
+            job = run_upload_job(job, workers=workers)
+            self.stdout.write(f"Job #{job.pk} {job.status}: {job.message}")
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from leads.facets import rebuild_facets
+
+
+class Command(BaseCommand):
+    help = "Filter dropdowns ka facet index (FacetValue) Lead table se dobara banata hai."
+
+    def handle(self, *args, **options):
+        total = rebuild_facets()
+        self.stdout.write(self.style.SUCCESS(f"Facet index rebuilt: {total} distinct values."))
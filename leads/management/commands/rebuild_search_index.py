@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from leads.search import install_search_index, install_trigram_indexes
+
+
+class Command(BaseCommand):
+    help = "General search ka full-text index aur filters ke trigram indexes (Postgres GIN / SQLite FTS5) dobara banata hai."
+
+    def handle(self, *args, **options):
+        with connection.schema_editor() as schema_editor:
+            installed = install_search_index(schema_editor)
+            install_trigram_indexes(schema_editor)
+        if installed:
+            self.stdout.write(self.style.SUCCESS(f"Full-text search and trigram indexes rebuilt ({connection.vendor})."))
+        else:
+            self.stdout.write(self.style.WARNING(f"Full-text search not supported on {connection.vendor}; icontains search will be used."))
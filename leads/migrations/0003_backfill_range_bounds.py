@@ -0,0 +1,41 @@
+from django.db import migrations
+
+from leads.utils import range_bounds_many
+
+BATCH_SIZE = 2000
+
+
+def backfill_range_bounds(apps, schema_editor):
+    """Purane leads ke liye employees/revenue ke numeric bounds bharta hai."""
+    Lead = apps.get_model('leads', 'Lead')
+
+    def flush(batch):
+        # Batch ki distinct employees/revenue strings ek-ek baar parse hoti hain
+        employees = range_bounds_many(lead.employees for lead in batch)
+        revenue = range_bounds_many(lead.revenue for lead in batch)
+        for lead, (employees_min, employees_max), (revenue_min, revenue_max) in zip(batch, employees, revenue):
+            lead.employees_min, lead.employees_max = employees_min, employees_max
+            lead.revenue_min, lead.revenue_max = revenue_min, revenue_max
+        Lead.objects.bulk_update(batch, ['employees_min', 'employees_max', 'revenue_min', 'revenue_max'])
+
+    batch = []
+    rows = Lead.objects.only('id', 'employees', 'revenue').order_by('pk').iterator(chunk_size=BATCH_SIZE)
+    for lead in rows:
+        batch.append(lead)
+        if len(batch) >= BATCH_SIZE:
+            flush(batch)
+            batch = []
+
+    if batch:
+        flush(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0002_lead_range_bounds'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_range_bounds, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:01
+
+from django.db import migrations, models
+
+from leads.facets import rebuild_facets
+
+
+def populate_facets(apps, schema_editor):
+    rebuild_facets(lead_model=apps.get_model('leads', 'Lead'), facet_model=apps.get_model('leads', 'FacetValue'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0003_backfill_range_bounds'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FacetValue',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field_name', models.CharField(max_length=50)),
+                ('value', models.CharField(max_length=200)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('field_name', 'value'), name='unique_facet_value')],
+            },
+        ),
+        migrations.RunPython(populate_facets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:06
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0005_uploadjob'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='lead',
+            index=models.Index(fields=['-created_at', '-id'], name='lead_created_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations
+
+from leads.search import install_trigram_indexes, uninstall_trigram_indexes
+
+
+def install(apps, schema_editor):
+    # Bade table par writes block na hon, isliye Postgres par CONCURRENTLY (migration atomic nahi hai)
+    install_trigram_indexes(schema_editor, concurrently=True)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_trigram_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('leads', '0007_lead_full_text_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 21:10
+
+from django.db import migrations, models
+
+from leads.error_reports import save_error_report
+
+
+def move_errors_to_reports(apps, schema_editor):
+    UploadJob = apps.get_model('leads', 'UploadJob')
+    for job in UploadJob.objects.exclude(errors=[]).only('pk', 'errors').iterator():
+        if job.errors:
+            UploadJob.objects.filter(pk=job.pk).update(error_report=save_error_report(job.errors))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0008_lead_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='uploadjob',
+            name='error_report',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+        migrations.RunPython(move_errors_to_reports, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='uploadjob',
+            name='errors',
+        ),
+    ]
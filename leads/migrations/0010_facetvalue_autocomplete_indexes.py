@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:35
+
+from django.db import migrations, models
+
+from leads.search import install_facet_trigram_index, uninstall_facet_trigram_index
+
+
+def install(apps, schema_editor):
+    install_facet_trigram_index(schema_editor, concurrently=True)
+
+
+def uninstall(apps, schema_editor):
+    uninstall_facet_trigram_index(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('leads', '0009_uploadjob_error_report'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='facetvalue',
+            index=models.Index(fields=['field_name', '-count'], name='facet_field_count_idx'),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
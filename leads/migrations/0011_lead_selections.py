@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:41
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0010_facetvalue_autocomplete_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadSelection',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('filter_spec', models.JSONField(blank=True, null=True)),
+                ('size', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lead_selections', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='LeadSelectionItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='selection_items', to='leads.lead')),
+                ('selection', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='items', to='leads.leadselection')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('selection', 'lead'), name='unique_selection_lead')],
+            },
+        ),
+    ]
@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leads', '0011_lead_selections'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ExportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('format', models.CharField(choices=[('csv.gz', 'CSV (gzip)'), ('xlsx', 'Excel (XLSX)'), ('parquet', 'Parquet')], default='csv.gz', max_length=10)),
+                ('filter_spec', models.JSONField(blank=True, default=list)),
+                ('spec_key', models.CharField(max_length=32)),
+                ('data_version', models.BigIntegerField(default=0)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('file', models.FileField(blank=True, upload_to='lead_exports/%Y/%m/')),
+                ('file_size', models.BigIntegerField(default=0)),
+                ('message', models.TextField(blank=True, default='')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='export_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at'], name='exportjob_status_idx'), models.Index(fields=['spec_key', 'format', 'data_version'], name='exportjob_reuse_idx')],
+            },
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 
 from django.contrib.auth.models import User
+
+from .utils import range_bounds
 # Create your models here.
 
 class Lead(models.Model):
@@ -36,6 +38,13 @@ class Lead(models.Model):
     company_phone = models.CharField(max_length=20, blank=True, null=True)
     comments = models.TextField(blank=True, null=True)
     revenue = models.CharField(max_length=100, blank=True, null=True)
+
+    # Parsed numeric bounds (employees/revenue strings se save() par bharte hain)
+    # Range filters inhi indexed columns par SQL mein chalte hain.
+    employees_min = models.BigIntegerField(blank=True, null=True, editable=False)
+    employees_max = models.BigIntegerField(blank=True, null=True, editable=False)
+    revenue_min = models.BigIntegerField(blank=True, null=True, editable=False)
+    revenue_max = models.BigIntegerField(blank=True, null=True, editable=False)
     
     # Additional fields
     status = models.CharField(max_length=50, default='New', 
@@ -50,12 +59,213 @@ class Lead(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='lead_created_keyset_idx'),
+            models.Index(fields=['employees_min', 'employees_max'], name='lead_employees_range_idx'),
+            models.Index(fields=['revenue_min', 'revenue_max'], name='lead_revenue_range_idx'),
+        ]
         
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.company_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # DB se load hui values yaad rakhein, taaki save par facet counts ka diff nikal sakein
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    # update_fields mein source field ho toh uske derived columns bhi save hone chahiye
+    DERIVED_FIELDS = {
+        'first_name': ['full_name'],
+        'last_name': ['full_name'],
+        'employees': ['employees_min', 'employees_max'],
+        'revenue': ['revenue_min', 'revenue_max'],
+    }
+
     def save(self, *args, **kwargs):
+        self.populate_derived_fields()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = list(update_fields)
+            for name in list(update_fields):
+                update_fields.extend(f for f in self.DERIVED_FIELDS.get(name, []) if f not in update_fields)
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+
+    def populate_derived_fields(self):
+        """save() se pehle bharne wale fields; bulk_create/bulk_update paths ise khud call karte hain."""
         # Automatically generate full_name if not provided
         if not self.full_name and self.first_name and self.last_name:
             self.full_name = f"{self.first_name} {self.last_name}"
-        super().save(*args, **kwargs)
\ No newline at end of file
+        self.update_range_bounds()
+
+    def update_range_bounds(self):
+        """employees/revenue strings se numeric min/max columns ko sync karta hai."""
+        self.employees_min, self.employees_max = range_bounds(self.employees)
+        self.revenue_min, self.revenue_max = range_bounds(self.revenue)
+
+
+class FacetValue(models.Model):
+    """
+    Filter dropdowns ke liye distinct values aur unke counts (Lead save/delete par update hota hai).
+    Poora index 'python manage.py rebuild_facets' se dobara banaya ja sakta hai.
+    """
+    field_name = models.CharField(max_length=50)
+    value = models.CharField(max_length=200)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['field_name', 'value'], name='unique_facet_value'),
+        ]
+        indexes = [
+            # Autocomplete: khali search par sabse common values pehle
+            models.Index(fields=['field_name', '-count'], name='facet_field_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.field_name}: {self.value} ({self.count})"
+
+
+class LeadSelection(models.Model):
+    """
+    Bulk actions (export) ke liye server-side selection: ya toh chune hue leads (LeadSelectionItem rows),
+    ya ek stored filter spec (LeadQuery) jo action ke waqt apply hota hai.
+    """
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='lead_selections')
+    filter_spec = models.JSONField(blank=True, null=True)  # None = explicit IDs
+    size = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Selection #{self.pk} ({self.size} leads)"
+
+    def leads(self):
+        """Selected leads ka queryset (IDs par JOIN, bade IN list ke bina)."""
+        if self.filter_spec is not None:
+            from .query import LeadQuery
+            return LeadQuery.from_json(self.filter_spec).apply(Lead.objects.all())
+        return Lead.objects.filter(selection_items__selection=self)
+
+
+class LeadSelectionItem(models.Model):
+    selection = models.ForeignKey(LeadSelection, on_delete=models.CASCADE, related_name='items')
+    lead = models.ForeignKey(Lead, on_delete=models.CASCADE, related_name='selection_items')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['selection', 'lead'], name='unique_selection_lead'),
+        ]
+
+
+class UploadJob(models.Model):
+    """
+    Background mein process hone wala lead upload ('python manage.py process_upload_jobs' worker chalata hai).
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    file = models.FileField(upload_to='lead_uploads/%Y/%m/')
+    original_name = models.CharField(max_length=255)
+    overwrite = models.BooleanField(default=False)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    # Progress counters
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    failed_count = models.PositiveIntegerField(default=0)
+
+    # Result / error report (errors leads.error_reports ki compressed file mein, yahan sirf id)
+    message = models.TextField(blank=True, default='')
+    error_report = models.CharField(max_length=32, blank=True, default='')
+    warnings = models.JSONField(default=list, blank=True)
+
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='upload_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='uploadjob_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"Upload #{self.pk} {self.original_name} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+
+class ExportJob(models.Model):
+    """
+    Background mein banne wala filtered export ('python manage.py process_export_jobs' worker chalata hai).
+    Same filters + format ka completed export, jab tak leads nahi badle (data_version), dobara use hota hai.
+    """
+    FORMAT_CSV_GZ = 'csv.gz'
+    FORMAT_XLSX = 'xlsx'
+    FORMAT_PARQUET = 'parquet'
+    FORMAT_CHOICES = [
+        (FORMAT_CSV_GZ, 'CSV (gzip)'),
+        (FORMAT_XLSX, 'Excel (XLSX)'),
+        (FORMAT_PARQUET, 'Parquet'),
+    ]
+
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_COMPLETED = 'completed'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_COMPLETED, 'Completed'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    format = models.CharField(max_length=10, choices=FORMAT_CHOICES, default=FORMAT_CSV_GZ)
+    filter_spec = models.JSONField(default=list, blank=True)  # LeadQuery.to_json()
+    spec_key = models.CharField(max_length=32)  # LeadQuery.cache_key
+    data_version = models.BigIntegerField(default=0)  # leads.result_cache generation
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=STATUS_PENDING)
+
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    file = models.FileField(upload_to='lead_exports/%Y/%m/', blank=True)
+    file_size = models.BigIntegerField(default=0)
+    message = models.TextField(blank=True, default='')
+
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='export_jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='exportjob_status_idx'),
+            models.Index(fields=['spec_key', 'format', 'data_version'], name='exportjob_reuse_idx'),
+        ]
+
+    def __str__(self):
+        return f"Export #{self.pk} {self.format} ({self.status})"
+
+    @property
+    def is_finished(self):
+        return self.status in (self.STATUS_COMPLETED, self.STATUS_FAILED)
+
+    @property
+    def download_name(self):
+        return f"leads_export_{self.pk}.{self.format}"
@@ -0,0 +1,99 @@
+import base64
+import hashlib
+import json
+from datetime import datetime
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Q
+
+from leadgenpro.cache import get_or_set
+
+DEFAULT_PER_PAGE = 25
+
+
+def encode_cursor(lead, direction):
+    """(created_at, id) position ko URL-safe opaque string mein badalta hai."""
+    payload = json.dumps({'c': lead.created_at.isoformat(), 'i': lead.pk, 'd': direction}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Cursor string ko (created_at, id, direction) mein badalta hai; invalid cursor par None."""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        direction = payload['d']
+        if direction not in ('next', 'prev'):
+            return None
+        return datetime.fromisoformat(payload['c']), int(payload['i']), direction
+    except (ValueError, KeyError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """Ek keyset (seek) page: template ke liye Paginator ke Page jaisa chhota interface."""
+
+    def __init__(self, object_list, has_next, has_previous):
+        self.object_list = object_list
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = encode_cursor(object_list[-1], 'next') if has_next and object_list else None
+        self.previous_cursor = encode_cursor(object_list[0], 'prev') if has_previous and object_list else None
+        self.total_count = None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate_keyset(queryset, cursor=None, per_page=DEFAULT_PER_PAGE):
+    """
+    (created_at, id) par seek pagination: OFFSET aur COUNT(*) ke bina, isliye deep pages bhi
+    page 1 jitne hi fast hain. Order hamesha newest first ('-created_at', '-id').
+    """
+    position = decode_cursor(cursor)
+
+    if position is None:
+        rows = list(queryset.order_by('-created_at', '-id')[:per_page + 1])
+        return KeysetPage(rows[:per_page], has_next=len(rows) > per_page, has_previous=False)
+
+    created_at, pk, direction = position
+    if direction == 'next':
+        after = Q(created_at__lt=created_at) | Q(created_at=created_at, id__lt=pk)
+        rows = list(queryset.filter(after).order_by('-created_at', '-id')[:per_page + 1])
+        return KeysetPage(rows[:per_page], has_next=len(rows) > per_page, has_previous=True)
+
+    before = Q(created_at__gt=created_at) | Q(created_at=created_at, id__gt=pk)
+    rows = list(queryset.filter(before).order_by('created_at', 'id')[:per_page + 1])
+    has_previous = len(rows) > per_page
+    return KeysetPage(list(reversed(rows[:per_page])), has_next=True, has_previous=has_previous)
+
+
+def approximate_count(queryset, cache_key_parts):
+    """
+    Total leads count: bina filter ke Postgres par planner estimate (reltuples),
+    warna COUNT(*) jo LEADS_COUNT_CACHE_TIMEOUT seconds tak cache rehta hai.
+    """
+    if not queryset.query.where and connection.vendor == 'postgresql':
+        with connection.cursor() as db_cursor:
+            db_cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [queryset.model._meta.db_table],
+            )
+            row = db_cursor.fetchone()
+        if row and row[0] > 0:
+            return row[0]
+
+    digest = hashlib.md5(json.dumps(cache_key_parts, sort_keys=True, default=str).encode()).hexdigest()
+    return get_or_set(
+        'counts', f'leads:count:{digest}', queryset.count, getattr(settings, 'LEADS_COUNT_CACHE_TIMEOUT', 300)
+    )
@@ -0,0 +1,143 @@
+import hashlib
+from functools import lru_cache
+
+from django.db.models import Q
+
+from .models import Lead
+from .search import contains_any_q, search_q
+from .utils import range_bounds, range_bounds_q
+
+# Substring (OR) filters: spec key -> Lead field
+CONTAINS_FILTERS = [
+    ('company_name', 'company_name'),
+    ('job_title', 'job_title'),
+    ('industry', 'industry'),
+    ('person_country', 'person_country'),
+    ('company_country', 'company_country'),
+]
+
+RANGE_FILTERS = ['employees', 'revenue']
+
+
+def _split_csv(text):
+    return [part.strip() for part in (text or '').split(',') if part.strip()]
+
+
+def _normalize_values(values):
+    """Case-insensitive filters ke liye: lowercase, dedupe, sort (order se result nahi badalta)."""
+    return tuple(sorted({' '.join(str(value).split()).lower() for value in values if str(value).strip()}))
+
+
+def _as_tuple(value):
+    if isinstance(value, list):
+        return tuple(_as_tuple(item) for item in value)
+    return value
+
+
+class LeadQuery:
+    """
+    LeadFilterForm.cleaned_data ka normalized, hashable filter spec.
+
+    leads_list, export_leads aur API teeno isi se filter karte hain. Spec ek tuple hai
+    (filter_name, normalized value) pairs ka, isliye wohi filters ek hi cache_key dete hain
+    aur compiled Q per spec ek hi baar banta hai.
+    """
+
+    def __init__(self, spec=()):
+        self.spec = tuple(spec)
+
+    @classmethod
+    def from_cleaned_data(cls, cleaned_data):
+        spec = []
+
+        companies = _normalize_values(_split_csv(cleaned_data.get('company_name')))
+        if companies:
+            spec.append(('company_name', companies))
+
+        search = ' '.join((cleaned_data.get('search') or '').split()).lower()
+        if search:
+            spec.append(('search', search))
+
+        for key, _ in CONTAINS_FILTERS[1:]:
+            values = _normalize_values(cleaned_data.get(key) or [])
+            if values:
+                spec.append((key, values))
+
+        # Range filters: yahin ek baar parse, invalid ranges (None, None) ban kar compile mein drop hoti hain
+        employee_ranges = list(cleaned_data.get('employees_dropdown') or [])
+        if cleaned_data.get('employees_text'):
+            employee_ranges.append(cleaned_data['employees_text'].strip())
+        revenue_ranges = _split_csv(cleaned_data.get('revenue'))
+
+        for key, ranges in (('employees', employee_ranges), ('revenue', revenue_ranges)):
+            if ranges:
+                spec.append((key, tuple(sorted({range_bounds(r) for r in ranges}, key=repr))))
+
+        return cls(spec)
+
+    @classmethod
+    def from_json(cls, data):
+        """to_json() ka ulta (DB/JSON se lists aati hain, spec tuples chahiye)."""
+        return cls((key, _as_tuple(value)) for key, value in data)
+
+    def to_json(self):
+        """JSON-safe spec (e.g. LeadSelection.filter_spec mein store karne ke liye)."""
+        return [[key, value] for key, value in self.spec]
+
+    @property
+    def cache_key(self):
+        """Spec ka stable short hash (counts/pages/exports ke cache keys ke liye)."""
+        return hashlib.md5(repr(self.spec).encode()).hexdigest()
+
+    def as_dict(self):
+        return dict(self.spec)
+
+    def without(self, *keys):
+        """Diye gaye filters ke bina wala LeadQuery."""
+        return LeadQuery((key, value) for key, value in self.spec if key not in keys)
+
+    def q(self):
+        return _compile_spec(self.spec)
+
+    def apply(self, queryset=None):
+        if queryset is None:
+            queryset = Lead.objects.all()
+        if not self.spec:
+            return queryset
+        return queryset.filter(self.q())
+
+    def __bool__(self):
+        return bool(self.spec)
+
+    def __eq__(self, other):
+        return isinstance(other, LeadQuery) and self.spec == other.spec
+
+    def __hash__(self):
+        return hash(self.spec)
+
+    def __repr__(self):
+        return f"LeadQuery({self.spec!r})"
+
+
+@lru_cache(maxsize=512)
+def _compile_spec(spec):
+    """Spec ko ek combined Q mein compile karta hai (per process memoized)."""
+    filters = dict(spec)
+    conditions = []
+
+    for key, field_name in CONTAINS_FILTERS:
+        if key in filters:
+            conditions.append(contains_any_q(field_name, filters[key]))
+
+    if 'search' in filters:
+        # Full-text index (Postgres GIN / SQLite FTS5) with prefix matching
+        conditions.append(search_q(filters['search']))
+
+    for key in RANGE_FILTERS:
+        if key in filters:
+            conditions.append(range_bounds_q(key, filters[key]))
+
+    combined = conditions[0] if conditions else Q()
+    for condition in conditions[1:]:
+        combined &= condition
+    return combined
@@ -0,0 +1,142 @@
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from leadgenpro.cache import record
+
+from .pagination import KeysetPage, approximate_count, decode_cursor, paginate_keyset
+from .search import full_text_backend, rank_search
+
+GENERATION_KEY = 'leads:generation'
+DEFAULT_RESULT_CACHE_TIMEOUT = 600
+DEFAULT_RESULT_CACHE_MAX_IDS = 20000
+
+_TOO_LARGE = 'too-large'
+
+
+# --- Generation ---
+# Har Lead create/update/delete (uploads bhi) par generation badalta hai. Result keys mein
+# generation hota hai, isliye purane entries apne aap bekaar ho jaate hain (delete nahi karna padta).
+# Generation ek naya timestamp (ns) hai, counter nahi: incr har backend par atomic nahi hota (file cache),
+# jabki do saath wale bumps mein se koi bhi set ho, value badal hi jaati hai.
+
+def get_generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Time-based seed: key evict ho jaaye toh bhi purani generation dobara use na ho
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def bump_generation():
+    generation = time.time_ns()
+    if generation == cache.get(GENERATION_KEY):
+        generation += 1
+    cache.set(GENERATION_KEY, generation, None)
+
+
+def invalidate_results():
+    """Current transaction commit hone ke baad generation badhata hai (rollback par kuch nahi)."""
+    transaction.on_commit(bump_generation)
+
+
+# --- Filter spec (LeadQuery) ke results ---
+
+def _timeout():
+    return getattr(settings, 'LEADS_RESULT_CACHE_TIMEOUT', DEFAULT_RESULT_CACHE_TIMEOUT)
+
+
+def result_key(lead_query, *parts):
+    suffix = ':'.join(str(part) for part in parts)
+    return f'leads:rs:{get_generation()}:{lead_query.cache_key}:{suffix}'
+
+
+def cached_count(queryset, lead_query):
+    """Filtered total; (generation, spec) par cached."""
+    return approximate_count(queryset, ['count', get_generation(), lead_query.cache_key])
+
+
+def cached_page(lead_query, base_queryset, cursor=None, per_page=25):
+    """
+    paginate_keyset jaisa, lekin page ki ordered IDs (spec, cursor) par cache hoti hain.
+    Cache hit par filters dobara nahi chalte, sirf primary key lookup se rows aati hain.
+    General search ho toh results relevance order mein aate hain (_ranked_page).
+    """
+    term = lead_query.as_dict().get('search')
+    if term and full_text_backend():
+        page = _ranked_page(lead_query, base_queryset, term, cursor, per_page)
+        if page is not None:
+            return page
+
+    key = result_key(lead_query, 'page', per_page, cursor or '')
+    window = cache.get(key)
+    if window is not None:
+        ids, has_next, has_previous = window
+        leads = base_queryset.in_bulk(ids)
+        if len(leads) == len(ids):
+            record('results', True)
+            return KeysetPage([leads[pk] for pk in ids], has_next, has_previous)
+
+    record('results', False)
+
+    page = paginate_keyset(lead_query.apply(base_queryset), cursor, per_page=per_page)
+    cache.set(key, ([lead.pk for lead in page], page.has_next, page.has_previous), _timeout())
+    return page
+
+
+def cached_ids(lead_query, queryset):
+    """
+    Poore filtered result ki ordered IDs (newest first), exports ke liye.
+    LEADS_RESULT_CACHE_MAX_IDS se bada result cache nahi hota; tab None return hota hai aur caller
+    queryset khud stream karta hai. Bade results ke IDs fetch nahi hote: pehle (cached) count dekha jaata hai.
+    """
+    max_ids = getattr(settings, 'LEADS_RESULT_CACHE_MAX_IDS', DEFAULT_RESULT_CACHE_MAX_IDS)
+    key = result_key(lead_query, 'ids')
+    ids = cache.get(key)
+    record('results', ids is not None)
+    if ids is None:
+        filtered = lead_query.apply(queryset)
+        if cached_count(filtered, lead_query) > max_ids:
+            ids = _TOO_LARGE
+        else:
+            # Count cache purana ho sakta hai, isliye cap yahan bhi check hota hai
+            ids = list(filtered.order_by('-created_at', '-id').values_list('pk', flat=True)[:max_ids + 1])
+            if len(ids) > max_ids:
+                ids = _TOO_LARGE
+        cache.set(key, ids, _timeout())
+    return None if ids == _TOO_LARGE else ids
+
+
+def _ranked_page(lead_query, base_queryset, term, cursor, per_page):
+    """
+    Search results ka page relevance order mein (search_rank, phir '-created_at', '-id' tiebreaker).
+    Poori ranked ID list (spec par cached) mein cursor wali lead ke baad/pehle se page katta hai.
+    LEADS_RESULT_CACHE_MAX_IDS se zyada matches par None (caller newest-first keyset par chala jaata hai).
+    """
+    max_ids = getattr(settings, 'LEADS_RESULT_CACHE_MAX_IDS', DEFAULT_RESULT_CACHE_MAX_IDS)
+    key = result_key(lead_query, 'ranked')
+    ids = cache.get(key)
+    record('results', ids is not None)
+    if ids is None:
+        ranked = rank_search(lead_query.without('search').apply(base_queryset.model.objects.all()), term)
+        ids = list(ranked.values_list('pk', flat=True)[:max_ids + 1])
+        if len(ids) > max_ids:
+            ids = _TOO_LARGE
+        cache.set(key, ids, _timeout())
+    if ids == _TOO_LARGE:
+        return None
+
+    start = 0
+    position = decode_cursor(cursor)
+    if position is not None and position[1] in ids:
+        index = ids.index(position[1])
+        start = index + 1 if position[2] == 'next' else max(index - per_page, 0)
+
+    page_ids = ids[start:start + per_page]
+    leads = base_queryset.in_bulk(page_ids)
+    return KeysetPage(
+        [leads[pk] for pk in page_ids if pk in leads], has_next=start + per_page < len(ids), has_previous=start > 0,
+    )
@@ -0,0 +1,309 @@
+import re
+
+from django.db import connection
+from django.db.models import CharField, Q
+from django.db.models.expressions import RawSQL
+from django.db.models.lookups import IContains
+
+# General search box in columns par chalta hai
+SEARCH_FIELDS = [
+    'first_name', 'last_name', 'professional_email', 'personal_email',
+    'company_name', 'job_title', 'industry',
+]
+
+FTS_TABLE = 'leads_lead_fts'  # SQLite FTS5 virtual table
+PG_SEARCH_COLUMN = 'search_vector'  # Postgres tsvector column (trigger se bharta hai)
+
+# Postgres: names/emails sabse zyada weight, phir company, phir job title/industry.
+# Punctuation ko space banate hain taaki 'john@acme.com' bhi 'john', 'acme', 'com' tokens bane (FTS5 jaisa).
+_PG_WEIGHTED_VECTOR = " || ".join(
+    f"setweight(to_tsvector('simple', regexp_replace(coalesce({{row}}.{field}, ''), '[^[:alnum:]]+', ' ', 'g')), '{weight}')"
+    for field, weight in [
+        ('first_name', 'A'), ('last_name', 'A'), ('professional_email', 'A'), ('personal_email', 'A'),
+        ('company_name', 'B'), ('job_title', 'C'), ('industry', 'C'),
+    ]
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def search_tokens(term):
+    return _TOKEN_RE.findall(term or '')
+
+
+def full_text_backend(using_connection=None):
+    """'postgresql' / 'sqlite' agar full-text index install hai, warna None (icontains fallback)."""
+    conn = using_connection or connection
+    if conn.vendor == 'postgresql':
+        return 'postgresql'
+    if conn.vendor == 'sqlite' and FTS_TABLE in conn.introspection.table_names():
+        return 'sqlite'
+    return None
+
+
+def build_match_query(term, backend):
+    """Search text ko prefix-matching FTS query mein badalta hai (saare words AND)."""
+    tokens = search_tokens(term)
+    if not tokens:
+        return None
+    if backend == 'postgresql':
+        return ' & '.join(f"{token}:*" for token in tokens)
+    return ' AND '.join(f'"{token}"*' for token in tokens)
+
+
+def icontains_search_q(term):
+    """Purana behaviour: har search field par LIKE '%term%' (non-FTS databases ke liye)."""
+    query = Q()
+    for field_name in SEARCH_FIELDS:
+        query |= Q(**{f'{field_name}__icontains': term})
+    return query
+
+
+def search_q(term):
+    """
+    General search ke liye Q: FTS index se matching ids ka subquery (Postgres GIN / SQLite FTS5).
+    Index na ho toh icontains chain par fallback.
+
+    Semantics: index ke saath har word ek token-prefix hai aur saare words match hone chahiye
+    ('acme sales' -> 'Acme Corp' + 'Sales Head'); purana icontains substring match tha ('cme' bhi
+    'Acme' ko match karta tha). Word ke beech ka substring ab match nahi hota.
+    """
+    backend = full_text_backend()
+    match_query = build_match_query(term, backend) if backend else None
+
+    if backend is None:
+        return icontains_search_q(term)
+    if match_query is None:
+        return Q(pk__in=[])
+
+    if backend == 'postgresql':
+        sql = f"SELECT id FROM leads_lead WHERE {PG_SEARCH_COLUMN} @@ to_tsquery('simple', %s)"
+    else:
+        sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    return Q(id__in=RawSQL(sql, [match_query]))
+
+
+def rank_search(queryset, term):
+    """Search results ko relevance (search_rank, zyada = behtar) ke hisaab se order karta hai."""
+    backend = full_text_backend()
+    match_query = build_match_query(term, backend) if backend else None
+    queryset = queryset.filter(search_q(term))
+
+    if match_query is None:
+        return queryset
+
+    if backend == 'postgresql':
+        rank = RawSQL(f"ts_rank(leads_lead.{PG_SEARCH_COLUMN}, to_tsquery('simple', %s))", [match_query])
+    else:
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid = leads_lead.id",
+            [match_query],
+        )
+    return queryset.annotate(search_rank=rank).order_by('-search_rank', '-created_at', '-id')
+
+
+# --- Index install (migration aur 'manage.py rebuild_search_index' dono use karte hain) ---
+# Note: SQLite par Lead table ko rebuild karne wali migrations FTS/trigram triggers hata deti hain;
+# aisi migration ke baad 'python manage.py rebuild_search_index' chalayein.
+
+def _fts5_statements(table, fields, options=''):
+    """leads_lead ke liye external-content FTS5 table + sync triggers + rebuild."""
+    columns = ', '.join(fields)
+    new_values = ', '.join(f'new.{field}' for field in fields)
+    old_values = ', '.join(f'old.{field}' for field in fields)
+    return [
+        f"DROP TRIGGER IF EXISTS {table}_ai",
+        f"DROP TRIGGER IF EXISTS {table}_ad",
+        f"DROP TRIGGER IF EXISTS {table}_au",
+        f"DROP TABLE IF EXISTS {table}",
+        f"CREATE VIRTUAL TABLE {table} USING fts5({columns}, content='leads_lead', content_rowid='id'{options})",
+        f"""CREATE TRIGGER {table}_ai AFTER INSERT ON leads_lead BEGIN
+            INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER {table}_ad AFTER DELETE ON leads_lead BEGIN
+            INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER {table}_au AFTER UPDATE ON leads_lead BEGIN
+            INSERT INTO {table}({table}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {table}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"INSERT INTO {table}({table}) VALUES ('rebuild')",
+    ]
+
+
+def _sqlite_statements():
+    return _fts5_statements(FTS_TABLE, SEARCH_FIELDS)
+
+
+def _sqlite_has_fts5(schema_editor):
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        return bool(cursor.fetchone()[0])
+
+
+def _postgresql_statements():
+    columns = ', '.join(SEARCH_FIELDS)
+    return [
+        f"ALTER TABLE leads_lead ADD COLUMN IF NOT EXISTS {PG_SEARCH_COLUMN} tsvector",
+        f"""CREATE OR REPLACE FUNCTION leads_lead_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.{PG_SEARCH_COLUMN} := {_PG_WEIGHTED_VECTOR.format(row='NEW')};
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql""",
+        "DROP TRIGGER IF EXISTS leads_lead_search_vector_trigger ON leads_lead",
+        f"""CREATE TRIGGER leads_lead_search_vector_trigger
+            BEFORE INSERT OR UPDATE OF {columns} ON leads_lead
+            FOR EACH ROW EXECUTE PROCEDURE leads_lead_search_vector_update()""",
+        f"UPDATE leads_lead SET {PG_SEARCH_COLUMN} = {_PG_WEIGHTED_VECTOR.format(row='leads_lead')}",
+        f"CREATE INDEX IF NOT EXISTS leads_lead_search_gin ON leads_lead USING gin({PG_SEARCH_COLUMN})",
+    ]
+
+
+def install_search_index(schema_editor):
+    """Current database backend ke liye full-text index, triggers aur backfill banata hai."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = _postgresql_statements()
+    elif vendor == 'sqlite':
+        if not _sqlite_has_fts5(schema_editor):
+            return False
+        statements = _sqlite_statements()
+    else:
+        return False
+
+    for statement in statements:
+        schema_editor.execute(statement)
+    return True
+
+
+def uninstall_search_index(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = [
+            "DROP TRIGGER IF EXISTS leads_lead_search_vector_trigger ON leads_lead",
+            "DROP FUNCTION IF EXISTS leads_lead_search_vector_update()",
+            "DROP INDEX IF EXISTS leads_lead_search_gin",
+            f"ALTER TABLE leads_lead DROP COLUMN IF EXISTS {PG_SEARCH_COLUMN}",
+        ]
+    elif vendor == 'sqlite':
+        statements = _sqlite_statements()[:4]
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+# --- Trigram (substring) indexes: company/job title/industry/country filters ---
+# Postgres: pg_trgm GIN indexes + ILIKE (UPPER(...) LIKE wala Django icontains index use nahi karta).
+# SQLite: FTS5 'trigram' tokenizer table, jo LIKE '%x%' ko index se serve karta hai.
+
+TRIGRAM_FIELDS = ['company_name', 'job_title', 'industry', 'person_country', 'company_country']
+TRGM_TABLE = 'leads_lead_trgm'
+
+
+class TrigramIContains(IContains):
+    """
+    Case-insensitive substring lookup jo Postgres par plain 'col ILIKE %x%' banata hai
+    (gin_trgm_ops index isi ko use karta hai). Baaki databases par normal icontains.
+    """
+    lookup_name = 'trgm_icontains'
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
+
+
+CharField.register_lookup(TrigramIContains)
+
+
+def trigram_backend(using_connection=None):
+    conn = using_connection or connection
+    if conn.vendor == 'postgresql':
+        return 'postgresql'
+    if conn.vendor == 'sqlite' and TRGM_TABLE in conn.introspection.table_names():
+        return 'sqlite'
+    return None
+
+
+def contains_any_q(field_name, values):
+    """
+    Multi-value substring filter ('Google, Microsoft, Amazon'): OR of case-insensitive contains,
+    aisa banaya gaya ki trigram index use ho sake.
+    """
+    values = [value for value in values if value]
+    if not values:
+        return Q()
+
+    backend = trigram_backend()
+    if backend == 'postgresql':
+        query = Q()
+        for value in values:
+            query |= Q(**{f'{field_name}__trgm_icontains': value})
+        return query
+
+    exact_query = Q()
+    for value in values:
+        exact_query |= Q(**{f'{field_name}__icontains': value})
+
+    if backend == 'sqlite' and field_name in TRIGRAM_FIELDS:
+        # FTS5 trigram se candidate ids (LIKE ESCAPE index use nahi karta, isliye exact check upar se)
+        like_sql = ' OR '.join([f"{field_name} LIKE %s"] * len(values))
+        candidates = RawSQL(f"SELECT rowid FROM {TRGM_TABLE} WHERE {like_sql}", [f'%{value}%' for value in values])
+        return Q(id__in=candidates) & exact_query
+    return exact_query
+
+
+def install_trigram_indexes(schema_editor, concurrently=False):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = ["CREATE EXTENSION IF NOT EXISTS pg_trgm"] + [
+            f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS leads_lead_{field}_trgm "
+            f"ON leads_lead USING gin ({field} gin_trgm_ops)"
+            for field in TRIGRAM_FIELDS
+        ]
+    elif vendor == 'sqlite':
+        if not _sqlite_has_fts5(schema_editor):
+            return False
+        statements = _fts5_statements(TRGM_TABLE, TRIGRAM_FIELDS, options=", tokenize='trigram'")
+    else:
+        return False
+
+    for statement in statements:
+        schema_editor.execute(statement)
+    return True
+
+
+def uninstall_trigram_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        statements = [f"DROP INDEX IF EXISTS leads_lead_{field}_trgm" for field in TRIGRAM_FIELDS]
+    elif vendor == 'sqlite':
+        statements = _fts5_statements(TRGM_TABLE, TRIGRAM_FIELDS)[:4]
+    else:
+        return
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+# Filter dropdown autocomplete (FacetValue.value) ke liye trigram index. SQLite par har field ki
+# FacetValue rows itni kam hain ki (field_name, ...) index ke saath plain LIKE kaafi hai.
+
+def install_facet_trigram_index(schema_editor, concurrently=False):
+    if schema_editor.connection.vendor != 'postgresql':
+        return False
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f"CREATE INDEX {'CONCURRENTLY ' if concurrently else ''}IF NOT EXISTS leads_facetvalue_value_trgm "
+        f"ON leads_facetvalue USING gin (value gin_trgm_ops)"
+    )
+    return True
+
+
+def uninstall_facet_trigram_index(schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute("DROP INDEX IF EXISTS leads_facetvalue_value_trgm")
@@ -0,0 +1,55 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Lead, LeadSelection, LeadSelectionItem
+
+# Server-side selections: bulk export URL mein IDs nahi, sirf selection id jaata hai.
+# Selections kuch der baad purani ho kar delete ho jaati hain (items cascade se).
+
+DEFAULT_MAX_AGE = 24 * 60 * 60
+INSERT_BATCH_SIZE = 900  # SQLite ke variables limit se neeche
+
+
+def purge_old_selections(max_age=None):
+    """LEADS_SELECTION_MAX_AGE (seconds) se purani selections delete karta hai."""
+    if max_age is None:
+        max_age = getattr(settings, 'LEADS_SELECTION_MAX_AGE', DEFAULT_MAX_AGE)
+    cutoff = timezone.now() - timedelta(seconds=max_age)
+    LeadSelection.objects.filter(created_at__lt=cutoff).delete()
+
+
+def create_id_selection(user, ids):
+    """Chune hue lead IDs se selection; sirf existing leads items banti hain."""
+    purge_old_selections()
+    ids = sorted(set(ids))
+    with transaction.atomic():
+        selection = LeadSelection.objects.create(created_by=user)
+        size = 0
+        for start in range(0, len(ids), INSERT_BATCH_SIZE):
+            existing = Lead.objects.filter(pk__in=ids[start:start + INSERT_BATCH_SIZE]).values_list('pk', flat=True)
+            items = [LeadSelectionItem(selection=selection, lead_id=pk) for pk in existing]
+            LeadSelectionItem.objects.bulk_create(items)
+            size += len(items)
+        selection.size = size
+        selection.save(update_fields=['size'])
+    return selection
+
+
+def create_filter_selection(user, lead_query, size):
+    """Filter spec wali selection ('is filter ke saare leads'); leads action ke waqt resolve hote hain."""
+    purge_old_selections()
+    return LeadSelection.objects.create(created_by=user, filter_spec=lead_query.to_json(), size=size)
+
+
+def get_user_selection(user, pk):
+    """User ki apni selection (superuser kisi ki bhi), warna None."""
+    try:
+        selection = LeadSelection.objects.get(pk=pk)
+    except (LeadSelection.DoesNotExist, ValueError, TypeError):
+        return None
+    if not (user.is_superuser or selection.created_by_id == user.pk):
+        return None
+    return selection
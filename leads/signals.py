@@ -0,0 +1,42 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .facets import FACET_FIELDS, apply_facet_deltas, facet_deltas, facet_values
+from .models import Lead
+from .result_cache import invalidate_results
+
+
+def _current_values(lead):
+    return {field_name: getattr(lead, field_name) for field_name in FACET_FIELDS}
+
+
+@receiver(post_save, sender=Lead)
+def update_facets_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    new_values = facet_values(_current_values(instance))
+    if created:
+        deltas = facet_deltas(None, new_values)
+    else:
+        # Jo fields load hi nahi hue (deferred), unka diff skip karein
+        loaded_values = getattr(instance, '_loaded_values', None)
+        if loaded_values is None:
+            return
+        old_values = facet_values(loaded_values)
+        deltas = facet_deltas(old_values, {k: v for k, v in new_values.items() if k in old_values})
+
+    apply_facet_deltas(deltas)
+    instance._loaded_values = {**getattr(instance, '_loaded_values', {}), **_current_values(instance)}
+
+
+@receiver(post_delete, sender=Lead)
+def update_facets_on_delete(sender, instance, **kwargs):
+    apply_facet_deltas(facet_deltas(facet_values(_current_values(instance)), None))
+
+
+@receiver(post_save, sender=Lead)
+@receiver(post_delete, sender=Lead)
+def invalidate_cached_results(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_results()
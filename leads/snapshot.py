@@ -0,0 +1,411 @@
+import sys
+import threading
+import time
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+
+from .models import Lead
+from .query import CONTAINS_FILTERS, RANGE_FILTERS, LeadQuery
+from .result_cache import get_generation
+from .utils import ranges_overlap_mask
+
+# In-process columnar snapshot: har filter column dictionary-encoded (int32 codes + vocabulary),
+# range bounds float64 arrays. Facet counts aur filter matches DB scan ke bina boolean masks se.
+# Har process ki apni copy hoti hai; worker start par background mein poori banti hai. Generation badalne par
+# (background mein) sirf delta merge hota hai: updated_at watermark ke baad badli rows + naye ids, aur
+# deleted ids 'alive' mask se hatte hain. Jab tak fresh snapshot nahi, counts DB se aate hain.
+
+TEXT_FIELDS = [field_name for _, field_name in CONTAINS_FILTERS]
+RANGE_COLUMNS = [f'{key}_{bound}' for key in RANGE_FILTERS for bound in ('min', 'max')]
+SNAPSHOT_FIELDS = ['id', 'updated_at', *TEXT_FIELDS, *RANGE_COLUMNS]
+
+BUILD_CHUNK_SIZE = 20000
+ID_BATCH_SIZE = 500
+
+# Watermark se itna peeche se rows dobara padhi jaati hain: lambe transactions (uploads) ki rows
+# commit se pehle ke updated_at ke saath aati hain
+WATERMARK_OVERLAP_SECONDS = 15 * 60
+# QuerySet.update() updated_at nahi badalta; aise writes itne seconds baad full rebuild mein aate hain
+FULL_REBUILD_SECONDS = 60 * 60
+# Deleted (alive=False) rows ka hissa isse zyada ho toh merge ke waqt arrays compact hote hain
+COMPACT_DEAD_RATIO = 0.1
+CONTAINS_CACHE_SIZE = 256
+
+
+class _Column:
+    """
+    Ek text column ki vocabulary (code 0 = khali/NULL). Build/merge ke dauran hi badhti hai;
+    frame publish hone ke baad read-only (merge copy() par kaam karta hai).
+    """
+
+    def __init__(self, field_name):
+        self.field_name = field_name
+        self.values = ['']
+        self.lowered = ['']
+        self.lookup = {'': 0}
+        self._contains = {}  # needles -> vocabulary mask
+
+    def copy(self):
+        column = _Column(self.field_name)
+        column.values = list(self.values)
+        column.lowered = list(self.lowered)
+        column.lookup = dict(self.lookup)
+        return column
+
+    def encode(self, raw_values):
+        codes = np.empty(len(raw_values), dtype=np.int32)
+        for i, raw in enumerate(raw_values):
+            value = raw.strip() if raw else ''
+            code = self.lookup.get(value)
+            if code is None:
+                code = self.lookup[value] = len(self.values)
+                self.values.append(value)
+                self.lowered.append(value.lower())
+            codes[i] = code
+        return codes
+
+    def contains_any(self, needles):
+        """icontains (OR) ka vocabulary-level mask: kaunse codes kisi needle ko contain karte hain."""
+        key = tuple(needles)
+        mask = self._contains.get(key)
+        if mask is None:
+            mask = np.fromiter(
+                (any(needle in value for needle in key) for value in self.lowered),
+                dtype=bool, count=len(self.lowered),
+            )
+            if len(self._contains) >= CONTAINS_CACHE_SIZE:
+                self._contains.clear()
+            self._contains[key] = mask
+        return mask
+
+    def nbytes(self):
+        strings = sum(sys.getsizeof(value) for value in self.values) + sum(sys.getsizeof(v) for v in self.lowered)
+        return strings + sys.getsizeof(self.values) + sys.getsizeof(self.lowered) + sys.getsizeof(self.lookup)
+
+
+class _Frame:
+    """Ek consistent set of arrays + vocabularies; rebuild naya frame banata hai aur atomically swap karta hai."""
+
+    def __init__(self, ids, alive, codes, bounds, columns=None, generation=None, watermark=None):
+        self.ids = ids  # sorted int64
+        self.alive = alive  # False = DB se delete ho chuki row (compact hone tak)
+        self.codes = codes  # field -> int32 codes
+        self.bounds = bounds  # range column -> float64 (NaN = NULL)
+        self.columns = columns  # field -> _Column (codes ki vocabulary)
+        self.generation = generation  # result_cache generation jis par yeh data bana
+        self.watermark = watermark  # sabse naya updated_at jo frame mein hai
+
+    def take(self, index):
+        """Sirf index (bool mask / positions) wali rows ka naya frame (same vocabularies)."""
+        return _Frame(
+            self.ids[index], self.alive[index],
+            {name: codes[index] for name, codes in self.codes.items()},
+            {name: bounds[index] for name, bounds in self.bounds.items()},
+            self.columns, self.generation, self.watermark,
+        )
+
+    def nbytes(self):
+        arrays = [self.ids, self.alive, *self.codes.values(), *self.bounds.values()]
+        return sum(array.nbytes for array in arrays)
+
+
+def _frame_from_rows(rows, columns):
+    """values_list rows (SNAPSHOT_FIELDS order) se arrays; vocabularies columns mein badhti hain."""
+    fields = list(zip(*rows)) if rows else [()] * len(SNAPSHOT_FIELDS)
+    data = dict(zip(SNAPSHOT_FIELDS, fields))
+    ids = np.array(data['id'], dtype=np.int64)
+    codes = {field_name: columns[field_name].encode(data[field_name]) for field_name in TEXT_FIELDS}
+    bounds = {name: np.array(data[name], dtype=np.float64) for name in RANGE_COLUMNS}  # None -> NaN
+    watermark = max(data['updated_at']) if rows else None
+    return _Frame(ids, np.ones(len(ids), dtype=bool), codes, bounds, watermark=watermark)
+
+
+def _latest(*timestamps):
+    timestamps = [timestamp for timestamp in timestamps if timestamp is not None]
+    return max(timestamps) if timestamps else None
+
+
+def _concat_frames(frames):
+    ids = np.concatenate([frame.ids for frame in frames])
+    order = np.argsort(ids, kind='stable')
+    return _Frame(
+        ids[order],
+        np.concatenate([frame.alive for frame in frames])[order],
+        {name: np.concatenate([frame.codes[name] for frame in frames])[order] for name in TEXT_FIELDS},
+        {name: np.concatenate([frame.bounds[name] for frame in frames])[order] for name in RANGE_COLUMNS},
+        watermark=_latest(*(frame.watermark for frame in frames)),
+    )
+
+
+def _merge_frames(base, delta):
+    """
+    Delta rows ko base frame par apply karta hai (naye arrays; base frame jaisa tha waisa rehta hai):
+    existing ids ki values overwrite, naye ids sorted position par add.
+    """
+    positions = np.searchsorted(base.ids, delta.ids)
+    existing = positions < len(base.ids)
+    existing[existing] = base.ids[positions[existing]] == delta.ids[existing]
+
+    merged = _Frame(
+        base.ids, base.alive.copy(),
+        {name: codes.copy() for name, codes in base.codes.items()},
+        {name: bounds.copy() for name, bounds in base.bounds.items()},
+    )
+    targets = positions[existing]
+    merged.alive[targets] = True
+    for name in TEXT_FIELDS:
+        merged.codes[name][targets] = delta.codes[name][existing]
+    for name in RANGE_COLUMNS:
+        merged.bounds[name][targets] = delta.bounds[name][existing]
+
+    if not existing.all():
+        merged = _concat_frames([merged, delta.take(~existing)])
+    merged.watermark = _latest(base.watermark, delta.watermark)
+    return merged
+
+
+class LeadSnapshot:
+    """
+    Lead table ki filter columns ka in-memory columnar copy.
+
+    facet_counts() / count() LeadQuery ko boolean masks se answer karte hain.
+    General search (full-text) snapshot mein nahi hai, aisi query par None milta hai (DB fallback).
+    Snapshot tabhi fresh hai jab uski generation result_cache ki current generation ho (har Lead
+    write / upload commit generation badhata hai); warna background thread mein refresh() hota hai.
+    """
+
+    def __init__(self, refresh_interval=30):
+        self.refresh_interval = refresh_interval  # do refreshes ke beech kam se kam itne seconds
+        self.frame = None
+        self.build_seconds = None
+        self.built_at = None
+        self.full_built_at = None
+        self.last_refresh = None  # 'full' / 'incremental'
+        self._build_started = None
+        self._builder = None
+        self._lock = threading.Lock()
+
+    # --- Build ---
+
+    def _rows(self, queryset):
+        return queryset.order_by().values_list(*SNAPSHOT_FIELDS)
+
+    def _publish(self, frame, generation, started, mode):
+        frame.generation = generation
+        self.frame = frame
+        self.built_at = time.monotonic()
+        self.build_seconds = self.built_at - started
+        self.last_refresh = mode
+
+    def build(self):
+        """Poori table scan karke naya frame; purana frame tab tak queries serve karta hai."""
+        started = time.monotonic()
+        # Scan se pehle ki generation: scan ke beech commit hue writes agla refresh trigger karte hain
+        generation = get_generation()
+        columns = {field_name: _Column(field_name) for field_name in TEXT_FIELDS}
+        frames, batch = [], []
+        for row in self._rows(Lead.objects.all()).iterator(chunk_size=BUILD_CHUNK_SIZE):
+            batch.append(row)
+            if len(batch) >= BUILD_CHUNK_SIZE:
+                frames.append(_frame_from_rows(batch, columns))
+                batch = []
+        frames.append(_frame_from_rows(batch, columns))
+
+        frame = _concat_frames(frames)
+        frame.columns = columns
+        self.full_built_at = started
+        self._publish(frame, generation, started, 'full')
+
+    def refresh(self):
+        """
+        Frame ko DB ke barabar laata hai. Pehli baar / FULL_REBUILD_SECONDS baad poora build(),
+        warna delta: watermark ke baad ki rows + naye ids merge, deleted ids alive=False.
+        """
+        frame = self.frame
+        if frame is None or time.monotonic() - self.full_built_at >= FULL_REBUILD_SECONDS:
+            return self.build()
+
+        started = time.monotonic()
+        generation = get_generation()
+        # Deletes ke liye sirf id column scan (poori rows nahi)
+        current_ids = np.fromiter(
+            Lead.objects.order_by('id').values_list('id', flat=True).iterator(chunk_size=BUILD_CHUNK_SIZE),
+            dtype=np.int64,
+        )
+        alive = np.isin(frame.ids, current_ids, assume_unique=True)
+        new_ids = np.setdiff1d(current_ids, frame.ids, assume_unique=True)
+
+        rows = {}
+        if frame.watermark is not None:
+            since = frame.watermark - timedelta(seconds=WATERMARK_OVERLAP_SECONDS)
+            for row in self._rows(Lead.objects.filter(updated_at__gte=since)).iterator(chunk_size=BUILD_CHUNK_SIZE):
+                rows[row[0]] = row
+        new_ids = [lead_id for lead_id in new_ids.tolist() if lead_id not in rows]
+        for offset in range(0, len(new_ids), ID_BATCH_SIZE):
+            for row in self._rows(Lead.objects.filter(id__in=new_ids[offset:offset + ID_BATCH_SIZE])):
+                rows[row[0]] = row
+
+        # Published frame ki vocabularies read-only hain; merge copies par
+        columns = {field_name: column.copy() for field_name, column in frame.columns.items()}
+        base = _Frame(frame.ids, alive, frame.codes, frame.bounds, watermark=frame.watermark)
+        merged = _merge_frames(base, _frame_from_rows(list(rows.values()), columns))
+        merged.columns = columns
+        if (~merged.alive).sum() > COMPACT_DEAD_RATIO * len(merged.ids):
+            merged = merged.take(merged.alive)
+        self._publish(merged, generation, started, 'incremental')
+
+    def _build_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            print(f"Lead snapshot build failed: {e}")
+        finally:
+            connection.close()  # thread ka apna DB connection
+
+    def is_fresh(self):
+        frame = self.frame
+        return frame is not None and frame.generation == get_generation()
+
+    def is_building(self):
+        return self._builder is not None and self._builder.is_alive()
+
+    def start_build(self):
+        """Background thread mein refresh(); ek waqt mein ek hi, aur refresh_interval mein ek se zyada nahi."""
+        with self._lock:
+            if self.is_building():
+                return
+            if self._build_started is not None and time.monotonic() - self._build_started < self.refresh_interval:
+                return
+            self._build_started = time.monotonic()
+            self._builder = threading.Thread(target=self._build_in_background, name='lead-snapshot', daemon=True)
+            self._builder.start()
+
+    # --- Queries ---
+
+    @staticmethod
+    def supports(lead_query):
+        return 'search' not in lead_query.as_dict()
+
+    def mask(self, lead_query, frame=None):
+        """LeadQuery ka boolean mask (frame rows par); unsupported query par None."""
+        if not self.supports(lead_query):
+            return None
+        frame = frame or self.frame
+        columns = frame.columns
+        filters = lead_query.as_dict()
+        mask = frame.alive.copy()
+
+        for key, field_name in CONTAINS_FILTERS:
+            if key in filters:
+                mask &= columns[field_name].contains_any(filters[key])[frame.codes[field_name]]
+
+        for key in RANGE_FILTERS:
+            if key not in filters:
+                continue
+            mask &= ranges_overlap_mask(filters[key], frame.bounds[f'{key}_min'], frame.bounds[f'{key}_max'])
+        return mask
+
+    def count(self, lead_query):
+        mask = self.mask(lead_query)
+        return None if mask is None else int(mask.sum())
+
+    def facet_counts(self, field_name, lead_query=None, values=()):
+        """
+        {value: count} diye gaye facet values ke liye, baaki filters ke saath (field ka apna filter
+        ignore, taaki doosre options ke counts bhi dikhein). Count filter jaisa hi hai: value choose
+        karne par field icontains(value) lagta hai, toh count bhi un rows ka jinke field mein value ho.
+        """
+        frame = self.frame
+        spec = lead_query.spec if lead_query else ()
+        others = LeadQuery((key, value) for key, value in spec if key != field_name)
+        mask = self.mask(others, frame)
+        if mask is None:
+            return None
+        column = frame.columns[field_name]
+        per_code = np.bincount(frame.codes[field_name][mask], minlength=len(column.values))
+        counts = {}
+        for value in values:
+            needle = ' '.join(str(value).split()).lower()
+            if needle:
+                counts[value] = int(per_code[column.contains_any((needle,))].sum())
+        return counts
+
+    def memory_usage(self):
+        """Approx bytes: arrays + vocabularies."""
+        frame = self.frame
+        if frame is None:
+            return 0
+        return frame.nbytes() + sum(column.nbytes() for column in frame.columns.values())
+
+    def stats(self):
+        frame = self.frame
+        return {
+            'rows': int(frame.alive.sum()) if frame is not None else 0,
+            'memory_mb': round(self.memory_usage() / (1024 * 1024), 1),
+            'vocabulary': {name: len(column.values) - 1 for name, column in frame.columns.items()} if frame else {},
+            'build_seconds': round(self.build_seconds, 2) if self.build_seconds is not None else None,
+            'last_refresh': self.last_refresh,
+            'age_seconds': round(time.monotonic() - self.built_at) if frame is not None else None,
+            'fresh': self.is_fresh(),
+            'building': self.is_building(),
+        }
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def snapshot_enabled():
+    return getattr(settings, 'LEADS_SNAPSHOT_ENABLED', False)
+
+
+def _get_instance():
+    global _snapshot
+    if not snapshot_enabled():
+        return None
+    with _snapshot_lock:
+        if _snapshot is None:
+            _snapshot = LeadSnapshot(refresh_interval=getattr(settings, 'LEADS_SNAPSHOT_REFRESH_SECONDS', 30))
+    return _snapshot
+
+
+def warm_snapshot():
+    """Worker start par (wsgi.py) background build shuru karta hai; LEADS_SNAPSHOT_ENABLED off ho toh kuch nahi."""
+    snapshot = _get_instance()
+    if snapshot is not None:
+        snapshot.start_build()
+
+
+def get_snapshot():
+    """
+    Process ka LeadSnapshot agar woh current generation ka hai. Warna None (caller DB se count kare)
+    aur background rebuild; request kabhi build ka wait nahi karti.
+    """
+    snapshot = _get_instance()
+    if snapshot is None:
+        return None
+    try:
+        if snapshot.is_fresh():
+            return snapshot
+        snapshot.start_build()
+    except Exception as e:
+        print(f"Lead snapshot refresh failed: {e}")
+    return None
+
+
+def snapshot_stats():
+    """Debug page ke liye stats (stale snapshot ke bhi); disabled / abhi tak nahi bana toh None."""
+    snapshot = _get_instance()
+    if snapshot is None or snapshot.frame is None:
+        return None
+    return snapshot.stats()
+
+
+def reset_snapshot():
+    """Snapshot drop (agli call par dobara build)."""
+    global _snapshot
+    with _snapshot_lock:
+        _snapshot = None
@@ -0,0 +1,151 @@
+import codecs
+import csv
+from collections import namedtuple
+
+from django.conf import settings
+
+try:
+    from charset_normalizer import from_bytes
+except ImportError:  # optional dependency
+    from_bytes = None
+
+DEFAULT_SNIFF_BYTES = 64 * 1024
+SCAN_BLOCK_BYTES = 1024 * 1024
+
+CSV_DELIMITERS = ',;\t|'
+
+_BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+]
+
+_BOM_ENCODINGS = {encoding for _, encoding in _BOMS}
+
+CsvFormat = namedtuple('CsvFormat', ['encoding', 'delimiter', 'estimated_rows'])
+
+
+def _sample_size():
+    return getattr(settings, 'LEADS_UPLOAD_SNIFF_BYTES', DEFAULT_SNIFF_BYTES)
+
+
+def detect_encoding(sample, is_complete=False):
+    """
+    Sample bytes se encoding: BOM > valid UTF-8 > cp1252 > charset-normalizer (installed ho toh) > latin-1.
+    is_complete=False ho toh sample ke end par kata hua multi-byte character ignore hota hai.
+    """
+    for bom, encoding in _BOMS:
+        if sample.startswith(bom):
+            return encoding
+
+    try:
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=is_complete)
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    # Excel (Windows) exports aam taur par cp1252 hote hain. charset-normalizer chhote Western samples ko
+    # big5/cp1250 samajh leta hai ('Peña' -> 'Peńa'), isliye woh sirf tab jab cp1252 decode na kar paaye
+    try:
+        sample.decode('cp1252')
+        return 'cp1252'
+    except UnicodeDecodeError:
+        pass
+
+    if from_bytes is not None:
+        match = from_bytes(sample).best()
+        if match is not None:
+            return match.encoding
+    return 'latin-1'
+
+
+def first_decode_error(file, encoding):
+    """
+    Poori file ko blocks mein decode karke pehle invalid byte ka offset deta hai (sab valid ho toh None).
+    Sirf decode hota hai (CSV parse nahi), file wapas start par seek hoti hai.
+    """
+    decoder = codecs.getincrementaldecoder(encoding)()
+    offset = 0
+    file.seek(0)
+    try:
+        while True:
+            block = file.read(SCAN_BLOCK_BYTES)
+            pending = len(decoder.getstate()[0])
+            try:
+                decoder.decode(block, final=not block)
+            except UnicodeDecodeError as e:
+                return offset - pending + e.start
+            if not block:
+                return None
+            offset += len(block)
+    finally:
+        file.seek(0)
+
+
+def confirm_encoding(file, encoding):
+    """
+    Sample se mili encoding poori file par check karta hai. Sample ke baad invalid bytes hon toh
+    wahan se aage ke bytes se dobara detect (e.g. ASCII header ke baad cp1252 'José'), woh bhi fail
+    ho toh latin-1. BOM wali encoding (utf-16 etc.) galat ho toh ValueError.
+    """
+    if encoding == 'latin-1':
+        return encoding  # har byte valid latin-1 hai
+    error_offset = first_decode_error(file, encoding)
+    if error_offset is None:
+        return encoding
+    if encoding in _BOM_ENCODINGS:
+        raise ValueError(f"The file is not valid {encoding} (invalid data at byte {error_offset}).")
+
+    file.seek(error_offset)
+    window = file.read(_sample_size())
+    file.seek(0)
+    candidate = detect_encoding(window)
+    if candidate == encoding or (candidate != 'latin-1' and first_decode_error(file, candidate) is not None):
+        return 'latin-1'
+    return candidate
+
+
+def detect_delimiter(text):
+    """Header + kuch rows se delimiter (',', ';', tab, '|'); pata na chale toh ','."""
+    lines = text.splitlines()
+    if len(lines) > 1:
+        lines = lines[:-1]  # aakhri line sample mein adhoori ho sakti hai
+    sample_text = '\n'.join(lines[:50])
+    try:
+        delimiter = csv.Sniffer().sniff(sample_text, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return ','
+    # Header mein delimiter hi na ho toh sniff galat hai (single-column file)
+    return delimiter if lines and delimiter in lines[0] else ','
+
+
+def sniff_csv(file):
+    """
+    File ke pehle sample se encoding, delimiter aur rows ka estimate deta hai, taaki CSV ek hi baar
+    sahi settings ke saath (strict decoding) parse ho. Sample poori file na ho toh encoding ek decode-only
+    pass se poori file par confirm hoti hai (confirm_encoding). File wapas start par seek hoti hai.
+    """
+    file.seek(0, 2)
+    file_size = file.tell()
+    file.seek(0)
+    sample = file.read(_sample_size())
+    file.seek(0)
+
+    is_complete = len(sample) >= file_size
+    encoding = detect_encoding(sample, is_complete=is_complete)
+    if not is_complete:
+        encoding = confirm_encoding(file, encoding)
+    text = codecs.getincrementaldecoder(encoding)(errors='replace').decode(sample, final=is_complete)
+    delimiter = detect_delimiter(text)
+
+    # Rows estimate: sample ki line density x file size (progress bar ke liye)
+    lines_in_sample = text.count('\n')
+    if is_complete:
+        estimated_rows = lines_in_sample
+    elif sample:
+        estimated_rows = int(lines_in_sample * file_size / len(sample))
+    else:
+        estimated_rows = 0
+    return CsvFormat(encoding, delimiter, max(estimated_rows - 1, 0))
@@ -0,0 +1,50 @@
+from django.test import SimpleTestCase, override_settings
+
+from ..columns import (
+    MATCH_DUPLICATE, MATCH_EXACT, MATCH_FUZZY, MATCH_NORMALIZED, MATCH_UNMAPPED, decisions_to_map,
+    mapping_summary, normalize_header, resolve_columns, resolve_header,
+)
+
+
+class ColumnResolverTests(SimpleTestCase):
+    def assertResolves(self, header, field_name, match):
+        self.assertEqual(resolve_header(header)[:2], (field_name, match), header)
+
+    def test_exact_headers(self):
+        self.assertResolves('Email', 'professional_email', MATCH_EXACT)
+        self.assertResolves('  Company Name ', 'company_name', MATCH_EXACT)
+        self.assertResolves('Zip code', 'zip_code', MATCH_EXACT)
+
+    def test_normalized_and_alias_headers(self):
+        self.assertEqual(normalize_header('  E-Mail_Address '), 'email')
+        for header, field_name in [
+            ('E-Mail Address', 'professional_email'),
+            ('FIRST NAME', 'first_name'),
+            ('first_name', 'first_name'),
+            ('Organisation Name', 'company_name'),
+            ('Company', 'company_name'),
+            ('Telephone', 'person_direct_phone'),
+            ('Headcount', 'employees'),
+            ('Zipcode', 'zip_code'),
+            ('LinkedIn URL', 'person_linkedin_url'),
+        ]:
+            self.assertResolves(header, field_name, MATCH_NORMALIZED)
+
+    def test_near_miss_headers_stay_unmapped_by_default(self):
+        for header in ['Person Email', 'Emails', 'Last Name 2', 'Company Name 2', 'Company Country Code', 'Compnay Name']:
+            self.assertResolves(header, None, MATCH_UNMAPPED)
+
+    @override_settings(LEADS_COLUMN_FUZZY_CUTOFF=0.85)
+    def test_fuzzy_matching_is_opt_in(self):
+        self.assertResolves('Compnay Name', 'company_name', MATCH_FUZZY)
+        self.assertResolves('Job Titel', 'job_title', MATCH_FUZZY)
+        # Exact/normalized tiers fuzzy se pehle
+        self.assertResolves('Email', 'professional_email', MATCH_EXACT)
+        summary = mapping_summary(resolve_columns(['Compnay Name']))
+        self.assertIn("fuzzy match of 'Company Name'", summary)
+
+    def test_first_column_wins_duplicates(self):
+        decisions = resolve_columns(['Email', 'Work Email', 'Notes', 'Unknown'])
+        self.assertEqual([decision.match for decision in decisions],
+                         [MATCH_EXACT, MATCH_DUPLICATE, MATCH_EXACT, MATCH_UNMAPPED])
+        self.assertEqual(decisions_to_map(decisions), {'Email': 'professional_email', 'Notes': 'comments'})
@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from ..export_jobs import request_export_job
+from ..models import ExportJob
+from ..query import LeadQuery
+from ..result_cache import get_generation
+
+CONTENT = b'professional_email\n' + b''.join(f'{index}@example.com\n'.encode() for index in range(100))
+
+
+class ExportDownloadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root, LEADS_SENDFILE_HEADER='')
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user('downloader')
+        self.client.force_login(self.user)
+        self.job = ExportJob.objects.create(
+            format=ExportJob.FORMAT_CSV_GZ, status=ExportJob.STATUS_COMPLETED, created_by=self.user
+        )
+        self.job.file.save('leads.csv.gz', ContentFile(CONTENT))
+        self.url = reverse('leads:download_export', args=[self.job.pk])
+
+    def download(self, **headers):
+        response = self.client.get(self.url, headers=headers)
+        return response, b''.join(response.streaming_content)
+
+    def test_full_download_advertises_ranges(self):
+        response, body = self.download()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn('attachment', response['Content-Disposition'])
+
+    def test_range_request_returns_partial_content(self):
+        response, body = self.download(range='bytes=10-19')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[10:20])
+        self.assertEqual(response['Content-Range'], f'bytes 10-19/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '10')
+
+        response, body = self.download(range='bytes=-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[-5:])
+
+        response, body = self.download(range=f'bytes={len(CONTENT) - 3}-')
+        self.assertEqual(body, CONTENT[-3:])
+
+    def test_if_range_must_match_etag(self):
+        etag = self.download()[0]['ETag']
+
+        response, body = self.download(range='bytes=0-9', if_range=etag)
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(body, CONTENT[:10])
+
+        # File badal gayi (purana ETag): poori file 200 ke saath
+        response, body = self.download(range='bytes=0-9', if_range='"stale"')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+
+    def test_unsatisfiable_range_is_416(self):
+        response = self.client.get(self.url, headers={'range': f'bytes={len(CONTENT)}-'})
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_invalid_range_falls_back_to_full_file(self):
+        response, body = self.download(range='bytes=0-1,5-6')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(body, CONTENT)
+
+    def test_jobs_are_private_to_their_owner(self):
+        progress_url = reverse('leads:export_job_progress', args=[self.job.pk])
+        other = User.objects.create_user('other')
+        self.client.force_login(other)
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(progress_url).status_code, 404)
+
+        # Reuse bhi sirf owner ke liye; doosre user ko same export ka apna naya job milta hai
+        self.job.spec_key, self.job.data_version = LeadQuery().cache_key, get_generation()
+        self.job.save()
+        self.assertEqual(request_export_job(self.user, LeadQuery(), self.job.format), (self.job, True))
+        job, reused = request_export_job(other, LeadQuery(), self.job.format)
+        self.assertFalse(reused)
+        self.assertEqual(job.created_by, other)
+
+        self.client.force_login(User.objects.create_superuser('admin'))
+        self.assertEqual(self.client.get(progress_url).status_code, 200)
+        self.assertEqual(self.client.get(self.url).status_code, 200)
@@ -0,0 +1,108 @@
+import gzip
+import io
+import os
+import shutil
+import tempfile
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from ..error_reports import (
+    error_report_exists, error_report_path, iter_error_report, purge_old_error_reports, save_error_report,
+)
+from ..models import UploadJob
+
+ERRORS = [
+    {'row_number': 2, 'error_message': 'Invalid email format: x', 'email': 'x',
+     'row_data': {'Email': 'x', 'First Name': 'Jöhn'}},
+    {'row_number': 5, 'error_message': ValueError('duplicate key'), 'email': 'N/A',
+     'row_data': {'Email': '', 'City': '東京'}},
+]
+
+
+class ErrorReportTestMixin:
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+
+class ErrorReportStoreTests(ErrorReportTestMixin, TestCase):
+    def test_round_trip(self):
+        report_id = save_error_report(iter(ERRORS))
+        path = error_report_path(report_id)
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            self.assertEqual(len(f.read().splitlines()), 2)
+
+        errors = list(iter_error_report(report_id))
+        self.assertEqual(errors[0], ERRORS[0])
+        # Non-JSON values (DB exceptions) string ban kar store hote hain
+        self.assertEqual(errors[1]['error_message'], 'duplicate key')
+        self.assertEqual(errors[1]['row_data'], {'Email': '', 'City': '東京'})
+
+    def test_invalid_report_ids(self):
+        for report_id in [None, '', '../../settings', 'a' * 31, 'A' * 32]:
+            self.assertIsNone(error_report_path(report_id))
+            self.assertFalse(error_report_exists(report_id))
+            self.assertEqual(list(iter_error_report(report_id)), [])
+
+    def test_purge_old_reports(self):
+        old_id = save_error_report(ERRORS)
+        os.utime(error_report_path(old_id), (0, 0))
+        new_id = save_error_report(ERRORS)
+
+        purge_old_error_reports(max_age=60)
+        self.assertFalse(error_report_exists(old_id))
+        self.assertTrue(error_report_exists(new_id))
+
+
+class DownloadUploadErrorsTests(ErrorReportTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.user = User.objects.create_user('errors')
+        self.client.force_login(self.user)
+
+    def read_workbook(self, response):
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        return {sheet.title: [list(row) for row in sheet.iter_rows(values_only=True)] for sheet in workbook}
+
+    def test_session_report_download(self):
+        report_id = save_error_report(ERRORS)
+        session = self.client.session
+        session['upload_error_report'] = report_id
+        session.save()
+
+        sheets = self.read_workbook(self.client.get(reverse('leads:download_upload_errors')))
+        self.assertEqual(sheets['Upload Errors'], [
+            ['Row Number', 'Error Message', 'Email', 'City', 'Email', 'First Name'],
+            [2, 'Invalid email format: x', 'x', None, 'x', 'Jöhn'],
+            [5, 'duplicate key', 'N/A', '東京', None, None],
+        ])
+        self.assertEqual(sheets['Summary'][1], ['Total Errors', 2])
+        # Session report ek baar download hone ke baad delete
+        self.assertNotIn('upload_error_report', self.client.session)
+        self.assertFalse(error_report_exists(report_id))
+
+    def test_job_report_only_for_owner(self):
+        other = User.objects.create_user('other')
+        job = UploadJob.objects.create(
+            file=SimpleUploadedFile('leads.csv', b''), original_name='leads.csv', created_by=other,
+            status=UploadJob.STATUS_COMPLETED, error_report=save_error_report(ERRORS),
+        )
+        url = f"{reverse('leads:download_upload_errors')}?job={job.pk}"
+        self.assertRedirects(self.client.get(url), reverse('leads:upload_leads'), fetch_redirect_response=False)
+
+        self.client.force_login(other)
+        sheets = self.read_workbook(self.client.get(url))
+        self.assertEqual(len(sheets['Upload Errors']), 3)
+        self.assertTrue(error_report_exists(job.error_report))
+
+    def test_missing_report_redirects(self):
+        response = self.client.get(reverse('leads:download_upload_errors'))
+        self.assertRedirects(response, reverse('leads:upload_leads'), fetch_redirect_response=False)
@@ -0,0 +1,109 @@
+import io
+from datetime import datetime, timezone
+from unittest import mock, skipUnless
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from ..export_jobs import available_export_formats
+from ..exports import iter_value_rows, parquet_available, pyarrow, write_parquet, write_xlsx
+from ..models import ExportJob, Lead
+
+
+class ExportLeadsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('exporter', password='secret')
+        Lead.objects.create(professional_email='a@example.com', first_name='Asha', created_by=self.user)
+
+    def test_anonymous_export_redirects_to_login(self):
+        response = self.client.get(reverse('leads:export_leads'))
+        self.assertEqual(response.status_code, 302)
+        self.assertTrue(response['Location'].startswith(reverse('accounts:login')))
+
+    def test_csv_export_with_column_projection(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('leads:export_leads'), {'columns': 'professional_email,first_name'})
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content).decode()
+        self.assertEqual(content.splitlines(), ['professional_email,first_name', 'a@example.com,Asha'])
+
+    def test_unknown_export_column_is_rejected(self):
+        self.client.force_login(self.user)
+        response = self.client.get(reverse('leads:export_leads'), {'columns': 'password'})
+        self.assertEqual(response.status_code, 400)
+
+
+class WriteXlsxTests(SimpleTestCase):
+    def test_workbook_has_headers_and_rows(self):
+        output = io.BytesIO()
+        created = datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+        write_xlsx(output, [
+            ('Leads', ['professional_email', 'first_name', 'created_at'], iter([
+                ('a@example.com', 'Asha\x07', created),
+                ('b@example.com', None, None),
+            ])),
+            ('Summary', ['total'], [(2,)]),
+        ])
+
+        output.seek(0)
+        workbook = load_workbook(output)
+        self.assertEqual(workbook.sheetnames, ['Leads', 'Summary'])
+        self.assertEqual(list(workbook['Leads'].iter_rows(values_only=True)), [
+            ('professional_email', 'first_name', 'created_at'),
+            ('a@example.com', 'Asha', datetime(2024, 5, 1, 10, 30)),  # control char aur tz hat jaate hain
+            ('b@example.com', None, None),
+        ])
+        self.assertEqual(list(workbook['Summary'].iter_rows(values_only=True)), [('total',), (2,)])
+
+
+@skipUnless(parquet_available(), 'pyarrow not installed')
+class WriteParquetTests(TestCase):
+    def test_round_trip_keeps_types_and_nulls(self):
+        user = User.objects.create_user('parquet')
+        Lead.objects.create(
+            professional_email='a@example.com', first_name='Asha', employees='11-50', created_by=user
+        )
+        Lead.objects.create(professional_email='b@example.com', first_name='Ravi', created_by=user)
+        field_names = ['id', 'professional_email', 'employees_min', 'created_at', 'created_by', 'created_by__username']
+
+        output = io.BytesIO()
+        rows = iter_value_rows(Lead.objects.order_by('professional_email'), field_names)
+        write_parquet(output, field_names, rows, batch_size=1)  # har row alag row group
+
+        output.seek(0)
+        parquet_file = pyarrow.parquet.ParquetFile(output)
+        self.assertEqual(parquet_file.metadata.num_row_groups, 2)
+        table = parquet_file.read()
+        self.assertEqual(
+            [(field.name, field.type) for field in table.schema],
+            [
+                ('id', pyarrow.int64()),
+                ('professional_email', pyarrow.string()),
+                ('employees_min', pyarrow.int64()),
+                ('created_at', pyarrow.timestamp('us', tz='UTC')),
+                ('created_by', pyarrow.int64()),
+                ('created_by__username', pyarrow.string()),
+            ],
+        )
+        expected = list(Lead.objects.order_by('professional_email').values_list(*field_names))
+        self.assertEqual([tuple(row.values()) for row in table.to_pylist()], expected)
+        self.assertEqual(table.column('employees_min').to_pylist(), [11, None])
+
+
+class ExportJobFormatTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('jobs')
+        self.client.force_login(self.user)
+
+    @mock.patch('leads.export_jobs.parquet_available', return_value=False)
+    def test_parquet_hidden_without_pyarrow(self, _):
+        self.assertNotIn(ExportJob.FORMAT_PARQUET, dict(available_export_formats()))
+        response = self.client.post(reverse('leads:create_export_job'), {'format': ExportJob.FORMAT_PARQUET})
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(ExportJob.objects.exists())
+
+    @mock.patch('leads.export_jobs.parquet_available', return_value=True)
+    def test_parquet_offered_with_pyarrow(self, _):
+        self.assertIn(ExportJob.FORMAT_PARQUET, dict(available_export_formats()))
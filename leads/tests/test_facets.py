@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..facets import rebuild_facets
+from ..models import FacetValue, Lead
+
+
+class FacetIndexTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('facets')
+
+    def facet_counts(self):
+        return dict(((facet.field_name, facet.value), facet.count) for facet in FacetValue.objects.all())
+
+    def assertMatchesRebuild(self):
+        incremental = self.facet_counts()
+        rebuild_facets()
+        self.assertEqual(incremental, self.facet_counts())
+
+    def test_counts_follow_create_update_delete(self):
+        first = Lead.objects.create(
+            professional_email='a@example.com', industry='software', job_title='CEO', created_by=self.user
+        )
+        Lead.objects.create(
+            professional_email='b@example.com', industry=' Software ', person_country='india', created_by=self.user
+        )
+        self.assertEqual(FacetValue.objects.get(field_name='industry', value='Software').count, 2)
+        self.assertMatchesRebuild()
+
+        first.industry = 'Banking'
+        first.save()
+        self.assertEqual(FacetValue.objects.get(field_name='industry', value='Software').count, 1)
+        self.assertEqual(FacetValue.objects.get(field_name='industry', value='Banking').count, 1)
+        self.assertMatchesRebuild()
+
+        first.delete()
+        self.assertFalse(FacetValue.objects.filter(field_name='industry', value='Banking').exists())
+        self.assertFalse(FacetValue.objects.filter(field_name='job_title').exists())
+        self.assertMatchesRebuild()
+
+    def test_deferred_fields_are_not_counted_twice(self):
+        Lead.objects.create(professional_email='a@example.com', industry='Software', created_by=self.user)
+        lead = Lead.objects.only('pk', 'first_name').get()
+        lead.first_name = 'Asha'
+        lead.save()
+        self.assertEqual(FacetValue.objects.get(field_name='industry', value='Software').count, 1)
+        self.assertMatchesRebuild()
@@ -0,0 +1,191 @@
+from unittest import mock
+
+import pandas as pd
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import DatabaseError
+from django.db.models import QuerySet
+from django.test import TestCase, override_settings
+
+from ..importer import LeadImporter, UploadReader
+from ..models import FacetValue, Lead
+
+
+class LeadImporterFacetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('importer')
+        Lead.objects.create(
+            professional_email='old@example.com', lead_id='L-1', industry='Software', created_by=self.user
+        )
+
+    def test_row_by_row_fallback_does_not_double_count_facets(self):
+        df = pd.DataFrame({
+            'professional_email': ['a@example.com', 'b@example.com', 'c@example.com'],
+            'first_name': ['Asha', 'Bilal', 'Chen'],
+            'lead_id': ['L-2', 'L-1', 'L-3'],  # L-1 pehle se hai: bulk_create fail, fallback row-by-row
+            'industry': ['Software', 'Software', 'Software'],
+        })
+        importer = LeadImporter({name: name for name in df.columns}, self.user, 'test').run_dataframe(df)
+
+        self.assertEqual(importer.success_count, 2)
+        self.assertEqual(importer.error_count, 1)
+        facet = FacetValue.objects.get(field_name='industry', value='Software')
+        self.assertEqual(facet.count, Lead.objects.filter(industry='Software').count())
+
+
+class UploadReaderTests(TestCase):
+    def test_small_utf16_csv_upload(self):
+        data = 'Email,First Name\na@example.com,Jöhn\n'.encode('utf-16')
+        reader = UploadReader(SimpleUploadedFile('leads.csv', data), 'leads.csv')
+
+        self.assertEqual(reader.encoding, 'utf-16')
+        self.assertEqual(reader.columns, ['Email', 'First Name'])
+        chunk, first_row_number = next(iter(reader))
+        self.assertEqual(first_row_number, 2)
+        self.assertEqual(chunk.values.tolist(), [['a@example.com', 'Jöhn']])
+
+    @override_settings(LEADS_UPLOAD_SNIFF_BYTES=1024)
+    def test_non_ascii_after_sample_window(self):
+        rows = [f'lead{index}@example.com,Asha' for index in range(100)]
+        text = 'Email,First Name\n' + '\n'.join(rows) + '\nlate@example.com,José Peña\n'
+        data = text.encode('cp1252')
+        self.assertGreater(data.index('é'.encode('cp1252')), 1024)
+
+        reader = UploadReader(SimpleUploadedFile('leads.csv', data), 'leads.csv', chunk_size=40)
+        self.assertEqual(reader.encoding, 'cp1252')
+        values = pd.concat([chunk for chunk, _ in reader])['First Name'].tolist()
+        self.assertEqual(values[-1], 'José Peña')
+        self.assertFalse(any('\ufffd' in value for value in values))
+
+    @override_settings(LEADS_UPLOAD_SNIFF_BYTES=64)
+    def test_utf8_multibyte_across_sample_and_blocks(self):
+        text = 'Email,First Name\n' + ''.join(f'{index}@example.com,Jöhn 東京\n' for index in range(50))
+        reader = UploadReader(SimpleUploadedFile('leads.csv', text.encode('utf-8')), 'leads.csv')
+        self.assertEqual(reader.encoding, 'utf-8')
+        chunk, _ = next(iter(reader))
+        self.assertEqual(set(chunk['First Name']), {'Jöhn 東京'})
+
+    @override_settings(LEADS_UPLOAD_SNIFF_BYTES=64)
+    def test_invalid_utf16_fails_clearly(self):
+        data = 'Email,First Name\n'.encode('utf-16') + 'a@example.com,Asha\n'.encode('utf-16-le') * 10 + b'\x00\xd8'
+        with self.assertRaisesRegex(ValueError, 'not valid utf-16'):
+            UploadReader(SimpleUploadedFile('leads.csv', data + b'a\x00'), 'leads.csv')
+
+
+class LeadImporterTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('importer')
+        self.other = User.objects.create_user('other')
+        Lead.objects.create(
+            professional_email='old@example.com', first_name='Old', job_title='Intern',
+            source='Original', created_by=self.other,
+        )
+
+    def run_import(self, rows, **kwargs):
+        df = pd.DataFrame(rows, dtype=str)
+        importer = LeadImporter({name: name for name in df.columns}, self.user, 'Upload', **kwargs)
+        return importer.run_dataframe(df)
+
+    def test_error_priority(self):
+        importer = self.run_import({
+            'professional_email': ['no-at-sign', '', '', 'a@example.com', 'b@example.com', 'c@example.com'],
+            'first_name': ['', '', 'Asha', 'Asha', 'Bilal', 'Chen'],
+        })
+        self.assertEqual([error['error_message'] for error in importer.errors_list], [
+            'Invalid email format: no-at-sign',
+            'Could not extract valid name from data',
+            'Required field(s) missing: Professional Email',
+        ])
+        self.assertEqual([error['row_number'] for error in importer.errors_list], [2, 3, 4])
+        self.assertEqual(importer.success_count, 3)
+
+    def test_full_name_split(self):
+        importer = self.run_import({
+            'professional_email': ['a@example.com', 'b@example.com'],
+            'full_name': ['Asha  Rao Singh', 'Bilal'],
+        })
+        self.assertEqual(importer.success_count, 2)
+        names = dict(Lead.objects.values_list('professional_email', 'last_name'))
+        self.assertEqual(Lead.objects.get(professional_email='a@example.com').first_name, 'Asha')
+        self.assertEqual(names['a@example.com'], 'Rao Singh')
+        self.assertEqual(names['b@example.com'], '')
+
+    def test_existing_email_without_overwrite(self):
+        importer = self.run_import({
+            'professional_email': ['old@example.com', 'new@example.com', 'new@example.com', 'other@example.com'],
+            'first_name': ['Changed', 'Asha', 'Asha', 'Bilal'],
+        })
+        self.assertEqual(importer.success_count, 2)
+        self.assertEqual(importer.error_count, 2)
+        self.assertEqual(Lead.objects.get(professional_email='old@example.com').first_name, 'Old')
+
+    def test_overwrite_updates_changed_fields_only(self):
+        importer = self.run_import({
+            'professional_email': ['old@example.com'],
+            'first_name': ['Old'],
+            'job_title': ['CEO'],
+        }, overwrite=True)
+        self.assertEqual(importer.update_count, 1)
+        lead = Lead.objects.get(professional_email='old@example.com')
+        self.assertEqual(lead.job_title, 'CEO')
+        # Overwrite source/created_by nahi badalta
+        self.assertEqual(lead.source, 'Original')
+        self.assertEqual(lead.created_by, self.other)
+
+    def test_failed_update_uncounts_merged_rows(self):
+        original_bulk_update = QuerySet.bulk_update
+
+        def failing_bulk_update(queryset, objs, *args, **kwargs):
+            if any(lead.professional_email == 'old@example.com' for lead in objs):
+                raise DatabaseError('update failed')
+            return original_bulk_update(queryset, objs, *args, **kwargs)
+
+        with mock.patch.object(QuerySet, 'bulk_update', autospec=True, side_effect=failing_bulk_update):
+            importer = self.run_import({
+                'professional_email': ['old@example.com', 'old@example.com', 'a@example.com',
+                                       'b@example.com', 'c@example.com'],
+                'first_name': ['Old', 'Changed', 'Asha', 'Bilal', 'Chen'],
+                'job_title': ['CEO', 'CTO', '', '', ''],
+            }, overwrite=True)
+
+        self.assertEqual(importer.update_count, 0)
+        self.assertEqual(importer.success_count, 3)
+        self.assertEqual([error['row_number'] for error in importer.errors_list], [2, 3])
+        self.assertEqual(Lead.objects.get(professional_email='old@example.com').job_title, 'Intern')
+
+    def test_too_many_errors_rolls_back(self):
+        with self.assertRaises(ValueError):
+            self.run_import({
+                'professional_email': ['ok@example.com', 'bad', 'worse'],
+                'first_name': ['Asha', 'Bilal', 'Chen'],
+            })
+        self.assertFalse(Lead.objects.filter(professional_email='ok@example.com').exists())
+
+
+class ParallelValidationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('parallel')
+
+    def import_rows(self, workers):
+        rows = []
+        for index in range(40):
+            email = f'lead{index % 30}@example.com' if index % 7 else f'bad-email-{index}'
+            rows.append({
+                'Email': email, 'Name': '' if index % 11 == 5 else f'Person {index}',
+                'Company': f'Company {index % 4}', 'Employees': '11-50',
+            })
+        df = pd.DataFrame(rows, dtype=str)
+        column_map = {'Email': 'professional_email', 'Name': 'full_name', 'Company': 'company_name',
+                      'Employees': 'employees'}
+        importer = LeadImporter(column_map, self.user, 'Upload', chunk_size=6, workers=workers).run_dataframe(df)
+        leads = list(Lead.objects.order_by('professional_email').values(
+            'professional_email', 'first_name', 'last_name', 'full_name', 'company_name', 'employees_min',
+        ))
+        Lead.objects.all().delete()
+        return leads, importer.errors_list, (importer.success_count, importer.update_count, importer.error_count)
+
+    def test_process_pool_matches_single_process(self):
+        single = self.import_rows(workers=0)
+        parallel = self.import_rows(workers=2)
+        self.assertTrue(single[0] and single[1])
+        self.assertEqual(parallel, single)
@@ -0,0 +1,112 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+from unittest import mock, skipIf
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from ..exports import parquet_available
+from ..forms import LeadsUploadForm
+from ..importer import ALLOWED_EXTENSIONS
+from ..jobs import claim_next_job, fail_stale_jobs, run_upload_job
+from ..models import Lead, UploadJob
+
+
+class UploadJobTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create_user('uploader')
+
+    def create_job(self, content=b'Email,First Name\na@example.com,Asha\n'):
+        return UploadJob.objects.create(
+            file=SimpleUploadedFile('leads.csv', content), original_name='leads.csv', created_by=self.user
+        )
+
+    def test_completed_job_deletes_upload_file(self):
+        job = self.create_job()
+        path = job.file.path
+        job = run_upload_job(claim_next_job())
+
+        self.assertEqual(job.status, UploadJob.STATUS_COMPLETED)
+        self.assertEqual(job.created_count, 1)
+        self.assertFalse(os.path.exists(path))
+
+    def test_unexpected_error_marks_job_failed(self):
+        job = self.create_job()
+        with mock.patch('leads.jobs.resolve_columns', side_effect=RuntimeError('boom')):
+            run_upload_job(claim_next_job())
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, UploadJob.STATUS_FAILED)
+        self.assertIn('boom', job.message)
+        self.assertFalse(os.path.exists(job.file.path))
+
+    def test_stale_running_job_is_failed(self):
+        job = self.create_job()
+        started_at = timezone.now() - timedelta(hours=2)
+        UploadJob.objects.filter(pk=job.pk).update(status=UploadJob.STATUS_RUNNING, started_at=started_at)
+        fresh = self.create_job()
+        UploadJob.objects.filter(pk=fresh.pk).update(status=UploadJob.STATUS_RUNNING, started_at=timezone.now())
+
+        fail_stale_jobs(timeout=30 * 60)
+
+        job.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(job.status, UploadJob.STATUS_FAILED)
+        self.assertFalse(os.path.exists(job.file.path))
+        self.assertEqual(fresh.status, UploadJob.STATUS_RUNNING)
+
+
+class UploadFormatTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin-upload', password='secret')
+        self.client.force_login(self.user)
+
+    def test_parquet_offered_only_with_pyarrow(self):
+        self.assertEqual('.parquet' in ALLOWED_EXTENSIONS, parquet_available())
+        response = self.client.get(reverse('leads:upload_leads'))
+        self.assertContains(response, f'Supported formats: {LeadsUploadForm().supported_formats}')
+        self.assertEqual('PARQUET' in LeadsUploadForm().supported_formats, parquet_available())
+
+    @skipIf(parquet_available(), 'pyarrow installed')
+    def test_parquet_upload_rejected_without_pyarrow(self):
+        upload = SimpleUploadedFile('leads.parquet', b'PAR1')
+        response = self.client.post(reverse('leads:upload_leads'), {'file': upload})
+        self.assertContains(response, 'Invalid file format')
+        self.assertFalse(UploadJob.objects.exists())
+
+
+class BackgroundUploadTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.client.force_login(User.objects.create_superuser('admin-jobs', password='secret'))
+
+    def upload(self):
+        upload = SimpleUploadedFile('leads.csv', b'Email,First Name\na@example.com,Asha\n')
+        return self.client.post(reverse('leads:upload_leads'), {'file': upload})
+
+    def test_background_mode_is_off_by_default(self):
+        self.upload()
+        self.assertFalse(UploadJob.objects.exists())
+        self.assertTrue(Lead.objects.filter(professional_email='a@example.com').exists())
+
+    @override_settings(LEADS_UPLOAD_BACKGROUND_MIN_SIZE=0)
+    def test_upload_is_queued_when_enabled(self):
+        response = self.upload()
+        job = UploadJob.objects.get()
+        self.assertEqual(job.status, UploadJob.STATUS_PENDING)
+        self.assertContains(response, reverse('leads:upload_job_progress', args=[job.pk]))
+        self.assertFalse(Lead.objects.exists())
@@ -0,0 +1,38 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.utils import timezone
+
+from ..models import Lead
+from ..pagination import decode_cursor, encode_cursor, paginate_keyset
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user('pages')
+        for index in range(5):
+            Lead.objects.create(professional_email=f'{index}@example.com', created_by=user)
+        # Same created_at: id tie-breaker se order stable rehna chahiye
+        Lead.objects.update(created_at=timezone.now())
+        self.expected = list(Lead.objects.order_by('-created_at', '-id').values_list('pk', flat=True))
+
+    def test_cursor_round_trip(self):
+        lead = Lead.objects.first()
+        created_at, pk, direction = decode_cursor(encode_cursor(lead, 'next'))
+        self.assertEqual((created_at, pk, direction), (lead.created_at, lead.pk, 'next'))
+        for cursor in ['', 'garbage', encode_cursor(lead, 'next')[:-3]]:
+            self.assertIsNone(decode_cursor(cursor))
+
+    def test_next_and_previous_pages(self):
+        pages, cursor = [], None
+        while True:
+            page = paginate_keyset(Lead.objects.all(), cursor, per_page=2)
+            pages.append([lead.pk for lead in page])
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(sum(pages, []), self.expected)
+        self.assertEqual([len(ids) for ids in pages], [2, 2, 1])
+
+        previous = paginate_keyset(Lead.objects.all(), page.previous_cursor, per_page=2)
+        self.assertEqual([lead.pk for lead in previous], pages[1])
+        self.assertTrue(previous.has_previous)
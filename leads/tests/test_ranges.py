@@ -0,0 +1,61 @@
+import numpy as np
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import Lead
+from ..utils import RANGE_UNBOUNDED, range_bounds, range_bounds_many, range_overlap_q, ranges_overlap_mask
+
+
+class RangeBoundsTests(TestCase):
+    def test_range_bounds(self):
+        self.assertEqual(range_bounds('51-200'), (51, 200))
+        self.assertEqual(range_bounds('$1M-5M'), (1_000_000, 5_000_000))
+        self.assertEqual(range_bounds('200-51'), (51, 200))
+        self.assertEqual(range_bounds('100'), (100, 100))
+        self.assertEqual(range_bounds('10001+'), (10001, RANGE_UNBOUNDED))
+        for value in ['', None, 'n/a', 'inf']:
+            self.assertEqual(range_bounds(value), (None, None))
+
+    def test_range_overlap_q(self):
+        user = User.objects.create_user('ranges')
+        for email, employees in [('a@example.com', '11-50'), ('b@example.com', '201-500'),
+                                 ('c@example.com', '10001+'), ('d@example.com', '')]:
+            Lead.objects.create(professional_email=email, employees=employees, created_by=user)
+
+        def matching(ranges):
+            leads = Lead.objects.filter(range_overlap_q('employees', ranges))
+            return set(leads.values_list('professional_email', flat=True))
+
+        self.assertEqual(matching(['51-200']), set())
+        self.assertEqual(matching(['40-250']), {'a@example.com', 'b@example.com'})
+        self.assertEqual(matching(['5000+']), {'c@example.com'})
+        self.assertEqual(matching(['11-50', '10001+']), {'a@example.com', 'c@example.com'})
+        self.assertEqual(matching(['garbage']), set())
+
+    def test_save_with_update_fields_syncs_bounds(self):
+        user = User.objects.create_user('bounds')
+        lead = Lead.objects.create(professional_email='a@example.com', employees='11-50', created_by=user)
+        lead.employees = '201-500'
+        lead.revenue = '$1M-5M'
+        lead.save(update_fields=['employees', 'revenue'])
+
+        lead = Lead.objects.get(pk=lead.pk)
+        self.assertEqual((lead.employees_min, lead.employees_max), (201, 500))
+        self.assertEqual((lead.revenue_min, lead.revenue_max), (1_000_000, 5_000_000))
+
+    def test_bulk_bounds_match_scalar(self):
+        values = ['51-200', None, '', '$1M-5M', '51-200', '10001+', 'n/a', '1e999M', 100, '200-51']
+        self.assertEqual(range_bounds_many(values), [range_bounds(value) for value in values])
+        self.assertEqual(range_bounds_many([]), [])
+
+    def test_overlap_mask_matches_sql(self):
+        user = User.objects.create_user('masks')
+        values = ['11-50', '201-500', '10001+', '', '$1M-5M', '100']
+        for index, employees in enumerate(values):
+            Lead.objects.create(professional_email=f'{index}@example.com', employees=employees, created_by=user)
+
+        mins, maxs = np.array(range_bounds_many(values), dtype=np.float64).T
+        for filters in [['51-200'], ['40-250'], ['5000+'], ['11-50', '10001+'], ['garbage']]:
+            mask = ranges_overlap_mask([range_bounds(value) for value in filters], mins, maxs)
+            expected = Lead.objects.filter(range_overlap_q('employees', filters)).values_list('professional_email', flat=True)
+            self.assertEqual({f'{index}@example.com' for index in np.flatnonzero(mask)}, set(expected), filters)
@@ -0,0 +1,69 @@
+from unittest import mock
+
+import pandas as pd
+from django.contrib.auth.models import User
+from django.conf import settings
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from ..importer import LeadImporter
+from ..models import Lead
+from ..query import LeadQuery
+from ..result_cache import bump_generation, cached_ids, get_generation, invalidate_results
+
+
+class ResultCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('cache')
+        self.lead_query = LeadQuery()
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(professional_email='a@example.com', created_by=self.user)
+
+    def test_cached_ids_until_invalidated(self):
+        first = cached_ids(self.lead_query, Lead.objects.all())
+        # bulk_create koi signal nahi bhejta: invalidate hone tak cached result hi milta hai
+        Lead.objects.bulk_create([Lead(professional_email='b@example.com', created_by=self.user)])
+        self.assertEqual(cached_ids(self.lead_query, Lead.objects.all()), first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            invalidate_results()
+        self.assertEqual(len(cached_ids(self.lead_query, Lead.objects.all())), 2)
+
+    @override_settings(LEADS_RESULT_CACHE_MAX_IDS=1)
+    def test_large_result_skips_id_fetch(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(professional_email='b@example.com', created_by=self.user)
+        # Sirf COUNT chalta hai, IDs nahi aate
+        with self.assertNumQueries(1):
+            self.assertIsNone(cached_ids(self.lead_query, Lead.objects.all()))
+        with self.assertNumQueries(0):
+            self.assertIsNone(cached_ids(self.lead_query, Lead.objects.all()))
+
+    def test_lead_save_bumps_generation(self):
+        generation = get_generation()
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(professional_email='c@example.com', created_by=self.user)
+        self.assertNotEqual(get_generation(), generation)
+
+    def test_rolled_back_import_keeps_generation(self):
+        generation = get_generation()
+        df = pd.DataFrame({'professional_email': ['x', 'y'], 'first_name': ['A', 'B']})
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(ValueError):
+                LeadImporter({name: name for name in df.columns}, self.user, 'Upload').run_dataframe(df)
+        self.assertEqual(get_generation(), generation)
+
+
+class GenerationTests(TestCase):
+    def test_tests_use_local_memory_cache(self):
+        self.assertEqual(settings.CACHES['default']['BACKEND'], 'django.core.cache.backends.locmem.LocMemCache')
+
+    def test_bump_sets_new_generation_without_incr(self):
+        generation = get_generation()
+        with mock.patch.object(cache, 'incr', side_effect=AssertionError('incr is not atomic everywhere')):
+            bump_generation()
+            bumped = get_generation()
+            bump_generation()
+        self.assertNotEqual(bumped, generation)
+        self.assertNotEqual(get_generation(), bumped)
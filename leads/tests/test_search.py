@@ -0,0 +1,95 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Lead
+from ..query import LeadQuery, _compile_spec
+from ..result_cache import cached_page
+from ..search import full_text_backend
+
+
+class SearchTestMixin:
+    def setUp(self):
+        # Compiled Q (backend ke hisaab se) aur cached result IDs pichhle tests se na aayein
+        _compile_spec.cache_clear()
+        self.addCleanup(_compile_spec.cache_clear)
+        cache.clear()
+        self.user = User.objects.create_user('search')
+        now = timezone.now()
+        for minutes, email, first_name, company, job_title in [
+            (4, 'growth@example.com', 'Growth', 'Growth Labs', 'Growth Lead'),
+            (3, 'asha@example.com', 'Asha', 'Acme Corp', 'Sales Head'),
+            (2, 'bilal@example.com', 'Bilal', 'Acme Corp', 'Engineer'),
+            (1, 'chen@example.com', 'Chen', 'Globex', 'Growth Manager'),
+        ]:
+            lead = Lead.objects.create(
+                professional_email=email, first_name=first_name, company_name=company, job_title=job_title,
+                created_by=self.user,
+            )
+            Lead.objects.filter(pk=lead.pk).update(created_at=now - timedelta(minutes=minutes))
+
+    def search(self, term, **filters):
+        lead_query = LeadQuery.from_cleaned_data({'search': term, **filters})
+        return list(lead_query.apply(Lead.objects.all()).values_list('professional_email', flat=True))
+
+    def list_emails(self, term):
+        response = self.client.get(reverse('leads:leads_list'), {'search': term})
+        return [lead.professional_email for lead in response.context['leads']]
+
+
+class FullTextSearchTests(SearchTestMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        if full_text_backend() is None:
+            self.skipTest('full-text index not installed (SQLite without FTS5)')
+        self.client.force_login(self.user)
+
+    def test_token_prefix_and_semantics(self):
+        self.assertCountEqual(self.search('acm'), ['asha@example.com', 'bilal@example.com'])
+        # Word ke beech ka substring match nahi hota (icontains se alag)
+        self.assertEqual(self.search('cme'), [])
+        self.assertEqual(self.search('acme sales'), ['asha@example.com'])
+        self.assertEqual(self.search('example'), self.search('example.com'))
+
+    def test_leads_list_orders_by_relevance(self):
+        emails = self.list_emails('growth')
+        # 'growth@' chaar columns mein match karta hai, chen sirf job title mein (aur newer hai)
+        self.assertEqual(emails, ['growth@example.com', 'chen@example.com'])
+        # Same rank par newest first
+        self.assertEqual(self.list_emails('acme'), ['bilal@example.com', 'asha@example.com'])
+
+    def test_ranked_pages_follow_cursor(self):
+        lead_query = LeadQuery.from_cleaned_data({'search': 'example'})
+        ranked = [lead.pk for lead in cached_page(lead_query, Lead.objects.all(), per_page=4)]
+
+        first = cached_page(lead_query, Lead.objects.all(), per_page=2)
+        second = cached_page(lead_query, Lead.objects.all(), first.next_cursor, per_page=2)
+        self.assertEqual([lead.pk for lead in first] + [lead.pk for lead in second], ranked)
+        self.assertFalse(second.has_next)
+
+        previous = cached_page(lead_query, Lead.objects.all(), second.previous_cursor, per_page=2)
+        self.assertEqual([lead.pk for lead in previous], [lead.pk for lead in first])
+        self.assertFalse(previous.has_previous)
+
+
+class IContainsFallbackSearchTests(SearchTestMixin, TestCase):
+    def setUp(self):
+        for target in ('leads.search.full_text_backend', 'leads.result_cache.full_text_backend'):
+            patcher = mock.patch(target, return_value=None)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        super().setUp()
+        self.client.force_login(self.user)
+
+    def test_substring_semantics(self):
+        self.assertCountEqual(self.search('cme'), ['asha@example.com', 'bilal@example.com'])
+        self.assertEqual(self.search('acme sales'), [])
+        self.assertEqual(self.search('rowth', company_name='growth'), ['growth@example.com'])
+
+    def test_leads_list_keeps_newest_first(self):
+        self.assertEqual(self.list_emails('growth'), ['chen@example.com', 'growth@example.com'])
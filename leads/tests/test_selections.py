@@ -0,0 +1,67 @@
+import io
+import json
+
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from ..models import Lead, LeadSelection
+
+
+class LeadSelectionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('selector')
+        self.client.force_login(self.user)
+        self.leads = [
+            Lead.objects.create(professional_email=email, industry=industry, created_by=self.user)
+            for email, industry in [
+                ('a@example.com', 'Software'), ('b@example.com', 'Software'), ('c@example.com', 'Banking'),
+            ]
+        ]
+
+    def create_selection(self, payload):
+        return self.client.post(
+            reverse('leads:create_selection'), json.dumps(payload), content_type='application/json'
+        )
+
+    def exported_emails(self, export_url):
+        response = self.client.get(export_url)
+        self.assertEqual(response.status_code, 200)
+        sheet = load_workbook(io.BytesIO(b''.join(response.streaming_content))).active
+        rows = list(sheet.iter_rows(values_only=True))
+        column = rows[0].index('Email')
+        return sorted(row[column] for row in rows[1:])
+
+    def test_selection_by_ids_skips_missing_leads(self):
+        response = self.create_selection({'ids': [self.leads[0].pk, self.leads[2].pk, 999999]})
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['size'], 2)
+
+        selection = LeadSelection.objects.get(pk=data['id'])
+        self.assertEqual(selection.created_by, self.user)
+        self.assertEqual(self.exported_emails(data['export_url']), ['a@example.com', 'c@example.com'])
+
+    def test_selection_by_filter(self):
+        response = self.create_selection({'filters': 'industry=Software'})
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual(data['size'], 2)
+        self.assertEqual(self.exported_emails(data['export_url']), ['a@example.com', 'b@example.com'])
+
+    def test_invalid_payloads_are_rejected(self):
+        self.assertEqual(self.create_selection({'ids': []}).status_code, 400)
+        self.assertEqual(self.create_selection({'ids': ['x']}).status_code, 400)
+        self.assertEqual(self.create_selection({}).status_code, 400)
+        self.assertFalse(LeadSelection.objects.exists())
+
+    def test_other_users_cannot_export_a_selection(self):
+        export_url = self.create_selection({'ids': [self.leads[0].pk]}).json()['export_url']
+
+        self.client.force_login(User.objects.create_user('other'))
+        response = self.client.get(export_url)
+        self.assertRedirects(response, reverse('leads:leads_list'), fetch_redirect_response=False)
+
+        self.client.force_login(User.objects.create_superuser('admin'))
+        self.assertEqual(self.exported_emails(export_url), ['a@example.com'])
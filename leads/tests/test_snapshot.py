@@ -0,0 +1,83 @@
+from django.contrib.auth.models import User
+from django.test import TestCase
+
+from ..models import Lead
+from ..query import LeadQuery
+from ..snapshot import LeadSnapshot
+
+
+def _db_count(**cleaned_data):
+    return LeadQuery.from_cleaned_data(cleaned_data).apply(Lead.objects.all()).count()
+
+
+class LeadSnapshotTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('snapshot')
+        with self.captureOnCommitCallbacks(execute=True):
+            for email, industry, employees in [
+                ('a@example.com', 'Software', '11-50'), ('b@example.com', 'Software', '201-500'),
+                ('c@example.com', 'Banking', '11-50'),
+            ]:
+                Lead.objects.create(
+                    professional_email=email, industry=industry, employees=employees, created_by=self.user
+                )
+
+    def test_counts_match_database(self):
+        snapshot = LeadSnapshot()
+        snapshot.build()
+        lead_query = LeadQuery.from_cleaned_data({'employees_dropdown': ['11-50']})
+
+        self.assertEqual(snapshot.count(lead_query), lead_query.apply(Lead.objects.all()).count())
+        self.assertEqual(
+            snapshot.facet_counts('industry', lead_query, ['Software', 'Banking']), {'Software': 1, 'Banking': 1}
+        )
+
+    def test_facet_counts_use_filter_semantics(self):
+        # 'Software' choose karne par icontains lagta hai, toh 'Software Development' bhi count hota hai
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.create(
+                professional_email='d@example.com', industry='Software Development', created_by=self.user
+            )
+        snapshot = LeadSnapshot()
+        snapshot.build()
+
+        counts = snapshot.facet_counts('industry', LeadQuery(), ['Software', 'Banking', 'Retail'])
+        self.assertEqual(counts, {
+            'Software': _db_count(industry=['Software']),
+            'Banking': _db_count(industry=['Banking']),
+            'Retail': 0,
+        })
+        self.assertEqual(counts['Software'], 3)
+
+    def test_snapshot_goes_stale_when_leads_change(self):
+        snapshot = LeadSnapshot()
+        snapshot.build()
+        self.assertTrue(snapshot.is_fresh())
+
+        lead = Lead.objects.get(professional_email='c@example.com')
+        lead.industry = 'Software'
+        with self.captureOnCommitCallbacks(execute=True):
+            lead.save()
+        self.assertFalse(snapshot.is_fresh())
+
+    def test_refresh_merges_changes_since_last_build(self):
+        snapshot = LeadSnapshot()
+        snapshot.build()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Lead.objects.filter(professional_email='a@example.com').delete()
+            lead = Lead.objects.get(professional_email='c@example.com')
+            lead.industry = 'Software'
+            lead.save()
+            Lead.objects.create(professional_email='e@example.com', industry='Banking', created_by=self.user)
+        snapshot.refresh()
+
+        self.assertEqual(snapshot.last_refresh, 'incremental')
+        self.assertTrue(snapshot.is_fresh())
+        self.assertEqual(snapshot.count(LeadQuery()), Lead.objects.count())
+        self.assertEqual(
+            snapshot.facet_counts('industry', LeadQuery(), ['Software', 'Banking']),
+            {'Software': _db_count(industry=['Software']), 'Banking': _db_count(industry=['Banking'])},
+        )
+        lead_query = LeadQuery.from_cleaned_data({'employees_dropdown': ['11-50']})
+        self.assertEqual(snapshot.count(lead_query), lead_query.apply(Lead.objects.all()).count())
@@ -0,0 +1,28 @@
+import io
+
+from django.test import TestCase
+
+from ..sniffing import detect_encoding, sniff_csv
+
+
+class EncodingSniffingTests(TestCase):
+    def test_utf8_and_bom(self):
+        self.assertEqual(detect_encoding('Name\nJöhn\n'.encode('utf-8'), is_complete=True), 'utf-8')
+        self.assertEqual(detect_encoding('Name\nJöhn\n'.encode('utf-8-sig'), is_complete=True), 'utf-8-sig')
+        self.assertEqual(detect_encoding('Name\nJöhn\n'.encode('utf-16'), is_complete=True), 'utf-16')
+
+    def test_short_cp1252_sample(self):
+        sample = 'Name\nJöhn\n'.encode('cp1252')
+        self.assertEqual(sample.decode(detect_encoding(sample, is_complete=True)), 'Name\nJöhn\n')
+
+    def test_accented_cp1252_file(self):
+        text = 'First Name,Last Name,City\n' + 'José,Peña,Málaga\nSøren,Jensen,Århus\n' * 5
+        format = sniff_csv(io.BytesIO(text.encode('cp1252')))
+        self.assertEqual(format.encoding, 'cp1252')
+        self.assertEqual(format.delimiter, ',')
+        self.assertEqual(text.encode('cp1252').decode(format.encoding), text)
+
+    def test_semicolon_delimiter(self):
+        format = sniff_csv(io.BytesIO(b'Email;First Name\na@example.com;Asha\nb@example.com;Bilal\n'))
+        self.assertEqual(format.delimiter, ';')
+        self.assertEqual(format.estimated_rows, 2)
@@ -0,0 +1,47 @@
+from django.contrib.auth.models import User
+from django.db.models import Q
+from django.test import TestCase
+
+from ..models import Lead
+from ..search import TRIGRAM_FIELDS, contains_any_q, trigram_backend
+
+
+class TrigramContainsTests(TestCase):
+    def setUp(self):
+        if trigram_backend() is None:
+            self.skipTest('trigram index not installed (SQLite without FTS5)')
+        user = User.objects.create_user('trigram')
+        for index, (company, job_title, industry) in enumerate([
+            ('Acme Corp', 'CEO', 'Software'),
+            ('acme_labs', 'Chief Executive', 'IT'),
+            ('Globex', 'VP Sales', 'Banking'),
+            ('100% Organic', 'Co-founder', 'Food & Beverage'),
+            ('Åland Fisheries', 'Cto', ''),
+            ('', 'Intern', None),
+        ]):
+            Lead.objects.create(
+                professional_email=f'{index}@example.com', company_name=company, job_title=job_title,
+                industry=industry, created_by=user,
+            )
+
+    def assertSameRows(self, field_name, values):
+        plain = Q()
+        for value in values:
+            plain |= Q(**{f'{field_name}__icontains': value})
+        expected = set(Lead.objects.filter(plain).values_list('pk', flat=True))
+        actual = set(Lead.objects.filter(contains_any_q(field_name, values)).values_list('pk', flat=True))
+        self.assertEqual(actual, expected, f'{field_name} {values!r}')
+
+    def test_matches_plain_icontains(self):
+        needles = [
+            ['acme'], ['ACME CORP'], ['me'], ['c'], ['o', 'x'], ['globex', 'zzz'],
+            ['_'], ['%'], ['100%'], ['e_l'], ['åland'], ['&'], ['co-'], ['nothing here'],
+        ]
+        for field_name in TRIGRAM_FIELDS:
+            for values in needles:
+                self.assertSameRows(field_name, values)
+
+    def test_uses_trigram_candidates(self):
+        sql = str(Lead.objects.filter(contains_any_q('company_name', ['acme'])).query)
+        if trigram_backend() == 'sqlite':
+            self.assertIn('leads_lead_trgm', sql)
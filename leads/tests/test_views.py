@@ -0,0 +1,87 @@
+from unittest import mock
+
+from django.contrib.auth.models import Group, User
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from ..models import Lead
+from ..snapshot import LeadSnapshot
+
+
+class LeadsListQueryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('viewer', password='secret')
+        self.user.groups.add(Group.objects.create(name='Sales'))
+        self.client.force_login(self.user)
+
+    def create_leads(self, start, total):
+        for index in range(start, start + total):
+            owner = User.objects.create_user(f'owner{index}')
+            Lead.objects.create(
+                professional_email=f'{index}@example.com', industry='Software', created_by=owner,
+            )
+
+    def test_query_count_does_not_grow_with_rows(self):
+        # session, user, page rows (created_by JOIN ke saath), count, user groups (ek baar)
+        self.create_leads(0, 2)
+        cache.clear()
+        with self.assertNumQueries(5):
+            self.client.get(reverse('leads:leads_list'))
+
+        self.create_leads(2, 20)
+        cache.clear()
+        with self.assertNumQueries(5):
+            response = self.client.get(reverse('leads:leads_list'))
+        self.assertContains(response, 'owner21')
+
+
+class FacetAutocompleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('viewer')
+        self.client.force_login(self.user)
+        with self.captureOnCommitCallbacks(execute=True):
+            for index, (industry, employees) in enumerate([
+                ('Software', '11-50'), ('Software', '11-50'), ('Software', '201-500'),
+                ('Banking', '11-50'), ('Retail', '201-500'), ('Soft Drinks', '201-500'),
+            ]):
+                Lead.objects.create(
+                    professional_email=f'{index}@example.com', industry=industry, employees=employees,
+                    created_by=self.user,
+                )
+
+    def autocomplete(self, **params):
+        response = self.client.get(reverse('leads:facet_autocomplete', args=['industry']), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_pages_through_values_by_count(self):
+        with mock.patch('leads.views.FACET_AUTOCOMPLETE_PAGE_SIZE', 2):
+            first = self.autocomplete()
+            last = self.autocomplete(page=2)
+        self.assertEqual([row['id'] for row in first['results']], ['Software', 'Banking'])
+        self.assertTrue(first['pagination']['more'])
+        self.assertEqual([row['id'] for row in last['results']], ['Retail', 'Soft Drinks'])
+        self.assertFalse(last['pagination']['more'])
+        self.assertEqual(first['results'][0]['text'], 'Software (3)')
+
+    def test_q_filters_values_prefix_first(self):
+        data = self.autocomplete(q='soft')
+        self.assertEqual([row['id'] for row in data['results']], ['Software', 'Soft Drinks'])
+
+        data = self.autocomplete(q='bank')
+        self.assertEqual([row['id'] for row in data['results']], ['Banking'])
+
+    def test_counts_respect_other_filters(self):
+        snapshot = LeadSnapshot()
+        snapshot.build()
+        with mock.patch('leads.views.get_snapshot', return_value=snapshot):
+            data = self.autocomplete(q='soft', employees_dropdown='11-50')
+        self.assertEqual(
+            {row['id']: row['text'] for row in data['results']},
+            {'Software': 'Software (2)', 'Soft Drinks': 'Soft Drinks (0)'},
+        )
+
+    def test_unknown_field_is_404(self):
+        response = self.client.get(reverse('leads:facet_autocomplete', args=['first_name']))
+        self.assertEqual(response.status_code, 404)
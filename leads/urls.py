@@ -7,7 +7,15 @@ app_name = 'leads'
 urlpatterns = [
     path('', views.leads_list, name='leads_list'),
     path('upload/', views.upload_leads, name='upload_leads'),
+    path('upload/preview-columns/', views.preview_upload_columns, name='preview_upload_columns'),
+    path('upload/jobs/<int:pk>/progress/', views.upload_job_progress, name='upload_job_progress'),
     path('export/', views.export_leads, name='export_leads'),
+    path('export/jobs/', views.create_export_job, name='create_export_job'),
+    path('export/jobs/<int:pk>/progress/', views.export_job_progress, name='export_job_progress'),
+    path('export/jobs/<int:pk>/download/', views.download_export, name='download_export'),
+    path('api/leads/', views.api_leads, name='api_leads'),
+    path('api/facets/<str:field_name>/', views.facet_autocomplete, name='facet_autocomplete'),
+    path('api/selections/', views.create_selection, name='create_selection'),
     path('export-selected/', views.export_selected_leads, name='export_selected_leads'),
     path('download-sample/', views.download_sample_csv, name='download_sample_csv'),
     path('get-lead-detail/<int:pk>/', views.get_lead_detail_json, name='get_lead_detail_json'),
@@ -1,4 +1,9 @@
 import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from django.db.models import Q
 
 # --- Apollo.io jaise static ranges ---
 
@@ -28,89 +33,94 @@ REVENUE_RANGES = [
 ]
 
 
-def parse_value(value_str):
-    """
-    Ek string (jaise '$10M' ya '5,000') ko ek number mein convert karta hai.
-    """
-    if not value_str:
-        return 0
-    
+# Precompiled patterns (parse_value har row par chalta hai)
+_CLEAN_RE = re.compile(r'[,\$ ]')
+_SUFFIX_RES = [
+    ('B', re.compile(r'[B+]'), 1_000_000_000),
+    ('M', re.compile(r'[M+]'), 1_000_000),
+    ('K', re.compile(r'[K+]'), 1_000),
+]
+
+# Distinct employee/revenue strings kuch sau hi hote hain, isliye parse results memoize hote hain
+PARSE_CACHE_SIZE = 4096
+
+
+def _parse_value(value_str):
     # Comma, dollar sign, aur spaces ko hata dein
-    value_str = str(value_str).strip().upper()
-    value_str = re.sub(r'[,\$ ]', '', value_str)
-    
-    # Handle B (Billion)
-    if 'B' in value_str:
-        num_str = re.sub(r'[B+]', '', value_str)
-        try:
-            num = float(num_str) if num_str else 0
-            return int(num * 1_000_000_000)
-        except ValueError:
-            return 0
-    
-    # Handle M (Million)
-    if 'M' in value_str:
-        num_str = re.sub(r'[M+]', '', value_str)
-        try:
-            num = float(num_str) if num_str else 0
-            return int(num * 1_000_000)
-        except ValueError:
-            return 0
-    
-    # Handle K (Thousand)
-    if 'K' in value_str:
-        num_str = re.sub(r'[K+]', '', value_str)
-        try:
-            num = float(num_str) if num_str else 0
-            return int(num * 1_000)
-        except ValueError:
-            return 0
-    
+    value_str = _CLEAN_RE.sub('', value_str.strip().upper())
+
+    # Handle B (Billion) / M (Million) / K (Thousand)
+    for suffix, suffix_re, multiplier in _SUFFIX_RES:
+        if suffix in value_str:
+            num_str = suffix_re.sub('', value_str)
+            try:
+                num = float(num_str) if num_str else 0
+                return int(num * multiplier)
+            except ValueError:
+                return 0
+
     # Handle + at the end (remove it)
     value_str = value_str.rstrip('+')
-    
+
     try:
         return int(float(value_str))
-    except (ValueError, TypeError):
+    except (ValueError, TypeError, OverflowError):
         return 0
 
 
-def parse_range_to_tuple(range_str):
+_parse_value_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_value)
+
+
+def parse_value(value_str):
     """
-    Ek range string ko (min, max) tuple mein convert karta hai.
-    Examples:
-    - '51-200' -> (51, 200)
-    - '$1M-5M' -> (1000000, 5000000)
-    - '10001+' -> (10001, inf)
-    - '100' -> (100, 100)
+    Ek string (jaise '$10M' ya '5,000') ko ek number mein convert karta hai.
     """
-    if not range_str:
-        return (None, None)
+    if not value_str:
+        return 0
+    return _parse_value_cached(str(value_str))
+
+
+def _parse_range(range_str, value_parser=parse_value):
+    # value_parser: benchmark uncached _parse_value pass karta hai
+    range_str = range_str.strip()
 
-    range_str = str(range_str).strip()
-    
     # Plus (+) notation ke liye (e.g., '10001+')
     if range_str.endswith('+'):
-        min_val_str = range_str[:-1]
-        min_val = parse_value(min_val_str)
+        min_val = value_parser(range_str[:-1])
         return (min_val, float('inf'))
 
     # Range notation ke liye (e.g., '51-200' or '$1M-5M')
     if '-' in range_str:
-        parts = range_str.split('-', 1)  # Only split once
-        if len(parts) == 2:
-            min_val = parse_value(parts[0])
-            max_val = parse_value(parts[1])
-            # Ensure min <= max
-            return (min(min_val, max_val), max(min_val, max_val))
-    
+        min_part, max_part = range_str.split('-', 1)  # Only split once
+        min_val = value_parser(min_part)
+        max_val = value_parser(max_part)
+        # Ensure min <= max
+        return (min(min_val, max_val), max(min_val, max_val))
+
     # Single value ke liye (e.g., '100' or '$5M')
-    val = parse_value(range_str)
+    val = value_parser(range_str)
     if val == 0:
         return (None, None)
     return (val, val)
 
 
+_parse_range_cached = lru_cache(maxsize=PARSE_CACHE_SIZE)(_parse_range)
+
+
+def parse_range_to_tuple(range_str):
+    """
+    Ek range string ko (min, max) tuple mein convert karta hai (memoized).
+    Examples:
+    - '51-200' -> (51, 200)
+    - '$1M-5M' -> (1000000, 5000000)
+    - '10001+' -> (10001, inf)
+    - '100' -> (100, 100)
+    """
+    if not range_str:
+        return (None, None)
+    return _parse_range_cached(str(range_str))
+
+
 def check_range_overlap(filter_range_str, db_value_str):
     """
     Do range strings ko compare karta hai aur check karta hai agar woh overlap karte hain.
@@ -162,4 +172,80 @@ def check_multiple_ranges(filter_ranges_list, db_value_str):
         if check_range_overlap(filter_range, db_value_str):
             return True
     
-    return False
\ No newline at end of file
+    return False
+
+
+# --- DB-side range filtering ---
+
+# Open-ended ranges (e.g. '10001+') ka upper bound DB mein is sentinel se store hota hai,
+# taaki overlap check ek simple indexed comparison ban jaye (NULL handling ke bina).
+RANGE_UNBOUNDED = 9_223_372_036_854_775_807  # BigIntegerField ka max value
+
+
+def range_bounds(value_str):
+    """
+    Range string ko DB mein store karne layak (min, max) integers mein convert karta hai.
+    Parse na ho paaye toh (None, None); open-ended max ko RANGE_UNBOUNDED se replace karta hai.
+    """
+    try:
+        low, high = parse_range_to_tuple(value_str)
+    except (ValueError, TypeError, OverflowError):
+        return (None, None)
+
+    if low is None:
+        return (None, None)
+
+    low = min(int(low), RANGE_UNBOUNDED)
+    high = RANGE_UNBOUNDED if high == float('inf') else min(int(high), RANGE_UNBOUNDED)
+    return (low, high)
+
+
+def range_bounds_many(values):
+    """
+    range_bounds ka bulk version (backfills/imports): values ka iterable -> [(min, max)] isi order mein.
+    Har distinct string sirf ek baar parse hoti hai (pd.factorize), isliye lakhon rows bhi kuch sau parses hain.
+    """
+    codes, uniques = pd.factorize(pd.Series(list(values), dtype=object), use_na_sentinel=True)
+    unique_bounds = [range_bounds(value) for value in uniques]
+    return [unique_bounds[code] if code >= 0 else (None, None) for code in codes.tolist()]
+
+
+def ranges_overlap_mask(bounds_list, mins, maxs):
+    """
+    range_bounds_q ka numpy version (in-memory filtering): parsed (min, max) filter bounds ka
+    (mins, maxs) arrays par boolean mask. Kisi bhi range se overlap = True; NaN (NULL) rows hamesha False.
+    """
+    mask = np.zeros(len(mins), dtype=bool)
+    for f_min, f_max in bounds_list:
+        if f_min is None:
+            continue
+        # Overlap logic: (StartA <= EndB) and (EndA >= StartB)
+        mask |= (maxs >= f_min) & (mins <= f_max)
+    return mask
+
+
+def range_overlap_q(field_name, filter_ranges_list):
+    """
+    check_multiple_ranges ka SQL version: '<field>_min' / '<field>_max' columns par
+    overlap predicate banata hai. Koi bhi valid range na ho toh match-nothing Q deta hai.
+
+    Example: range_overlap_q('employees', ['51-200', '10001+'])
+    """
+    return range_bounds_q(field_name, [range_bounds(filter_range) for filter_range in filter_ranges_list])
+
+
+def range_bounds_q(field_name, bounds_list):
+    """range_overlap_q jaisa, lekin pehle se parsed (min, max) bounds ke liye."""
+    query = Q()
+    has_valid_range = False
+
+    for f_min, f_max in bounds_list:
+        if f_min is None:
+            continue
+        has_valid_range = True
+        # Overlap logic: (StartA <= EndB) and (EndA >= StartB)
+        query |= Q(**{f'{field_name}_max__gte': f_min, f'{field_name}_min__lte': f_max})
+
+    if not has_valid_range:
+        return Q(pk__in=[])
+    return query
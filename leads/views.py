@@ -3,20 +3,40 @@ import pandas as pd
 from django.shortcuts import render, redirect
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
-from django.core.paginator import Paginator
-from django.http import HttpResponse, JsonResponse
+from django.http import HttpResponse, JsonResponse, QueryDict, StreamingHttpResponse
 from django.db.models import Q, F, Count 
 from django.contrib.auth.models import Group, User
-from .models import Lead
+from .models import ExportJob, Lead, UploadJob
 from .forms import LeadFilterForm, LeadsUploadForm
+from .columns import decisions_to_map, mapping_report, mapping_summary, resolve_columns
+from .importer import ALLOWED_EXTENSIONS, LeadImporter, UploadReader, upload_formats_label
+from .jobs import read_progress
+from .error_reports import delete_error_report, error_report_exists, iter_error_report, save_error_report
+from .exports import (
+    EXCEL_COLUMN_NAMES, EXPORT_FIELD_NAMES, EXPORTABLE_FIELD_NAMES, PARQUET_COMPRESSIONS, PARQUET_CONTENT_TYPE,
+    PARQUET_FIELD_NAMES, XLSX_CONTENT_TYPE, iter_csv_rows, iter_csv_rows_for_ids, iter_value_rows,
+    parquet_available, parquet_response, xlsx_response,
+)
+from .query import LeadQuery
+from .result_cache import cached_count, cached_ids, cached_page
+from .facets import FACET_FIELDS, search_facet_values
+from .downloads import file_download_response
+from .export_jobs import available_export_formats, export_file_exists, export_file_path, request_export_job
+from .selections import create_filter_selection, create_id_selection, get_user_selection
+from .snapshot import get_snapshot, snapshot_stats
 from accounts import models
+from accounts.roles import can_upload_leads
+from leadgenpro.cache import get_stats as get_cache_stats
 from generate_lead_filters import generate_filters
 import csv
 import io
+import json
 import os  # ✅ YEH LINE ADD KAREN
 from django.forms.models import model_to_dict
 from django.urls import reverse
 from django.db import transaction
+from django.conf import settings
+from django.shortcuts import get_object_or_404
 
 # utils.py se imports (Fallback ke saath)
 try:
@@ -28,20 +48,30 @@ except ImportError:
     def check_range_overlap(filter_range_str, db_value_str): return True
     def parse_range_to_tuple(range_str): return (None, None)
 
+# leads_list.html table ke columns (+ keyset pagination ke liye created_at)
+LIST_FIELD_NAMES = EXPORT_FIELD_NAMES + ['created_at', 'created_by']
+
+API_MAX_PER_PAGE = 100
+FACET_AUTOCOMPLETE_PAGE_SIZE = 30
+EXPORT_CONTENT_TYPES = {
+    ExportJob.FORMAT_CSV_GZ: 'application/gzip',
+    ExportJob.FORMAT_XLSX: XLSX_CONTENT_TYPE,
+    ExportJob.FORMAT_PARQUET: PARQUET_CONTENT_TYPE,
+}
+
 
 @login_required
 def upload_leads(request):
     """
     Improved Leads Upload Function with Better Error Handling and User Feedback
     """
-    is_manager = request.user.groups.filter(name='Managers').exists()
-    if not (request.user.is_superuser or is_manager):
+    if not can_upload_leads(request.user):
         messages.error(request, "You do not have permission to upload leads.")
         return redirect('leads:leads_list')
 
     # Clear previous upload errors
-    if 'upload_errors' in request.session:
-        del request.session['upload_errors']
+    if 'upload_error_report' in request.session:
+        delete_error_report(request.session.pop('upload_error_report'))
 
     if request.method == 'POST':
         form = LeadsUploadForm(request.POST, request.FILES)
@@ -50,119 +80,58 @@ def upload_leads(request):
             overwrite = form.cleaned_data['overwrite']
             
             # File validation
-            allowed_extensions = ['.csv', '.xls', '.xlsx']
             file_extension = os.path.splitext(file.name)[1].lower()  # ✅ Ab yeh kaam karega
             
-            if file_extension not in allowed_extensions:
-                messages.error(request, f"❌ Invalid file format. Please upload CSV or Excel files only.")
+            if file_extension not in ALLOWED_EXTENSIONS:
+                messages.error(request, f"❌ Invalid file format. Please upload {upload_formats_label()} files only.")
                 return render(request, 'leads/upload_leads.html', {'form': form})
             
-            if file.size > 10 * 1024 * 1024:  # 10MB limit
-                messages.error(request, "❌ File size too large. Please upload files smaller than 10MB.")
+            if file.size > settings.LEADS_UPLOAD_MAX_SIZE:
+                messages.error(request, f"❌ File size too large. Please upload files smaller than {form.max_size_mb}MB.")
                 return render(request, 'leads/upload_leads.html', {'form': form})
 
+            # Badi files disk par save karke background worker ko de dein
+            background_min_size = getattr(settings, 'LEADS_UPLOAD_BACKGROUND_MIN_SIZE', -1)
+            if background_min_size >= 0 and file.size >= background_min_size:
+                job = UploadJob.objects.create(
+                    file=file,
+                    original_name=file.name,
+                    overwrite=overwrite,
+                    created_by=request.user,
+                )
+                progress_url = reverse('leads:upload_job_progress', args=[job.pk])
+                if request.headers.get('x-requested-with') == 'XMLHttpRequest':
+                    return JsonResponse({'status': 'queued', 'job_id': job.pk, 'progress_url': progress_url}, status=202)
+                messages.info(request, f"⏳ '{file.name}' queued for background processing (Job #{job.pk}).")
+                return render(request, 'leads/upload_leads.html', {
+                    'form': LeadsUploadForm(),
+                    'job': job,
+                    'progress_url': progress_url,
+                })
+
             try:
-                # --- 1. Read File with Better Error Handling ---
+                # --- 1. Read File with Better Error Handling (chunked, memory bounded) ---
                 try:
-                    if file.name.endswith('.csv'):
-                        # CSV reading with encoding detection
-                        try:
-                            df = pd.read_csv(file, dtype=str, keep_default_na=False, encoding='utf-8')
-                        except UnicodeDecodeError:
-                            df = pd.read_csv(file, dtype=str, keep_default_na=False, encoding='latin-1')
-                    else:
-                        # Excel file reading
-                        df = pd.read_excel(file, dtype=str, keep_default_na=False)
+                    reader = UploadReader(file, file.name)
                 except Exception as e:
                     messages.error(request, f"❌ Error reading file: {str(e)}")
                     return render(request, 'leads/upload_leads.html', {'form': form})
 
                 # Check if file is empty
-                if df.empty:
+                if reader.is_empty:
                     messages.error(request, "❌ The uploaded file is empty.")
                     return render(request, 'leads/upload_leads.html', {'form': form})
 
-                df.fillna('', inplace=True)  # Replace NaN with empty strings
-
-                # --- 2. Enhanced Column Mapping ---
-                COLUMN_MAPPING = {
-                    # Person fields
-                    'Full Name': 'full_name', 
-                    'First Name': 'first_name', 
-                    'Last Name': 'last_name',
-                    'Job Title': 'job_title', 
-                    'Job Title/Role': 'job_title',
-                    'Professional Email': 'professional_email', 
-                    'Email': 'professional_email',
-                    'Work Email': 'professional_email',
-                    'Email Status': 'email_status', 
-                    'Personal Email': 'personal_email',
-                    'Person Linkedin Url': 'person_linkedin_url', 
-                    'Linkedin Url': 'person_linkedin_url',
-                    'LinkedIn Profile': 'person_linkedin_url',
-                    'Person City': 'person_city', 
-                    'Person State': 'person_state', 
-                    'Person Country': 'person_country',
-                    'Person Direct Phone Number': 'person_direct_phone', 
-                    'Phone': 'person_direct_phone',
-                    'Direct Phone': 'person_direct_phone',
-                    'Mobile': 'person_direct_phone',
-                    'Lead ID': 'lead_id', 
-                    'Comments': 'comments', 
-                    'Comment': 'comments',
-                    'Notes': 'comments',
-
-                    # Company fields
-                    'Company ID': 'company_id', 
-                    'Company Name': 'company_name',
-                    'Organization': 'company_name',
-                    'Company Website': 'company_website', 
-                    'Website': 'company_website',
-                    'Industry': 'industry', 
-                    'Employees': 'employees', 
-                    'Employee Count': 'employees',
-                    'Company Size': 'employees',
-                    'Revenue': 'revenue',
-                    'Annual Revenue': 'revenue',
-                    'Generic Email': 'generic_email', 
-                    'Full Address': 'full_address',
-                    'Address': 'full_address',
-                    'First Address': 'first_address', 
-                    'Company City': 'company_city', 
-                    'Company State': 'company_state', 
-                    'Zip code': 'zip_code',
-                    'Postal Code': 'zip_code',
-                    'Company Country': 'company_country',
-                    'Company Linkedin Url': 'company_linkedin_url',
-                    'Company LinkedIn': 'company_linkedin_url',
-                    'Company Phone Numbers': 'company_phone', 
-                    'Company Phone': 'company_phone',
-                    'Office Phone': 'company_phone',
-                }
-
-                # --- 3. Smart Column Detection ---
-                column_map = {}
-                processed_model_fields = set()
-                available_columns = []
-                
-                for col in df.columns:
-                    col_clean = col.strip()
-                    available_columns.append(col_clean)
-                    mapped_field = None
-                    
-                    # Exact match check
-                    if col_clean in COLUMN_MAPPING:
-                        mapped_field = COLUMN_MAPPING[col_clean]
-                    else:
-                        # Fuzzy match - case insensitive
-                        for key, value in COLUMN_MAPPING.items():
-                            if key.lower() == col_clean.lower():
-                                mapped_field = value
-                                break
-                    
-                    if mapped_field and mapped_field not in processed_model_fields:
-                        column_map[col] = mapped_field
-                        processed_model_fields.add(mapped_field)
+                # --- 2/3. Column Mapping & Smart Column Detection ---
+                column_decisions = resolve_columns(reader.columns)
+                column_map = decisions_to_map(column_decisions)
+                available_columns = [str(column).strip() for column in reader.columns]
+                processed_model_fields = set(column_map.values())
+
+                # Fuzzy/ignored columns user ko batayein
+                summary = mapping_summary(column_decisions)
+                if summary:
+                    messages.info(request, f"Column mapping: {summary}")
 
                 # Check for required columns
                 if 'professional_email' not in processed_model_fields:
@@ -170,110 +139,30 @@ def upload_leads(request):
                     # Show available columns for debugging
                     messages.info(request, f"Available columns in your file: {', '.join(available_columns)}")
 
-                # --- 4. Process Rows with Detailed Reporting ---
-                success_count = 0
-                update_count = 0
-                error_count = 0
-                errors_list = []
-                warnings_list = []
+                # --- 4. Process Rows with Detailed Reporting (batched upsert) ---
+                importer = LeadImporter(
+                    column_map,
+                    user=request.user,
+                    source=f'Uploaded File: {file.name}',
+                    overwrite=overwrite,
+                )
 
                 try:
-                    with transaction.atomic():
-                        for index, row in df.iterrows():
-                            row_number = index + 2  # +2 for header and 0-index
-                            original_row_data = row.to_dict()
-
-                            try:
-                                lead_data = {
-                                    'source': f'Uploaded File: {file.name}',
-                                    'created_by': request.user
-                                }
-                                missing_required = []
-
-                                # Process each column
-                                for original_col, model_field in column_map.items():
-                                    value = original_row_data.get(original_col, '')
-                                    value = str(value).strip() if value not in [None, ''] else ''
-                                    lead_data[model_field] = value
-
-                                # Required fields validation
-                                email = lead_data.get('professional_email', '')
-                                if not email:
-                                    missing_required.append('Professional Email')
-                                else:
-                                    # Basic email validation
-                                    if '@' not in email:
-                                        raise ValueError(f"Invalid email format: {email}")
-
-                                # Name handling with better logic
-                                f_name = lead_data.get('first_name', '')
-                                l_name = lead_data.get('last_name', '')
-                                full_name = lead_data.get('full_name', '')
-
-                                if not f_name and not l_name:
-                                    if full_name:
-                                        # Smart name splitting
-                                        name_parts = full_name.split(' ', 1)
-                                        lead_data['first_name'] = name_parts[0].strip()
-                                        lead_data['last_name'] = name_parts[1].strip() if len(name_parts) > 1 else ''
-                                    else:
-                                        missing_required.append('First Name/Last Name or Full Name')
-                                
-                                # Ensure we have at least first name
-                                if not lead_data.get('first_name') and not lead_data.get('last_name'):
-                                    raise ValueError("Could not extract valid name from data")
-
-                                if missing_required:
-                                    raise ValueError(f"Required field(s) missing: {', '.join(missing_required)}")
-
-                                # Check for existing lead
-                                existing_lead = Lead.objects.filter(professional_email=email).first()
-
-                                if existing_lead:
-                                    if overwrite:
-                                        # Update existing lead
-                                        updated_fields = []
-                                        for key, value in lead_data.items():
-                                            if key not in ['created_by', 'source'] and value:
-                                                current_value = getattr(existing_lead, key, '')
-                                                if current_value != value:
-                                                    setattr(existing_lead, key, value)
-                                                    updated_fields.append(key)
-                                        
-                                        if updated_fields:
-                                            existing_lead.save()
-                                            update_count += 1
-                                            warnings_list.append(f"Row {row_number}: Updated lead {email} - Fields: {', '.join(updated_fields)}")
-                                        else:
-                                            warnings_list.append(f"Row {row_number}: No changes for lead {email} (already up to date)")
-                                    else:
-                                        raise ValueError(f"Lead with email {email} already exists (Overwrite is OFF)")
-                                else:
-                                    # Create new lead
-                                    Lead.objects.create(**lead_data)
-                                    success_count += 1
-
-                            except Exception as e:
-                                error_count += 1
-                                errors_list.append({
-                                    'row_number': row_number,
-                                    'error_message': str(e),
-                                    'row_data': original_row_data,
-                                    'email': email if 'email' in locals() else 'N/A'
-                                })
-
-                        # If too many errors, rollback
-                        if error_count > len(df) * 0.5:  # More than 50% errors
-                            raise ValueError(f"Too many errors ({error_count}/{len(df)} rows). Upload cancelled.")
-
+                    importer.run(reader)
                 except Exception as transaction_error:
-                    messages.error(request, f"❌ Upload failed and rolled back. {error_count} row(s) had errors.")
-                    if errors_list:
-                        request.session['upload_errors'] = errors_list
+                    messages.error(request, f"❌ Upload failed and rolled back. {importer.error_count} row(s) had errors.")
+                    if importer.errors_list:
+                        request.session['upload_error_report'] = save_error_report(importer.errors_list)
                         error_report_url = reverse('leads:download_upload_errors')
                         messages.warning(request, f'⚠️ <a href="{error_report_url}" class="alert-link">Download error report</a>', extra_tags='safe')
                     return render(request, 'leads/upload_leads.html', {'form': form})
 
+                success_count = importer.success_count
+                update_count = importer.update_count
+                error_count = importer.error_count
+                errors_list = importer.errors_list
+                warnings_list = importer.warnings_list
+
                 # --- 5. Final Results Summary ---
                 result_messages = []
                 
@@ -285,7 +174,8 @@ def upload_leads(request):
                 
                 if error_count > 0:
                     result_messages.append(f"❌ {error_count} rows failed")
-                    request.session['upload_errors'] = errors_list
+                    # Session mein sirf report id; errors compressed file mein
+                    request.session['upload_error_report'] = save_error_report(errors_list)
                     error_report_url = reverse('leads:download_upload_errors')
                     result_messages.append(f'📄 <a href="{error_report_url}" class="alert-link">Download error report</a>')
 
@@ -324,285 +214,338 @@ def upload_leads(request):
 
 
 @login_required
-def leads_list(request):
-    
+def preview_upload_columns(request):
+    """
+    Upload se pehle column mapping preview (JSON). Page file ka sirf shuru ka hissa bhejta hai
+    (CSV: pehle 64KB); headers wahi resolver decide karta hai jo import karega.
+    """
+    if not can_upload_leads(request.user):
+        return JsonResponse({'error': 'Permission denied.'}, status=403)
+    if request.method != 'POST' or 'sample' not in request.FILES:
+        return JsonResponse({'error': 'POST a file sample.'}, status=400)
+
+    file_name = request.POST.get('file_name') or request.FILES['sample'].name
+    if os.path.splitext(file_name)[1].lower() not in ALLOWED_EXTENSIONS:
+        return JsonResponse({'error': 'Invalid file format.'}, status=400)
+
     try:
-        from .utils import EMPLOYEE_RANGES, REVENUE_RANGES, check_range_overlap, parse_range_to_tuple
-    except ImportError:
-        messages.error(request, "CRITICAL ERROR: leads/utils.py file is missing or broken. Range filters will not work.")
-        return render(request, 'leads/leads_list.html', {'form': LeadFilterForm()})
+        reader = UploadReader(request.FILES['sample'], file_name, chunk_size=1)
+    except Exception as e:
+        return JsonResponse({'error': f'Could not read headers: {e}'}, status=400)
 
-    leads_queryset = Lead.objects.all() 
-    
+    decisions = resolve_columns(reader.columns)
+    return JsonResponse({
+        'columns': mapping_report(decisions),
+        'has_email': 'professional_email' in decisions_to_map(decisions).values(),
+    })
+
+
+def _get_user_upload_job(request, pk):
+    job = get_object_or_404(UploadJob, pk=pk)
+    if not (request.user.is_superuser or job.created_by_id == request.user.pk):
+        return None
+    return job
+
+
+@login_required
+def upload_job_progress(request, pk):
+    """Background upload job ka JSON progress (upload_leads.html isse poll karta hai)."""
+    job = _get_user_upload_job(request, pk)
+    if job is None:
+        return JsonResponse({'status': 'error', 'message': 'Permission denied.'}, status=403)
+
+    progress = read_progress(job)
+    data = {
+        'job_id': job.pk,
+        'status': job.status,
+        'file_name': job.original_name,
+        'total_rows': job.total_rows,
+        'processed_rows': progress['processed_rows'],
+        'created': progress['created_count'],
+        'updated': progress['updated_count'],
+        'failed': progress['failed_count'],
+        'message': job.message,
+        'error_report_url': None,
+    }
+    if job.is_finished and job.error_report:
+        data['error_report_url'] = f"{reverse('leads:download_upload_errors')}?job={job.pk}"
+    return JsonResponse(data)
+
+
+DEFAULT_FILTER_CHOICES = {
+    'JOB_TITLE_CHOICES': [('', 'All Job Titles')],
+    'INDUSTRY_CHOICES': [('', 'All Industries')],
+    'PERSON_COUNTRY_CHOICES': [('', 'All Person Countries')],
+    'COMPANY_COUNTRY_CHOICES': [('', 'All Company Countries')],
+}
+
+
+def _build_filter_form(request, params=None):
+    """leads_list / export_leads / API ka common LeadFilterForm (facet choices ke saath)."""
+    params = request.GET if params is None else params
     try:
-        filter_choices = generate_filters(request)
+        filter_choices = generate_filters(request, params)
     except Exception as e:
         print(f"Error in generate_filters: {e}")
-        filter_choices = {
-            'JOB_TITLE_CHOICES': [('', 'All Job Titles')],
-            'INDUSTRY_CHOICES': [('', 'All Industries')],
-            'PERSON_COUNTRY_CHOICES': [('', 'All Person Countries')],
-            'COMPANY_COUNTRY_CHOICES': [('', 'All Company Countries')],
-        }
-    
+        filter_choices = DEFAULT_FILTER_CHOICES
+
     form = LeadFilterForm(
-        request.GET or None, 
+        params or None,
         EMPLOYEES_CHOICES=EMPLOYEE_RANGES,
         JOB_TITLE_CHOICES=filter_choices.get('JOB_TITLE_CHOICES', []),
         INDUSTRY_CHOICES=filter_choices.get('INDUSTRY_CHOICES', []),
         PERSON_COUNTRY_CHOICES=filter_choices.get('PERSON_COUNTRY_CHOICES', []),
         COMPANY_COUNTRY_CHOICES=filter_choices.get('COMPANY_COUNTRY_CHOICES', [])
     )
+    return form, filter_choices
+
+
+def _lead_count(lead_query, queryset):
+    """Total matching leads: snapshot se (agar query support karta hai), warna cached COUNT."""
+    snapshot = get_snapshot()
+    if snapshot is not None and snapshot.supports(lead_query):
+        return snapshot.count(lead_query)
+    return cached_count(lead_query.apply(queryset), lead_query)
+
+
+def _add_facet_counts(form, lead_query):
+    """Dropdown options mein live counts ('Software (12,431)'), baaki active filters ke saath."""
+    snapshot = get_snapshot()
+    if snapshot is None or not snapshot.supports(lead_query):
+        return
+    for field_name in FACET_FIELDS:
+        field = form.fields[field_name]
+        counts = snapshot.facet_counts(field_name, lead_query, [value for value, _ in field.choices])
+        field.choices = [
+            (value, f"{label} ({counts.get(value, 0):,})" if value else label)
+            for value, label in field.choices
+        ]
+
 
+def _lead_query(form):
+    """Valid form se LeadQuery; invalid/empty form par koi filter nahi (purana behaviour)."""
     if form.is_valid():
-        
-        # --- REFACTORED: Sequential Filtering (Clean & Robust) ---
-
-        # 1. Company Name (Contains - flexible)
-        company_str = form.cleaned_data.get('company_name')
-        if company_str:
-            companies = [name.strip() for name in company_str.split(',') if name.strip()]
-            if companies:
-                company_query = Q()
-                for name in companies:
-                    company_query |= Q(company_name__icontains=name)
-                leads_queryset = leads_queryset.filter(company_query)
-
-        # 2. General Search (Contains - flexible)
-        search = form.cleaned_data.get('search')
-        if search:
-            search_query = (
-                Q(first_name__icontains=search) |
-                Q(last_name__icontains=search) |
-                Q(professional_email__icontains=search) |
-                Q(personal_email__icontains=search) |
-                Q(company_name__icontains=search) |
-                Q(job_title__icontains=search) |
-                Q(industry__icontains=search)
-            )
-            leads_queryset = leads_queryset.filter(search_query)
-
-        # 3. Job Title (ROBUST FIX: __icontains)
-        job_titles = form.cleaned_data.get('job_title')
-        if job_titles:
-            title_query = Q()
-            for title in job_titles:
-                title_query |= Q(job_title__icontains=title) 
-            leads_queryset = leads_queryset.filter(title_query)
-
-        # 4. Industry (ROBUST FIX: __icontains)
-        industries = form.cleaned_data.get('industry')
-        if industries:
-            industry_query = Q()
-            for ind in industries:
-                industry_query |= Q(industry__icontains=ind)
-            leads_queryset = leads_queryset.filter(industry_query)
-
-        # 5. Person Country (ROBUST FIX: __icontains)
-        person_countries = form.cleaned_data.get('person_country')
-        if person_countries:
-            p_country_query = Q()
-            for c in person_countries:
-                p_country_query |= Q(person_country__icontains=c)
-            leads_queryset = leads_queryset.filter(p_country_query)
-
-        # 6. Company Country (ROBUST FIX: __icontains)
-        company_countries = form.cleaned_data.get('company_country')
-        if company_countries:
-            c_country_query = Q()
-            for c in company_countries:
-                c_country_query |= Q(company_country__icontains=c)
-            leads_queryset = leads_queryset.filter(c_country_query)
-        
-        # --- Python-based filters (Range) ---
+        return LeadQuery.from_cleaned_data(form.cleaned_data)
+    return LeadQuery()
 
-        # 7. Employee Range Filter 
-        employees_filters_dropdown = form.cleaned_data.get('employees_dropdown', [])
-        employees_filter_text = form.cleaned_data.get('employees_text')
-        
-        all_employee_ranges = list(employees_filters_dropdown)
-        if employees_filter_text:
-            all_employee_ranges.append(employees_filter_text.strip())
 
-        if all_employee_ranges:
-            try:
-                employee_filtered_ids = []
-                for lead in leads_queryset: 
-                    for filter_range in all_employee_ranges:
-                        if check_range_overlap(filter_range_str=filter_range, db_value_str=lead.employees):
-                            employee_filtered_ids.append(lead.id)
-                            break 
-                
-                if employee_filtered_ids:
-                    leads_queryset = leads_queryset.filter(id__in=employee_filtered_ids)
-            except Exception as e:
-                messages.error(request, f"⚠️ Error in 'Employees' filter. Check values. {e}")
+@login_required
+def leads_list(request):
+    form, filter_choices = _build_filter_form(request)
+    lead_query = _lead_query(form)
 
-        # 8. Revenue Range Filter
-        revenue_text = form.cleaned_data.get('revenue')
-        if revenue_text:
-            try:
-                revenue_filters = [r.strip() for r in revenue_text.split(',') if r.strip()]
-                revenue_filtered_ids = []
-                for lead in leads_queryset:
-                    for filter_range in revenue_filters:
-                         if check_range_overlap(filter_range_str=filter_range, db_value_str=lead.revenue):
-                            revenue_filtered_ids.append(lead.id)
-                            break
-
-                if revenue_filtered_ids:
-                    leads_queryset = leads_queryset.filter(id__in=revenue_filtered_ids)
-            except Exception as e:
-                messages.error(request, f"⚠️ Error in 'Revenue' filter. Check values. {e}")
-        
-    paginator = Paginator(leads_queryset.order_by('-created_at'), 25)
-    page_number = request.GET.get('page')
-    page_obj = paginator.get_page(page_number)
+    # Sirf table mein dikhne wale columns + created_by ka JOIN (N+1 queries nahi)
+    base_queryset = Lead.objects.select_related('created_by').only(*LIST_FIELD_NAMES, 'created_by__username')
+
+    # Keyset pagination: cursor (created_at, id) se seek, OFFSET/COUNT(*) nahi.
+    # Page IDs aur count filter spec par cached (Lead write hone par invalidate)
+    page_obj = cached_page(lead_query, base_queryset, request.GET.get('cursor'), per_page=25)
+    page_obj.total_count = _lead_count(lead_query, base_queryset)
+    _add_facet_counts(form, lead_query)
+
+    filter_params = request.GET.copy()
+    filter_params.pop('cursor', None)
+    filter_params.pop('page', None)
 
     return render(request, 'leads/leads_list.html', {
         'leads': page_obj, 
         'form': form,
         'page_obj': page_obj, 
-        'filter_choices': filter_choices
+        'filter_querystring': filter_params.urlencode(),
+        'filter_choices': filter_choices,
+        'export_formats': available_export_formats(),
     })
 
 
+def _export_columns(request, default):
+    """?columns=a,b,c projection (EXPORTABLE_FIELD_NAMES mein se, isi order mein); na ho toh default."""
+    value = request.GET.get('columns', '').strip()
+    if not value:
+        return list(default), None
+    columns = [name.strip() for name in value.split(',') if name.strip()]
+    unknown = [name for name in columns if name not in EXPORTABLE_FIELD_NAMES]
+    if unknown:
+        return None, f"Unknown export columns: {', '.join(unknown)}"
+    return list(dict.fromkeys(columns)), None
+
+
 @login_required
 def export_leads(request):
-    
-    # Yeh function leads_list ke jaisa hi hai, bas pagination nahi hai
-    
-    try:
-        from .utils import EMPLOYEE_RANGES, REVENUE_RANGES, check_range_overlap, parse_range_to_tuple
-    except ImportError:
-        messages.error(request, "Could not export: leads/utils.py file is missing.")
-        return redirect('leads:leads_list')
+    """
+    Filtered leads ka export (leads_list wale hi filters, bas pagination nahi).
+    ?format=csv (default, streaming) ya parquet (typed columns, row-group batches);
+    ?columns=... column projection; ?compression=snappy|zstd|gzip|brotli|lz4|none (sirf Parquet).
+    """
+    form, _ = _build_filter_form(request)
+    lead_query = _lead_query(form)
+
+    export_format = request.GET.get('format', 'csv')
+    if export_format == 'parquet':
+        if not parquet_available():
+            return HttpResponse("Parquet export is not available on this server (pyarrow missing).", status=400)
+        compression = request.GET.get('compression', 'snappy')
+        if compression not in PARQUET_COMPRESSIONS:
+            return HttpResponse(f"Unknown Parquet compression '{compression}'.", status=400)
+        field_names, error = _export_columns(request, PARQUET_FIELD_NAMES)
+        if error:
+            return HttpResponse(error, status=400)
+        queryset = lead_query.apply(Lead.objects.order_by('-created_at', '-id'))
+        return parquet_response(
+            field_names, iter_value_rows(queryset, field_names), 'filtered_leads.parquet',
+            compression=None if compression == 'none' else compression,
+        )
+    if export_format != 'csv':
+        return HttpResponse(f"Unknown export format '{export_format}'.", status=400)
+
+    field_names, error = _export_columns(request, EXPORT_FIELD_NAMES)
+    if error:
+        return HttpResponse(error, status=400)
+
+    # Streaming response: rows DB se chunks mein aate hain aur seedha client ko jaate hain.
+    # Chhote/medium results ki ordered IDs cache se aati hain (same filters par dobara filter nahi chalta)
+    ids = cached_ids(lead_query, Lead.objects.all())
+    if ids is not None:
+        rows = iter_csv_rows_for_ids(Lead.objects.all(), ids, field_names)
+    else:
+        rows = iter_csv_rows(lead_query.apply(Lead.objects.order_by('-created_at', '-id')), field_names)
 
-    leads_queryset = Lead.objects.all()
-    
-    try:
-        filter_choices = generate_filters(request)
-    except Exception as e:
-        filter_choices = {
-            'JOB_TITLE_CHOICES': [('', 'All Job Titles')],
-            'INDUSTRY_CHOICES': [('', 'All Industries')],
-            'PERSON_COUNTRY_CHOICES': [('', 'All Person Countries')],
-            'COMPANY_COUNTRY_CHOICES': [('', 'All Company Countries')],
-        }
-    
-    form = LeadFilterForm(
-        request.GET or None, 
-        EMPLOYEES_CHOICES=EMPLOYEE_RANGES,
-        JOB_TITLE_CHOICES=filter_choices.get('JOB_TITLE_CHOICES', []),
-        INDUSTRY_CHOICES=filter_choices.get('INDUSTRY_CHOICES', []),
-        PERSON_COUNTRY_CHOICES=filter_choices.get('PERSON_COUNTRY_CHOICES', []),
-        COMPANY_COUNTRY_CHOICES=filter_choices.get('COMPANY_COUNTRY_CHOICES', [])
-    )
+    response = StreamingHttpResponse(rows, content_type='text/csv')
+    response['Content-Disposition'] = 'attachment; filename="filtered_leads.csv"'
+    return response
 
-    # Same robust filter logic as leads_list
-    if form.is_valid():
-        company_str = form.cleaned_data.get('company_name')
-        if company_str:
-            companies = [name.strip() for name in company_str.split(',') if name.strip()]
-            if companies:
-                company_query = Q()
-                for name in companies:
-                    company_query |= Q(company_name__icontains=name)
-                leads_queryset = leads_queryset.filter(company_query)
-        
-        search = form.cleaned_data.get('search')
-        if search:
-            search_query = (
-                Q(first_name__icontains=search) | Q(last_name__icontains=search) |
-                Q(professional_email__icontains=search) | Q(personal_email__icontains=search) |
-                Q(company_name__icontains=search) | Q(job_title__icontains=search) |
-                Q(industry__icontains=search)
-            )
-            leads_queryset = leads_queryset.filter(search_query)
-        
-        job_titles = form.cleaned_data.get('job_title')
-        if job_titles:
-            title_query = Q()
-            for title in job_titles:
-                title_query |= Q(job_title__icontains=title)
-            leads_queryset = leads_queryset.filter(title_query)
-
-        industries = form.cleaned_data.get('industry')
-        if industries:
-            industry_query = Q()
-            for ind in industries:
-                industry_query |= Q(industry__icontains=ind)
-            leads_queryset = leads_queryset.filter(industry_query)
-
-        person_countries = form.cleaned_data.get('person_country')
-        if person_countries:
-            p_country_query = Q()
-            for c in person_countries:
-                p_country_query |= Q(person_country__icontains=c)
-            leads_queryset = leads_queryset.filter(p_country_query)
-
-        company_countries = form.cleaned_data.get('company_country')
-        if company_countries:
-            c_country_query = Q()
-            for c in company_countries:
-                c_country_query |= Q(company_country__icontains=c)
-            leads_queryset = leads_queryset.filter(c_country_query)
-            
-        # Employee filter
-        employees_filters_dropdown = form.cleaned_data.get('employees_dropdown', [])
-        employees_filter_text = form.cleaned_data.get('employees_text')
-        all_employee_ranges = list(employees_filters_dropdown)
-        if employees_filter_text:
-            all_employee_ranges.append(employees_filter_text.strip())
-
-        if all_employee_ranges:
-            try:
-                employee_filtered_ids = []
-                for lead in leads_queryset:
-                    for filter_range in all_employee_ranges:
-                        if check_range_overlap(filter_range_str=filter_range, db_value_str=lead.employees):
-                            employee_filtered_ids.append(lead.id)
-                            break
-                if employee_filtered_ids:
-                    leads_queryset = leads_queryset.filter(id__in=employee_filtered_ids)
-            except:
-                 pass 
-
-        # Revenue filter
-        revenue_text = form.cleaned_data.get('revenue')
-        if revenue_text:
-            try:
-                revenue_filters = [r.strip() for r in revenue_text.split(',') if r.strip()]
-                revenue_filtered_ids = []
-                for lead in leads_queryset:
-                    for filter_range in revenue_filters:
-                        if check_range_overlap(filter_range_str=filter_range, db_value_str=lead.revenue):
-                            revenue_filtered_ids.append(lead.id)
-                            break
-                if revenue_filtered_ids:
-                    leads_queryset = leads_queryset.filter(id__in=revenue_filtered_ids)
-            except:
-                 pass 
 
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = 'attachment; filename="filtered_leads.csv"'
+def _export_job_data(job):
+    data = {
+        'job_id': job.pk,
+        'status': job.status,
+        'format': job.format,
+        'total_rows': job.total_rows,
+        'processed_rows': job.processed_rows,
+        'message': job.message,
+        'progress_url': reverse('leads:export_job_progress', args=[job.pk]),
+        'download_url': None,
+    }
+    if job.status == ExportJob.STATUS_COMPLETED:
+        data['processed_rows'] = job.total_rows
+        data['download_url'] = reverse('leads:download_export', args=[job.pk])
+    return data
 
-    writer = csv.writer(response)
-    field_names = [
-         'lead_id', 'full_name', 'first_name', 'last_name', 'job_title',
-        'professional_email', 'email_status', 'personal_email', 'person_linkedin_url',
-        'person_city', 'person_state', 'person_country', 'person_direct_phone',
-        'company_id', 'company_name', 'company_website', 'industry', 'employees',
-        'revenue', 'generic_email', 'full_address', 'first_address', 'company_city',
-        'company_state', 'zip_code', 'company_country', 'company_linkedin_url',
-        'company_phone', 'comments', 'source'
-    ]
-    writer.writerow(field_names) 
 
-    for lead in leads_queryset:
-        writer.writerow([getattr(lead, field, '') for field in field_names])
+@login_required
+def create_export_job(request):
+    """
+    Bade exports ke liye background job (POST: leads list ke filter params + 'format').
+    Same filters + format ka export, jab tak leads nahi badle, reuse hota hai (sirf usi user ke jobs;
+    progress / download bhi job ke owner ko hi milte hain).
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required.'}, status=405)
 
-    return response
+    export_format = request.POST.get('format', ExportJob.FORMAT_CSV_GZ)
+    if export_format not in dict(available_export_formats()):
+        return JsonResponse({'error': 'Unknown or unavailable export format.'}, status=400)
+
+    params = request.POST.copy()
+    for key in ('format', 'csrfmiddlewaretoken', 'cursor'):
+        params.pop(key, None)
+    form, _ = _build_filter_form(request, params)
+    if params and not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    job, reused = request_export_job(request.user, _lead_query(form), export_format)
+    data = _export_job_data(job)
+    data['reused'] = reused
+    return JsonResponse(data, status=200 if reused else 202)
+
+
+def _get_user_export_job(request, pk, **filters):
+    """User ka apna export job (superuser kisi ka bhi); doosre user ke job par bhi 404 (ids guess na ho sakein)."""
+    if not request.user.is_superuser:
+        filters['created_by'] = request.user
+    return get_object_or_404(ExportJob, pk=pk, **filters)
+
+
+@login_required
+def export_job_progress(request, pk):
+    """Export job ka JSON progress (leads list page isse poll karta hai)."""
+    return JsonResponse(_export_job_data(_get_user_export_job(request, pk)))
+
+
+@login_required
+def download_export(request, pk):
+    job = _get_user_export_job(request, pk, status=ExportJob.STATUS_COMPLETED)
+    if not export_file_exists(job):
+        messages.error(request, "This export has expired. Please export again.")
+        return redirect('leads:leads_list')
+    content_type = EXPORT_CONTENT_TYPES.get(job.format, 'application/octet-stream')
+    return file_download_response(request, export_file_path(job), job.download_name, content_type)
+
+
+@login_required
+def api_leads(request):
+    """
+    JSON API: leads_list wale filters (same query params) + keyset cursor.
+    GET /leads/api/leads/?industry=Software&per_page=50&cursor=...
+    """
+    form, _ = _build_filter_form(request)
+    if request.GET and not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+    lead_query = _lead_query(form)
+
+    try:
+        per_page = min(max(int(request.GET.get('per_page', 25)), 1), API_MAX_PER_PAGE)
+    except ValueError:
+        per_page = 25
+
+    base_queryset = Lead.objects.only('id', *EXPORT_FIELD_NAMES, 'created_at')
+    page_obj = cached_page(lead_query, base_queryset, request.GET.get('cursor'), per_page=per_page)
+
+    results = []
+    for lead in page_obj:
+        row = {'id': lead.pk, 'created_at': lead.created_at.isoformat()}
+        row.update({field_name: getattr(lead, field_name) for field_name in EXPORT_FIELD_NAMES})
+        results.append(row)
+
+    return JsonResponse({
+        'count': _lead_count(lead_query, base_queryset),
+        'next_cursor': page_obj.next_cursor,
+        'previous_cursor': page_obj.previous_cursor,
+        'results': results,
+    })
+
+
+@login_required
+def facet_autocomplete(request, field_name):
+    """
+    Select2 AJAX source ek filter dropdown ke liye: ?q=soft&page=2 (+ current filter params).
+    {"results": [{"id", "text"}], "pagination": {"more"}} - text mein count, snapshot ho toh active filters ke saath.
+    """
+    if field_name not in FACET_FIELDS:
+        return JsonResponse({'error': 'Unknown filter field.'}, status=404)
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+
+    offset = (page - 1) * FACET_AUTOCOMPLETE_PAGE_SIZE
+    rows = search_facet_values(field_name, request.GET.get('q', ''), offset, FACET_AUTOCOMPLETE_PAGE_SIZE)
+    more = len(rows) > FACET_AUTOCOMPLETE_PAGE_SIZE
+    rows = rows[:FACET_AUTOCOMPLETE_PAGE_SIZE]
+
+    counts = None
+    snapshot = get_snapshot()
+    if snapshot is not None:
+        form, _ = _build_filter_form(request)
+        lead_query = _lead_query(form)
+        if snapshot.supports(lead_query):
+            counts = snapshot.facet_counts(field_name, lead_query, [value for value, _ in rows])
+
+    results = []
+    for value, total in rows:
+        if counts is not None:
+            total = counts.get(value, 0)
+        results.append({'id': value, 'text': f"{value} ({total:,})"})
+    return JsonResponse({'results': results, 'pagination': {'more': more}})
 
 
 @login_required
@@ -649,64 +592,75 @@ def get_lead_detail_json(request, pk):
         return JsonResponse({'status': 'error', 'message': str(e)}, status=500)
 
 
+@login_required
+def create_selection(request):
+    """
+    Bulk actions ke liye server-side selection banata hai. POST JSON body:
+    {"ids": [5, 12, ...]} ya {"filters": "<leads list ki query string>"} (us filter ke saare leads).
+    Response: {"id", "size", "export_url"}.
+    """
+    if request.method != 'POST':
+        return JsonResponse({'error': 'POST required.'}, status=405)
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Invalid JSON.'}, status=400)
+
+    if isinstance(payload.get('ids'), list):
+        try:
+            ids = [int(pk) for pk in payload['ids']]
+        except (TypeError, ValueError):
+            return JsonResponse({'error': 'ids must be integers.'}, status=400)
+        if not ids:
+            return JsonResponse({'error': 'No leads selected.'}, status=400)
+        selection = create_id_selection(request.user, ids)
+    elif 'filters' in payload:
+        params = QueryDict(str(payload['filters'] or ''))
+        form, _ = _build_filter_form(request, params)
+        if params and not form.is_valid():
+            return JsonResponse({'errors': form.errors}, status=400)
+        lead_query = _lead_query(form)
+        selection = create_filter_selection(request.user, lead_query, _lead_count(lead_query, Lead.objects.all()))
+    else:
+        return JsonResponse({'error': 'Send "ids" or "filters".'}, status=400)
+
+    return JsonResponse({
+        'id': selection.pk,
+        'size': selection.size,
+        'export_url': f"{reverse('leads:export_selected_leads')}?selection={selection.pk}",
+    }, status=201)
+
+
 @login_required
 def export_selected_leads(request):
+    """Selected leads ka XLSX: ?selection=<id> (server-side selection) ya chhoti lists ke liye ?ids=5,12."""
+    selection_id = request.GET.get('selection')
     ids_str = request.GET.get('ids', None)
 
-    if not ids_str:
+    if not selection_id and not ids_str:
         messages.error(request, "No leads selected for export.")
         return redirect('leads:leads_list')
 
     try:
-        selected_ids = [int(id) for id in ids_str.split(',')]
-        leads_queryset = Lead.objects.filter(id__in=selected_ids)
+        if selection_id:
+            selection = get_user_selection(request.user, selection_id)
+            if selection is None:
+                messages.error(request, "Selection not found or expired. Please select the leads again.")
+                return redirect('leads:leads_list')
+            leads_queryset = selection.leads().order_by('-created_at', '-id')
+        else:
+            selected_ids = [int(id) for id in ids_str.split(',')]
+            leads_queryset = Lead.objects.filter(id__in=selected_ids)
 
         if not leads_queryset.exists():
             messages.error(request, "No valid leads found for the selected IDs.")
             return redirect('leads:leads_list')
 
-        columns = [
-            'lead_id', 'full_name', 'first_name', 'last_name', 'job_title',
-            'professional_email', 'email_status', 'personal_email', 'person_linkedin_url',
-            'person_city', 'person_state', 'person_country', 'person_direct_phone',
-            'company_id', 'company_name', 'company_website', 'industry', 'employees',
-            'revenue', 'generic_email', 'full_address', 'first_address', 'company_city',
-            'company_state', 'zip_code', 'company_country', 'company_linkedin_url',
-            'company_phone', 'comments', 'source', 'created_at', 'created_by'
-        ]
-
-        leads_data = list(leads_queryset.values(*columns, username=F('created_by__username'))) 
-
-        df = pd.DataFrame(leads_data)
-
-        if 'username' in df.columns:
-             df.rename(columns={'username': 'created_by'}, inplace=True)
-
-        if 'created_at' in df.columns:
-            df['created_at'] = pd.to_datetime(df['created_at']).dt.tz_localize(None)
-
-        df.rename(columns={
-            'professional_email': 'Email',
-            'person_linkedin_url': 'LinkedIn (Person)',
-            'company_linkedin_url': 'LinkedIn (Company)',
-            'created_at': 'Date Added',
-            'created_by': 'Added By',
-            'person_direct_phone': 'Direct Phone',
-            'company_phone': 'Company Phone'
-        }, inplace=True)
-
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Selected Leads')
-        output.seek(0)
-
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="selected_leads.xlsx"'
-
-        return response
+        # Rows DB se seedha write-only workbook mein (DataFrame / BytesIO copy nahi)
+        field_names = EXPORT_FIELD_NAMES + ['created_at', 'created_by__username']
+        headers = [EXCEL_COLUMN_NAMES.get(field_name, field_name) for field_name in field_names]
+        rows = iter_value_rows(leads_queryset, field_names)
+        return xlsx_response([('Selected Leads', headers, rows)], 'selected_leads.xlsx')
 
     except Exception as e:
         messages.error(request, f"Error exporting selected leads: {e}")
@@ -717,60 +671,54 @@ def export_selected_leads(request):
 
 @login_required
 def download_upload_errors(request):
-    upload_errors = request.session.get('upload_errors', None)
+    job_id = request.GET.get('job')
+    if job_id:
+        # Background upload ka error report job record se aata hai
+        job = _get_user_upload_job(request, job_id) if job_id.isdigit() else None
+        report_id = job.error_report if job else None
+    else:
+        report_id = request.session.get('upload_error_report')
 
-    if not upload_errors:
+    if not error_report_exists(report_id):
         messages.error(request, "No error report found for the previous upload.")
         return redirect('leads:upload_leads') 
 
     try:
-        # Create detailed error report
-        error_data_for_df = []
-        
-        # Get all unique headers from error data
+        # Create detailed error report (compressed store se stream, do passes)
+        # Pass 1: Get all unique headers from error data
         headers_set = set()
-        for error_info in upload_errors:
+        error_count = 0
+        for error_info in iter_error_report(report_id):
             headers_set.update(error_info['row_data'].keys())
+            error_count += 1
         
-        headers = ['Row Number', 'Error Message', 'Email'] + sorted(headers_set)
-
-        for error_info in upload_errors:
-            row_entry = {
-                'Row Number': error_info['row_number'],
-                'Error Message': error_info['error_message'],
-                'Email': error_info.get('email', 'N/A')
-            }
-            
-            for header in headers_set:
-                row_entry[header] = error_info['row_data'].get(header, '')
-            
-            error_data_for_df.append(row_entry)
-
-        df = pd.DataFrame(error_data_for_df)
-        df = df.reindex(columns=headers, fill_value='')
+        data_headers = sorted(headers_set)
+        headers = ['Row Number', 'Error Message', 'Email'] + data_headers
+
+        # Pass 2: rows seedha workbook mein
+        def error_rows():
+            for error_info in iter_error_report(report_id):
+                row_data = error_info['row_data']
+                yield [
+                    error_info['row_number'],
+                    error_info['error_message'],
+                    error_info.get('email', 'N/A'),
+                ] + [row_data.get(header, '') for header in data_headers]
+
+        summary_rows = [
+            ['Total Errors', error_count],
+            ['Successful Rows', 'N/A'],
+            ['Failed Rows', error_count],
+        ]
+        response = xlsx_response([
+            ('Upload Errors', headers, error_rows()),
+            ('Summary', ['Metric', 'Count'], summary_rows),
+        ], 'upload_errors_detailed.xlsx')
 
-        output = io.BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Upload Errors')
-            
-            # Add summary sheet
-            summary_data = {
-                'Metric': ['Total Errors', 'Successful Rows', 'Failed Rows'],
-                'Count': [len(upload_errors), 'N/A', len(upload_errors)]
-            }
-            summary_df = pd.DataFrame(summary_data)
-            summary_df.to_excel(writer, index=False, sheet_name='Summary')
-
-        output.seek(0)
-
-        # Clear session data
-        del request.session['upload_errors']
-
-        response = HttpResponse(
-            output.read(),
-            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
-        response['Content-Disposition'] = 'attachment; filename="upload_errors_detailed.xlsx"'
+        # Clear session data (aur report file)
+        if not job_id:
+            del request.session['upload_error_report']
+            delete_error_report(report_id)
 
         return response
 
@@ -794,10 +742,12 @@ def debug_filters(request):
         ('Person Country', Lead.objects.filter(person_country__icontains='USA').count()),
         ('Company Country', Lead.objects.filter(company_country__icontains='USA').count()),
     ]
-    
     context = {
         'test_cases': test_cases,
         'total_leads': Lead.objects.count(),
+        'cache_backend': settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1],
+        'cache_stats': get_cache_stats(),
+        'snapshot_stats': snapshot_stats(),
     }
     
     return render(request, 'leads/debug_filters.html', context)
\ No newline at end of file
@@ -0,0 +1,9 @@
+import django
+
+# Upload validation ke process pool (spawn) workers ke liye. Yeh module Django models import nahi karta,
+# taaki naya worker process ise django.setup() se pehle unpickle kar sake.
+
+
+def init_import_worker():
+    """Spawned worker mein Django setup (validate_frame wala leads.importer models import karta hai)."""
+    django.setup()
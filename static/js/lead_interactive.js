@@ -5,24 +5,43 @@ document.addEventListener('DOMContentLoaded', function() {
     const leadCheckboxes = document.querySelectorAll('.lead-checkbox');
     const bulkActionBar = document.getElementById('bulk-action-bar');
     const selectedCountSpan = document.getElementById('selected-count');
+    const selectAllMatching = document.getElementById('select-all-matching');
+    let allMatchingSelected = false;  // true = current filter ke saare leads (sirf yeh page nahi)
 
     function updateBulkActionBar() {
         const selectedLeads = document.querySelectorAll('.lead-checkbox:checked');
         const count = selectedLeads.length;
+        const pageSelected = (count === leadCheckboxes.length) && (count > 0);
+        if (!pageSelected) {
+            allMatchingSelected = false;
+        }
 
         if (count > 0) {
-            selectedCountSpan.textContent = count;
+            selectedCountSpan.textContent = allMatchingSelected ? 'All' : count;
             bulkActionBar.style.display = 'flex';
         } else {
             bulkActionBar.style.display = 'none';
         }
 
+        // Poora page select ho toh "saare matching leads" ka option
+        if (selectAllMatching) {
+            selectAllMatching.hidden = !pageSelected || allMatchingSelected;
+        }
+
         // 'Select All' ko update karein
         if (selectAllCheckbox) {
-            selectAllCheckbox.checked = (count === leadCheckboxes.length) && (count > 0);
+            selectAllCheckbox.checked = pageSelected;
         }
     }
 
+    if (selectAllMatching) {
+        selectAllMatching.addEventListener('click', function(event) {
+            event.preventDefault();
+            allMatchingSelected = true;
+            updateBulkActionBar();
+        });
+    }
+
     // "Select All" click karne par
     if (selectAllCheckbox) {
         selectAllCheckbox.addEventListener('change', function() {
@@ -220,11 +239,90 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
 
-            // 3. IDs ko comma-separated string mein badlein (jaise: "5,12,23")
-            const idString = leadIds.join(',');
+            // 3. Server-side selection banayein (IDs ya poora filter), URL mein sirf selection id jaata hai
+            const params = new URLSearchParams(window.location.search);
+            params.delete('cursor');
+            const payload = allMatchingSelected ? { filters: params.toString() } : { ids: leadIds.map(Number) };
+
+            exportBtn.disabled = true;
+            fetch(bulkActionBar.dataset.selectionUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'X-CSRFToken': bulkActionBar.dataset.csrfToken
+                },
+                body: JSON.stringify(payload)
+            })
+                .then(response => response.json().then(data => ({ ok: response.ok, data: data })))
+                .then(({ ok, data }) => {
+                    if (!ok) {
+                        throw new Error(data.error || 'Could not create selection');
+                    }
+                    // 4. User ko export URL par bhej dein, jisse download trigger hoga
+                    window.location.href = data.export_url;
+                })
+                .catch(error => alert(`Export failed: ${error.message}`))
+                .finally(() => { exportBtn.disabled = false; });
+        });
+    }
+
 
-            // 4. User ko naye URL par bhej dein, jisse download trigger hoga
-            window.location.href = `/leads/export-selected/?ids=${idString}`;
+    // --- 4. BACKGROUND EXPORT JOB (poore filtered results) ---
+    const exportControls = document.getElementById('export-job-controls');
+    const exportJobBtn = document.getElementById('export-job-btn');
+    const exportJobStatus = document.getElementById('export-job-status');
+
+    function showExportJob(data) {
+        if (data.status === 'completed' && data.download_url) {
+            exportJobStatus.innerHTML = '';
+            const link = document.createElement('a');
+            link.href = data.download_url;
+            link.textContent = `Download (${data.total_rows} leads)`;
+            exportJobStatus.appendChild(link);
+            exportJobBtn.disabled = false;
+            return;
+        }
+        if (data.status === 'failed') {
+            exportJobStatus.textContent = data.message || 'Export failed.';
+            exportJobBtn.disabled = false;
+            return;
+        }
+        exportJobStatus.textContent = data.total_rows
+            ? `Exporting... ${data.processed_rows} / ${data.total_rows}`
+            : 'Export queued...';
+        setTimeout(() => pollExportJob(data.progress_url), 2000);
+    }
+
+    function pollExportJob(progressUrl) {
+        fetch(progressUrl, { headers: { 'Accept': 'application/json' } })
+            .then(response => response.json())
+            .then(showExportJob)
+            .catch(() => setTimeout(() => pollExportJob(progressUrl), 5000));
+    }
+
+    if (exportControls && exportJobBtn) {
+        exportJobBtn.addEventListener('click', function() {
+            const data = new FormData(exportControls.closest('form'));
+            data.append('format', document.getElementById('export-format').value);
+
+            exportJobBtn.disabled = true;
+            exportJobStatus.textContent = 'Starting export...';
+            fetch(exportControls.dataset.createUrl, {
+                method: 'POST',
+                headers: { 'X-CSRFToken': exportControls.dataset.csrfToken },
+                body: data
+            })
+                .then(response => response.json().then(body => ({ ok: response.ok, body: body })))
+                .then(({ ok, body }) => {
+                    if (!ok) {
+                        throw new Error(body.error || 'Please check the filters.');
+                    }
+                    showExportJob(body);
+                })
+                .catch(error => {
+                    exportJobStatus.textContent = `Export failed: ${error.message}`;
+                    exportJobBtn.disabled = false;
+                });
         });
     }
 